@@ -1,12 +1,51 @@
-from vpython import *
+OFFLINE_RENDER = False # See Offline Rendering; set here because it decides whether VPython is imported
+if OFFLINE_RENDER:
+    from headless_scene import * # No display: stand-ins for the VPython objects (see headless_scene.py)
+else:
+    from vpython import *
 import math
 import time
 from pythonosc import udp_client
 from pythonosc import dispatcher
 from pythonosc import osc_server
+from pythonosc import osc_bundle_builder
+from pythonosc import osc_message_builder
 import threading
 import random
 import colorsys
+import struct
+import os
+import heapq
+import itertools
+import numpy as np
+from integrators import attraction_acceleration, characterize_integrators, integrate_motion
+from pythonosc import osc_message
+
+# Startup timing reference (used to report cold start to first rendered frame)
+startup_begin_time = time.perf_counter()
+
+# --- Offline Rendering ---
+# With OFFLINE_RENDER (set at the top of the file), the simulation runs headless and faster than real time:
+# VPython is replaced by headless_scene.py, so no browser or notebook is needed, frames are not paced by rate(),
+# the simulation clock advances by OFFLINE_FRAME_PERIOD per frame, no OSC leaves the machine, the actions in
+# OFFLINE_SCRIPT are applied at their simulation times and after OFFLINE_RENDER_DURATION seconds the recorded
+# score is exported (see Score Export) and the script exits. random is seeded with OFFLINE_SEED before any
+# scene or random setup, so rendering the same OFFLINE_SCRIPT again produces the same score.
+OFFLINE_RENDER_DURATION = 180.0 # Seconds of simulation time to render
+OFFLINE_FRAME_PERIOD = 0.01 # Simulation seconds per frame (the live loop runs at rate(100))
+OFFLINE_SEED = 7
+# (simulation seconds after start, action): "add" a ball, "spawn" BULK_SPAWN_COUNT balls, "release" the balls,
+# "clear" all balls
+OFFLINE_SCRIPT = [(0.5 * k, "add") for k in range(12)] + [(60.0, "release"), (120.0, "release")]
+
+if OFFLINE_RENDER:
+    random.seed(OFFLINE_SEED)
+offline_clock_time = time.time()
+
+
+def sim_clock():
+    """Simulation time in seconds: wall-clock time when live, the frame-stepped offline clock when rendering."""
+    return offline_clock_time if OFFLINE_RENDER else time.time()
 
 # --- OSC Client Configuration (VPython -> REAPER) ---
 # REAPER's IP address. Use "127.20.10.5" if REAPER and VPython are on the same computer.
@@ -48,11 +87,23 @@ ambisonics_hemisphere_initial_color = color.black
 # New: Switch to control whether VPython sends track fader commands
 vpython_control_faders_enabled = True # Initial setting is True (enabled)
 
+# --- Startup Handshake Configuration ---
+# The initial mixer state is sent as a single OSC bundle from a background thread while the scene is built.
+# If STARTUP_WAIT_FOR_ACK is True, the simulation waits for REAPER's first feedback message
+# (at most STARTUP_ACK_TIMEOUT seconds) instead of sleeping for a fixed time.
+STARTUP_WAIT_FOR_ACK = True
+STARTUP_ACK_TIMEOUT = 0.1
+startup_ack_event = threading.Event() # Set by the OSC server handlers on any feedback from REAPER
+startup_ack_received = False
+startup_handshake_duration = 0.0
+
 # --- OSC Message Handling Functions (called by OSC server) ---
 def handle_play_status(address, *args):
     """Handles messages for REAPER play status"""
     global reaper_play_status, ambisonics_hemisphere_fade_active, ambisonics_hemisphere_fade_start_time, \
            ambisonics_hemisphere_initial_opacity, ambisonics_hemisphere_initial_color
+    startup_ack_event.set()
+    osc_send_health.note_host_alive()
     if args and isinstance(args[0], (int, float)):
         new_play_status = bool(args[0])
         if new_play_status != reaper_play_status: # Only react if status changes
@@ -61,7 +112,7 @@ def handle_play_status(address, *args):
 
             if not reaper_play_status: # REAPER stops playing
                 ambisonics_hemisphere_fade_active = True
-                ambisonics_hemisphere_fade_start_time = time.time()
+                ambisonics_hemisphere_fade_start_time = sim_clock()
                 ambisonics_hemisphere_initial_opacity = ambisonics_hemisphere.opacity
                 ambisonics_hemisphere_initial_color = ambisonics_hemisphere.color
                 # Stop other visual element movements
@@ -70,13 +121,16 @@ def handle_play_status(address, *args):
                     ball.angular_vel = vector(0,0,0)
                 for ring_obj in ring_objects_list:
                     ring_obj.vel = vector(0,0,0)
-                    ring_obj.angular_vel = vector(0,0,0)
+                ring_angular_velocities[:] = 0
+                invalidate_all_wall_contacts()
             else: # REAPER starts playing
                 ambisonics_hemisphere_fade_active = False # Stop any ongoing fade-out
 
 def handle_master_volume(address, *args):
     """Handles REAPER master volume messages"""
     global reaper_master_volume, master_light # Include master_light
+    startup_ack_event.set()
+    osc_send_health.note_host_alive()
     if args and isinstance(args[0], (int, float)):
         reaper_master_volume = float(args[0])
         print(f"Received REAPER Master Volume: {reaper_master_volume:.2f}")
@@ -90,6 +144,8 @@ def handle_master_volume(address, *args):
 def handle_track_volume(address, *args):
     """Handles single track fader volume messages (e.g., /track/2/volume or /track/11/volume)"""
     global reaper_track_volumes
+    startup_ack_event.set()
+    osc_send_health.note_host_alive()
     try:
         # Parse track number from address
         parts = address.split('/')
@@ -126,12 +182,23 @@ osc_server_thread.start()
 # Your existing VPython code starts here
 # ----------------------------------------------------------------------------------------------------
 
+# Ring-to-track routing table: for each of the four rings, the REAPER track of each of its sectors (equal angular
+# slices of the ring, sector 0 starting at angle 0). The number of sectors per ring is the length of its list.
+# By default all rings share tracks 2-10; e.g. [list(range(2 + 9 * r, 11 + 9 * r)) for r in range(4)] gives
+# every ring its own bank of nine tracks (36 tracks).
+RING_SECTOR_TRACKS = [[2, 3, 4, 5, 6, 7, 8, 9, 10]] * 4
+
 # Track numbers (VPython will actively control the volume/position of these tracks and visualize them as Ambisonics spheres)
-track_numbers = [2, 3, 4, 5, 6, 7, 8, 9, 10]
+# Derived from the routing table; all per-track state below is sized from it
+track_numbers = sorted({track_num for sector_tracks in RING_SECTOR_TRACKS for track_num in sector_tracks})
 master_track_number = 1
+# Per ring: sector -> index into track_numbers
+ring_sector_track_indices = [np.array([track_numbers.index(track_num) for track_num in sector_tracks])
+                             for sector_tracks in RING_SECTOR_TRACKS]
 
 max_volume = 0.7
 decay_time = 1.5
+VOLUME_DECAY_CURVE = "linear" # Curve of the hit volume decay (see Parameter Ramps)
 
 pan_offset = 0.5
 
@@ -145,30 +212,56 @@ reverb_decay_duration = 1.0
 # Azimuth and Elevation trigger cooldown time
 azimuth_elevation_cooldown_time = 2.0
 
-# Quadrant data (all rings share this data as they all control tracks 1-9)
-quadrant_decay_timers = [-1] * len(track_numbers)
-quadrant_volumes = [0.0] * len(track_numbers)
+# Quadrant data, one entry per routed track (numpy arrays so the per-frame update stays vectorized)
+quadrant_decay_timers = np.full(len(track_numbers), -1.0)
+quadrant_decay_peaks = np.full(len(track_numbers), max_volume) # Volume each hit decay starts from (see Onset Detection)
+quadrant_volumes = np.zeros(len(track_numbers))
 quadrant_pans = [0.5] * len(track_numbers)
 
-quadrant_ball_stats = [{"count": 0, "total_speed": 0.0} for _ in range(len(track_numbers))]
+# Per-track ball statistics of the balls currently inside each routed sector, recomputed every frame by
+# bin_ball_statistics. Available for sound mapping (e.g. density -> filter); kinetic energy assumes unit mass,
+# like the collision response.
+quadrant_ball_counts = np.zeros(len(track_numbers), dtype=np.int64)
+quadrant_ball_speed_sums = np.zeros(len(track_numbers))
+quadrant_ball_avg_speeds = np.zeros(len(track_numbers))
+quadrant_ball_max_speeds = np.zeros(len(track_numbers))
+quadrant_ball_kinetic_energy = np.zeros(len(track_numbers))
+
+# --- Parameter Ramps ---
+# Every parameter ramp (volume decay and clear fade, Azimuth/Elevation drift back to default, master reverb
+# dry/wet and master FX param 12) is an analytic function of the time since its trigger, evaluated on demand by
+# ramp_values for any timestamp and vectorized across tracks. The result doesn't depend on the frame rate.
+# Curves: "linear", "exponential" (EXPONENTIAL_CURVE_STEEPNESS, the same shape as the receiver envelopes) and
+# "custom" (RAMP_CUSTOM_CURVE: ramp progress sampled at evenly spaced points in time, from 0 to 1).
+RAMP_CUSTOM_CURVE = [0.0, 0.04, 0.15, 0.35, 0.65, 0.85, 0.96, 1.0] # Smooth S-curve
+AZIMUTH_ELEVATION_RAMP_CURVE = "exponential"
 
 # Azimuth related variables
-quadrant_azimuths = [0.0] * len(track_numbers)
+quadrant_azimuths = np.zeros(len(track_numbers))
 default_azimuth = 0.5
-azimuth_decay_time = 5.0
-quadrant_azimuth_last_trigger_time = [-1.0] * len(track_numbers)
+azimuth_decay_time = 50.0 # Seconds for Azimuth to drift back to default after a hit
+quadrant_azimuth_last_trigger_time = np.full(len(track_numbers), -1.0)
+azimuth_ramp_start_values = quadrant_azimuths.copy() # Azimuth at the start of the current drift
+azimuth_ramp_start_times = np.full(len(track_numbers), sim_clock())
 
 # Elevation related variables
-quadrant_elevations = [0.0] * len(track_numbers)
+quadrant_elevations = np.zeros(len(track_numbers))
 default_elevation = 0.5
-elevation_decay_time = 5.0
-quadrant_elevation_last_trigger_time = [-1.0] * len(track_numbers)
+elevation_decay_time = 50.0 # Seconds for Elevation to drift back to default after a hit
+quadrant_elevation_last_trigger_time = np.full(len(track_numbers), -1.0)
+elevation_ramp_start_values = quadrant_elevations.copy()
+elevation_ramp_start_times = np.full(len(track_numbers), sim_clock())
 
 # For smooth volume decay on clear
 clear_volume_decay_duration = 3.0
-quadrant_volume_clearing = [False] * len(track_numbers)
-quadrant_clear_start_time = [-1.0] * len(track_numbers)
-quadrant_clear_initial_volume = [0.0] * len(track_numbers)
+quadrant_volume_clearing = np.zeros(len(track_numbers), dtype=bool)
+quadrant_clear_start_time = np.full(len(track_numbers), -1.0)
+quadrant_clear_initial_volume = np.zeros(len(track_numbers))
+
+# Tracks with a running envelope (volume decay or clear fade, Azimuth/Elevation drifting back to default).
+# Only these are evaluated each frame; a track leaves the set once it has settled and its final values were sent.
+# All tracks start active, since Azimuth/Elevation drift from 0 towards their defaults after startup.
+active_envelope_tracks = set(range(len(track_numbers)))
 
 # For master reverb plugin control (ID 12)
 master_fx_param_12_value = 0.0
@@ -191,25 +284,189 @@ MAX_SPHERES_PER_TRACK = 10
 MIN_SPHERES_PER_TRACK = 3
 # Sphere size
 INDIVIDUAL_SOUND_SOURCE_RADIUS = 0.4
+SOUND_SOURCE_SCALE_EPSILON = 0.001 # Pulse scale within this of its target snaps to it (no more radius updates)
+
+# Projection cache: hemisphere positions come from lookup tables over quantized Azimuth (0..0.99 -> pi..-pi) and
+# Elevation (0..1 -> 0..pi/2). Only tracks whose quantized values changed are re-projected, and only those
+# spheres and labels get a new pos, so VPython has nothing to send to the browser for tracks that stay put.
+PROJECTION_LUT_STEPS = 2048 # Steps per axis; the largest step on the hemisphere is about 0.03 units
+projection_azimuth_lut = np.column_stack([np.sin(np.linspace(math.pi, -math.pi, PROJECTION_LUT_STEPS)),
+                                          np.cos(np.linspace(math.pi, -math.pi, PROJECTION_LUT_STEPS))])
+projection_elevation_lut = np.column_stack([np.cos(np.linspace(0.0, math.pi / 2, PROJECTION_LUT_STEPS)),
+                                            np.sin(np.linspace(0.0, math.pi / 2, PROJECTION_LUT_STEPS))])
+projected_azimuth_cells = np.full(len(track_numbers), -1, dtype=np.intp) # LUT cells the positions were built from
+projected_elevation_cells = np.full(len(track_numbers), -1, dtype=np.intp)
+projected_track_positions = np.zeros((len(track_numbers), 3))
 
 
 # OSC transmission optimization parameters
 OSC_UPDATE_INTERVAL = 0.2
 OSC_VALUE_THRESHOLD = 0.01
+# Global cap on per-track volume/Azimuth/Elevation messages per frame. Volume changes go first, largest change
+# first; whatever does not fit is sent on a later frame.
+OSC_TRACK_MESSAGE_BUDGET = 32
 
 # Store last sent OSC values and times
-last_sent_volume = [0.0] * len(track_numbers)
-last_sent_azimuth = [0.0] * len(track_numbers)
-last_sent_elevation = [0.0] * len(track_numbers)
+last_sent_volume = np.zeros(len(track_numbers))
+last_sent_azimuth = np.zeros(len(track_numbers))
+last_sent_elevation = np.zeros(len(track_numbers))
 last_sent_master_reverb_drywet = 0.0
 last_sent_master_fx_param_12 = 0.0
 
-last_volume_send_time = [0.0] * len(track_numbers)
-last_azimuth_send_time = [0.0] * len(track_numbers)
-last_elevation_send_time = [0.0] * len(track_numbers)
+last_volume_send_time = np.zeros(len(track_numbers))
+last_azimuth_send_time = np.zeros(len(track_numbers))
+last_elevation_send_time = np.zeros(len(track_numbers))
 last_master_reverb_send_time = 0.0
 last_master_fx_param_12_send_time = 0.0
 
+# --- Receiver-Side Envelopes ---
+# When enabled, a hit sends one compact "/envelope/start" message (track, peak, decay time, curve) and the
+# receiver (OSC_Local_Sink.py) runs the volume ramp itself, instead of a volume value being streamed every
+# frame. The fade started by "Clear All Balls" is sent the same way. Volumes are still computed locally for visuals.
+USE_RECEIVER_ENVELOPES = False
+ENVELOPE_START_ADDRESS = "/envelope/start"
+ENVELOPE_CURVE = VOLUME_DECAY_CURVE # The receiver runs the same curve as the local decay ("linear" or "exponential")
+EXPONENTIAL_CURVE_STEEPNESS = 5.0 # Must match the receiver
+# A re-hit only restarts the receiver's envelope once its level has dropped this far below the new peak
+ENVELOPE_RETRIGGER_THRESHOLD = 0.05
+pending_envelope_starts = [None] * len(track_numbers) # (peak, decay time, curve, force) queued during the physics step
+sent_envelope_starts = [None] * len(track_numbers) # (send time, peak, decay time, curve) of the running envelopes
+
+# --- Packed Mixer State ---
+# When enabled, the per-frame volume/Azimuth/Elevation of every track plus master reverb dry/wet and master
+# FX param 12 are sent as a single OSC blob to PACKED_MIXER_STATE_ADDRESS instead of ~30 float messages.
+# Blob layout (little-endian), decoded by OSC_Local_Sink.py:
+#   uint8 version, uint8 track count N, uint8 master track number, uint8[N] track numbers,
+#   changed-field bitmask (ceil((3N + 2) / 8) bytes, bit k = field k),
+#   uint16 quantized value (value * 65535) for every field whose bit is set, in field order.
+# Field order: track 0 volume, Azimuth, Elevation, track 1 volume, ..., master reverb dry/wet, master FX param 12.
+USE_PACKED_MIXER_STATE = False
+PACKED_MIXER_STATE_ADDRESS = "/mixer/state"
+PACKED_MIXER_STATE_VERSION = 1
+PACKED_STATE_VALUE_THRESHOLD = 0.001 # Fields are cheap in the blob, so a finer threshold than OSC_VALUE_THRESHOLD
+PACKED_STATE_KEYFRAME_INTERVAL = 1.0 # Every field is resent at least this often, in case a datagram is lost
+
+packed_field_count = 3 * len(track_numbers) + 2
+packed_field_by_address = {}
+for i, track_num in enumerate(track_numbers):
+    packed_field_by_address[f"/track/{track_num}/volume"] = 3 * i
+    packed_field_by_address[f"/track/{track_num}/fx/2/fxparam/8/value"] = 3 * i + 1
+    packed_field_by_address[f"/track/{track_num}/fx/2/fxparam/9/value"] = 3 * i + 2
+packed_field_by_address[f"/track/{master_track_number}/reverb/drywet"] = 3 * len(track_numbers)
+packed_field_by_address[f"/track/{master_track_number}/fx/1/fxparam/12/value"] = 3 * len(track_numbers) + 1
+packed_field_values = np.zeros(packed_field_count) # Latest values, collected from send_osc_message
+packed_last_sent_quantized = np.full(packed_field_count, -1)
+last_packed_keyframe_time = 0.0
+
+# --- Score Export ---
+# While recording, ring hits, per-track Azimuth/Elevation and every outgoing OSC message are collected and can be
+# exported as a Standard MIDI File (for importing into the DAW) and a timestamped OSC score text file:
+#   - one MIDI track per ring on its own channel, note = MIDI_BASE_NOTE + sector, velocity from the hit impulse,
+#   - one MIDI track per routed REAPER track with Azimuth / Elevation as CC lanes (MIDI_AZIMUTH_CC / _ELEVATION_CC),
+#   - OSC score lines: "<seconds>\t<address>\t<arguments>", bundles expanded into their messages.
+# Press 'E' to start recording in a live session and again to export; offline renders always record.
+SCORE_EXPORT_DIRECTORY = "."
+MIDI_TICKS_PER_QUARTER = 960
+MIDI_TEMPO_BPM = 120.0
+MIDI_BASE_NOTE = 48 # Sector 0 of every ring
+MIDI_NOTE_DURATION = decay_time # Seconds; a re-hit on a sounding note ends it first
+MIDI_FULL_VELOCITY_IMPULSE = 20.0 # Hit impulse (change in ball speed) that maps to velocity 127
+MIDI_MIN_IMPULSE = 1.0 # Weaker contacts (balls resting against or sliding along the ring) don't become notes
+MIDI_AZIMUTH_CC = 16
+MIDI_ELEVATION_CC = 17
+
+score_recording = False
+score_start_time = 0.0
+score_hits = [] # (seconds, ring index, sector, track index, impulse)
+score_cc_values = [] # (seconds, track index, controller, value)
+score_osc_messages = [] # (seconds, built OscMessage / OscBundle)
+score_last_cc_values = {MIDI_AZIMUTH_CC: np.full(len(track_numbers), -1),
+                        MIDI_ELEVATION_CC: np.full(len(track_numbers), -1)}
+
+# --- Latency Tracing (ring contact -> /track/N/volume datagram on the wire) ---
+# Each stage of the hit path is timestamped with time.perf_counter_ns() and aggregated into histograms.
+# Cheap enough (a few integer operations per hit) to stay enabled during shows.
+LATENCY_TRACING_ENABLED = True
+LATENCY_REPORT_INTERVAL = 30.0 # Seconds between periodic latency reports (press 'L' to dump at any time)
+LATENCY_STAGES = ["contact -> state", "state -> throttle", "throttle -> encode", "encode -> send", "contact -> wire"]
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of nanosecond latencies with fixed memory.
+    Values are binned log-linearly: every power of two is split into 2**sub_bucket_bits linear sub-buckets,
+    which keeps the relative error of reported percentiles around 3% for the default of 5 bits.
+    """
+    def __init__(self, sub_bucket_bits=5, max_value_bits=40):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.max_index = (max_value_bits - sub_bucket_bits + 1) * self.sub_bucket_count - 1
+        self.counts = [0] * (self.max_index + 1)
+        self.total_count = 0
+        self.max_value = 0
+
+    def record(self, value_ns):
+        if value_ns < 0:
+            value_ns = 0
+        shift = value_ns.bit_length() - self.sub_bucket_bits - 1
+        if shift < 0:
+            shift = 0
+        index = min((shift << self.sub_bucket_bits) + (value_ns >> shift), self.max_index)
+        self.counts[index] += 1
+        self.total_count += 1
+        if value_ns > self.max_value:
+            self.max_value = value_ns
+
+    def bucket_midpoint(self, index):
+        shift = max(0, (index >> self.sub_bucket_bits) - 1)
+        mantissa = index - (shift << self.sub_bucket_bits)
+        return ((mantissa << shift) + ((mantissa + 1) << shift)) / 2
+
+    def percentile(self, p):
+        """Returns the value (ns) below which p percent of the recorded samples fall."""
+        if self.total_count == 0:
+            return 0.0
+        target = max(1, math.ceil(self.total_count * p / 100.0))
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(self.bucket_midpoint(index), self.max_value)
+        return float(self.max_value)
+
+
+latency_histograms = {stage: LatencyHistogram() for stage in LATENCY_STAGES}
+# Per track: (contact time, state update time) of the oldest hit whose volume has not been sent yet
+pending_latency_traces = [None] * len(track_numbers)
+latency_traces_dropped = 0 # Hits whose volume change was absorbed by the throttle or fader control switch
+last_latency_report_time = sim_clock()
+
+
+def record_hit_latency_trace(track_index, contact_time_ns):
+    """Starts a latency trace for a hit once the quadrant state of track_index has been updated."""
+    if pending_latency_traces[track_index] is None:
+        pending_latency_traces[track_index] = (contact_time_ns, time.perf_counter_ns())
+
+
+def record_latency_stages(trace, throttle_time_ns, encode_time_ns, send_time_ns):
+    """Adds the stage durations of one completed hit trace to the latency histograms."""
+    contact_time_ns, state_time_ns = trace
+    latency_histograms["contact -> state"].record(state_time_ns - contact_time_ns)
+    latency_histograms["state -> throttle"].record(throttle_time_ns - state_time_ns)
+    latency_histograms["throttle -> encode"].record(encode_time_ns - throttle_time_ns)
+    latency_histograms["encode -> send"].record(send_time_ns - encode_time_ns)
+    latency_histograms["contact -> wire"].record(send_time_ns - contact_time_ns)
+
+
+def report_latency_histograms(title):
+    """Prints p50/p99/max per pipeline stage, in milliseconds."""
+    print(f"\n--- {title} ---")
+    for stage in LATENCY_STAGES:
+        histogram = latency_histograms[stage]
+        print(f"  {stage:<20} n={histogram.total_count:<7} p50={histogram.percentile(50) / 1e6:8.3f} ms  "
+              f"p99={histogram.percentile(99) / 1e6:8.3f} ms  max={histogram.max_value / 1e6:8.3f} ms")
+    print(f"  Hits absorbed before sending: {latency_traces_dropped}")
+
 # New: Ring mass (for simplified angular momentum) and ball attraction strength
 ring_mass = 1.0 # Simplified ring mass for physics calculations
 
@@ -219,24 +476,135 @@ LARGE_ATTRACTION_STRENGTH = 8.0
 ball_attraction_strength = SMALL_ATTRACTION_STRENGTH # Initial attraction strength is small
 current_attraction_state = "small" # Initial state
 
+# --- OSC Send Health (circuit breaker while REAPER's host is unreachable) ---
+# After OSC_FAILURE_THRESHOLD consecutive send errors the circuit opens: sends are skipped (cheaply) and a
+# single probe message is let through after an exponentially growing backoff. The first successful send,
+# or any feedback received from REAPER, closes the circuit again. Errors are printed as one aggregated line
+# per OSC_ERROR_LOG_INTERVAL instead of one line per failed message, so console I/O cannot stall the frame rate.
+OSC_FAILURE_THRESHOLD = 3
+OSC_BACKOFF_INITIAL = 0.25 # Seconds until the first probe after the circuit opens
+OSC_BACKOFF_MAX = 2.0 # Upper bound for the probe interval (seconds)
+OSC_ERROR_LOG_INTERVAL = 5.0
+
+
+class OscSendHealth:
+    """Tracks OSC send failures and decides whether a message may be sent (closed / open / half-open)."""
+    def __init__(self):
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.backoff = OSC_BACKOFF_INITIAL
+        self.next_probe_time = 0.0
+        self.window_start_time = time.monotonic()
+        self.window_failures = 0
+        self.window_suppressed = 0
+        self.last_error = None
+        self.first_error_reported = False
+
+    def allow_send(self, now):
+        if self.state == "closed":
+            return True
+        if self.state == "open" and now >= self.next_probe_time:
+            self.state = "half_open" # Let exactly one probe message through
+            return True
+        self.window_suppressed += 1
+        return False
+
+    def record_success(self, now):
+        if self.state != "closed":
+            print("OSC: REAPER host reachable again, resuming sends")
+            self.state = "closed"
+            self.backoff = OSC_BACKOFF_INITIAL
+            self.first_error_reported = False
+        self.consecutive_failures = 0
+
+    def record_failure(self, now, address, error):
+        self.consecutive_failures += 1
+        self.window_failures += 1
+        self.last_error = f"{address}: {error}"
+        if not self.first_error_reported: # The first error after a healthy period is printed right away
+            print(f"Error sending OSC message to {address}: {error} "
+                  f"(further errors are summarized every {OSC_ERROR_LOG_INTERVAL:.0f} s)")
+            self.first_error_reported = True
+        if self.state == "half_open": # Probe failed, back off further
+            self.backoff = min(self.backoff * 2, OSC_BACKOFF_MAX)
+            self.state = "open"
+            self.next_probe_time = now + self.backoff
+        elif self.state == "closed" and self.consecutive_failures >= OSC_FAILURE_THRESHOLD:
+            self.state = "open"
+            self.backoff = OSC_BACKOFF_INITIAL
+            self.next_probe_time = now + self.backoff
+            print(f"OSC: {self.consecutive_failures} consecutive send failures, pausing sends to "
+                  f"{reaper_ip}:{osc_port} and probing for the host periodically")
+
+    def note_host_alive(self):
+        """Called when REAPER sends feedback: probe on the very next send instead of waiting for the backoff."""
+        if self.state == "open":
+            self.next_probe_time = 0.0
+
+    def maybe_log(self, now):
+        """Prints one aggregated line per OSC_ERROR_LOG_INTERVAL while errors are happening."""
+        if now - self.window_start_time < OSC_ERROR_LOG_INTERVAL:
+            return
+        if self.window_failures > 0 or self.window_suppressed > 0:
+            print(f"OSC: {self.window_failures} send failures in last {now - self.window_start_time:.0f} s, "
+                  f"{self.window_suppressed} messages skipped while paused (state: {self.state}, "
+                  f"last error: {self.last_error})")
+        self.window_start_time = now
+        self.window_failures = 0
+        self.window_suppressed = 0
+
+
+osc_send_health = OscSendHealth()
+
+
+def send_osc_content(content, address=""):
+    """Sends a built OSC message or bundle through the circuit breaker. Returns True if it was sent."""
+    if score_recording:
+        score_osc_messages.append((sim_clock() - score_start_time, content))
+    if OFFLINE_RENDER:
+        return True # Offline renders only go to the score
+    now = time.monotonic()
+    if not osc_send_health.allow_send(now):
+        return False
+    try:
+        osc_client.send(content)
+    except Exception as e:
+        osc_send_health.record_failure(now, address, e)
+        return False
+    osc_send_health.record_success(now)
+    return True
+
+
+def send_osc_value(address, value):
+    """Builds a single-argument OSC message and sends it through the circuit breaker."""
+    msg = osc_message_builder.OscMessageBuilder(address=address)
+    msg.add_arg(value)
+    return send_osc_content(msg.build(), address)
+
+
 def send_osc_message(address, value, current_time, last_sent_value_ref, last_send_time_ref):
     """
     Sends all OSC messages to a single port (8000).
     Adds threshold and time interval control to reduce message frequency.
     """
-    global last_sent_master_reverb_drywet, last_sent_master_fx_param_12, last_master_reverb_send_time, last_master_fx_param_12_send_time, reaper_track_volumes, vpython_control_faders_enabled
+    global last_sent_master_reverb_drywet, last_sent_master_fx_param_12, last_master_reverb_send_time, last_master_fx_param_12_send_time, reaper_track_volumes, vpython_control_faders_enabled, \
+        latency_traces_dropped
+
+    # In packed mode, mixer fields are only collected here and sent once per frame by send_packed_mixer_state
+    if USE_PACKED_MIXER_STATE:
+        packed_field = packed_field_by_address.get(address)
+        if packed_field is not None:
+            packed_field_values[packed_field] = value
+            return
 
     # Special handling for Master Reverb dry/wet
     if address == f"/track/{master_track_number}/reverb/drywet":
         if abs(value - last_sent_master_reverb_drywet) > OSC_VALUE_THRESHOLD or \
                 current_time - last_master_reverb_send_time > OSC_UPDATE_INTERVAL or \
                 (value == master_reverb_drywet_off and last_sent_master_reverb_drywet != master_reverb_drywet_off):
-            try:
-                osc_client.send_message(address, float(value))
+            if send_osc_value(address, float(value)):
                 last_sent_master_reverb_drywet = value
                 last_master_reverb_send_time = current_time
-            except Exception as e:
-                print(f"Error sending OSC message to {address} with value {value}: {e}")
         return
 
     # Special handling for Master FX Param 12
@@ -244,12 +612,9 @@ def send_osc_message(address, value, current_time, last_sent_value_ref, last_sen
         if abs(value - last_sent_master_fx_param_12) > OSC_VALUE_THRESHOLD or \
                 current_time - last_master_fx_param_12_send_time > OSC_UPDATE_INTERVAL or \
                 (value == 0.0 and last_sent_master_fx_param_12 != 0.0):
-            try:
-                osc_client.send_message(address, float(value))
+            if send_osc_value(address, float(value)):
                 last_sent_master_fx_param_12 = value
                 last_master_fx_param_12_send_time = current_time
-            except Exception as e:
-                print(f"Error sending OSC message to {address} with value {value}: {e}")
         return
 
     # For other track parameters (Volume, Azimuth, Elevation)
@@ -262,86 +627,247 @@ def send_osc_message(address, value, current_time, last_sent_value_ref, last_sen
         track_index = track_numbers.index(track_num_from_address)
     except (ValueError, IndexError):
         # If unable to parse or not in track_numbers, send directly (e.g., /marker messages)
-        try:
-            osc_client.send_message(address, float(value))
-        except Exception as e:
-            print(f"Error sending OSC message to {address} with value {value}: {e}")
+        send_osc_value(address, float(value))
         return
 
     # Update corresponding last_sent_value and last_send_time based on address type
     if "/volume" in address:
+        trace = pending_latency_traces[track_index]
+        pending_latency_traces[track_index] = None
         # Only send volume commands when vpython_control_faders_enabled is True
         if vpython_control_faders_enabled:
             if abs(value - last_sent_value_ref[track_index]) > OSC_VALUE_THRESHOLD or \
                     current_time - last_send_time_ref[track_index] > OSC_UPDATE_INTERVAL or \
                     (value == 0.0 and last_sent_value_ref[track_index] != 0.0): # Ensure volume is sent when it goes to zero
-                try:
-                    osc_client.send_message(address, float(value))
+                throttle_time_ns = time.perf_counter_ns()
+                msg = osc_message_builder.OscMessageBuilder(address=address)
+                msg.add_arg(float(value))
+                built_msg = msg.build()
+                encode_time_ns = time.perf_counter_ns()
+                if send_osc_content(built_msg, address):
+                    if trace is not None:
+                        record_latency_stages(trace, throttle_time_ns, encode_time_ns, time.perf_counter_ns())
                     last_sent_value_ref[track_index] = value
                     last_send_time_ref[track_index] = current_time
                     # Key modification: When VPython sends volume, immediately update local reaper_track_volumes
                     # This way, VPython's internal values will immediately reflect the sent volume, used for background brightness calculation
                     reaper_track_volumes[track_num_from_address] = value
-                except Exception as e:
-                    print(f"Error sending OSC message to {address} with value {value}: {e}")
-        else:
-            pass
+                elif trace is not None:
+                    latency_traces_dropped += 1
+            elif trace is not None:
+                latency_traces_dropped += 1
+        elif trace is not None:
+            latency_traces_dropped += 1
 
     elif "/fx/2/fxparam/8/value" in address: # Azimuth
         if abs(value - last_sent_value_ref[track_index]) > OSC_VALUE_THRESHOLD or \
                 current_time - last_send_time_ref[track_index] > OSC_UPDATE_INTERVAL:
-            try:
-                osc_client.send_message(address, float(value))
+            if send_osc_value(address, float(value)):
                 last_sent_value_ref[track_index] = value
                 last_send_time_ref[track_index] = current_time
-            except Exception as e:
-                print(f"Error sending OSC message to {address} with value {value}: {e}")
     elif "/fx/2/fxparam/9/value" in address: # Elevation
         if abs(value - last_sent_value_ref[track_index]) > OSC_VALUE_THRESHOLD or \
                 current_time - last_send_time_ref[track_index] > OSC_UPDATE_INTERVAL:
-            try:
-                osc_client.send_message(address, float(value))
+            if send_osc_value(address, float(value)):
                 last_sent_value_ref[track_index] = value
                 last_send_time_ref[track_index] = current_time
-            except Exception as e:
-                print(f"Error sending OSC message to {address} with value {value}: {e}")
     else: # Other unoptimized OSC messages (e.g., /pan)
-        try:
-            osc_client.send_message(address, float(value))
-        except Exception as e:
-            print(f"Error sending OSC message to {address} with value {value}: {e}")
+        send_osc_value(address, float(value))
 
 
-# Initialize volume, pan, Azimuth, and Elevation for all tracks
-# Temporarily enable fader control to ensure initial volume commands are sent
-original_fader_control_state = vpython_control_faders_enabled
-vpython_control_faders_enabled = True
+def ramp_shape(progress, curve):
+    """Maps ramp progress (0..1 in time) to progress in value (0..1) for the given curve."""
+    if curve == "exponential":
+        return (1 - np.exp(-EXPONENTIAL_CURVE_STEEPNESS * progress)) / (1 - math.exp(-EXPONENTIAL_CURVE_STEEPNESS))
+    if curve == "custom":
+        return np.interp(progress, np.linspace(0.0, 1.0, len(RAMP_CUSTOM_CURVE)), RAMP_CUSTOM_CURVE)
+    return progress # "linear"
 
-for i in range(len(track_numbers)): # Now initializing for tracks 2-10
-    send_osc_message(f"/track/{track_numbers[i]}/volume", 0.0, time.time(), last_sent_volume, last_volume_send_time)
-    # Pan messages are not optimized, send directly
-    try:
-        osc_client.send_message(f"/track/{track_numbers[i]}/pan", float(pan_offset))
-    except Exception as e:
-        print(f"Error sending OSC message to /track/{track_numbers[i]}/pan with value {pan_offset}: {e}")
 
-    send_osc_message(f"/track/{track_numbers[i]}/fx/2/fxparam/8/value",
-                     default_azimuth, time.time(), last_sent_azimuth,
-                     last_azimuth_send_time) # Azimuth for tracks 2-10, FX slot 2
-    send_osc_message(f"/track/{track_numbers[i]}/fx/2/fxparam/9/value",
-                     default_elevation, time.time(), last_sent_elevation,
-                     last_elevation_send_time) # Elevation for tracks 2-10, FX slot 2
-
-send_osc_message(f"/track/{master_track_number}/reverb/drywet", master_reverb_drywet_off, time.time(), None,
-                 None) # Master Reverb (Track 1)
-# Initialize Master FX Param 12 to FX slot 1
-send_osc_message(f"/track/{master_track_number}/fx/1/fxparam/12/value",
-                 master_fx_param_12_value, time.time(), None, None) # Master FX Param 12 (Track 1, FX slot 1)
-
-# Restore original fader control state
-vpython_control_faders_enabled = original_fader_control_state
+def ramp_values(start_values, end_values, start_times, duration, curve, t):
+    """
+    Evaluates ramps from start_values (held until start_times) to end_values (reached duration seconds later)
+    at time t. All value and time arguments may be numpy arrays (one ramp per element) or scalars.
+    """
+    if duration <= 0:
+        return np.where(t >= start_times, end_values, start_values)
+    progress = np.clip((t - start_times) / duration, 0.0, 1.0)
+    return np.where(progress >= 1.0, end_values,
+                    start_values + (end_values - start_values) * ramp_shape(progress, curve))
+
+
+def master_fx_param_12_at(t):
+    """Master FX param 12 after a release: linear ramp up to 1, then linear decay back to 0."""
+    decay_start_time = master_fx_param_12_start_time + master_fx_param_12_ramp_duration
+    if t < decay_start_time:
+        return float(ramp_values(0.0, 1.0, master_fx_param_12_start_time, master_fx_param_12_ramp_duration,
+                                 "linear", t))
+    return float(ramp_values(1.0, 0.0, decay_start_time, master_fx_param_12_decay_duration, "linear", t))
+
+
+def envelope_value(peak, duration, curve, elapsed):
+    """Evaluates a receiver-side decay envelope (same formula as OSC_Local_Sink.py)."""
+    if elapsed <= 0:
+        return peak
+    if duration <= 0 or elapsed >= duration:
+        return 0.0
+    progress = elapsed / duration
+    if curve == "exponential":
+        floor_value = math.exp(-EXPONENTIAL_CURVE_STEEPNESS)
+        return peak * (math.exp(-EXPONENTIAL_CURVE_STEEPNESS * progress) - floor_value) / (1 - floor_value)
+    return peak * (1 - progress)
+
+
+def queue_envelope_start(track_index, peak, duration, curve, force=False):
+    """Queues an envelope start for track_index; repeated hits within one frame collapse into one message."""
+    pending = pending_envelope_starts[track_index]
+    pending_envelope_starts[track_index] = (peak, duration, curve, force or (pending is not None and pending[3]))
+
+
+def flush_envelope_starts(current_time):
+    """Sends the envelope starts queued during this frame (at most one message per triggered track)."""
+    global latency_traces_dropped
+    for i, envelope in enumerate(pending_envelope_starts):
+        if envelope is None:
+            continue
+        pending_envelope_starts[i] = None
+        trace = pending_latency_traces[i]
+        pending_latency_traces[i] = None
+        peak, duration, curve, force = envelope
+
+        # Skip re-hits that would not audibly change the level of the envelope the receiver is already running
+        running = sent_envelope_starts[i]
+        if not vpython_control_faders_enabled or (
+                not force and running is not None and running[2] == duration and running[3] == curve and
+                peak - envelope_value(running[1], duration, curve, current_time - running[0])
+                < ENVELOPE_RETRIGGER_THRESHOLD):
+            if trace is not None:
+                latency_traces_dropped += 1
+            continue
+
+        throttle_time_ns = time.perf_counter_ns()
+        msg = osc_message_builder.OscMessageBuilder(address=ENVELOPE_START_ADDRESS)
+        msg.add_arg(int(track_numbers[i]))
+        msg.add_arg(float(peak))
+        msg.add_arg(float(duration))
+        msg.add_arg(curve)
+        built_msg = msg.build()
+        encode_time_ns = time.perf_counter_ns()
+        if send_osc_content(built_msg, ENVELOPE_START_ADDRESS):
+            sent_envelope_starts[i] = (current_time, peak, duration, curve)
+            if trace is not None:
+                record_latency_stages(trace, throttle_time_ns, encode_time_ns, time.perf_counter_ns())
+        elif trace is not None:
+            latency_traces_dropped += 1
+
+
+def encode_mixer_state_blob(changed_mask, quantized_values):
+    """Packs the changed-field mask and the 16-bit values of those fields into a mixer state blob (see layout above)."""
+    header = struct.pack("<BBB", PACKED_MIXER_STATE_VERSION, len(track_numbers), master_track_number)
+    return header + bytes(track_numbers) + np.packbits(changed_mask, bitorder="little").tobytes() + \
+        quantized_values.astype("<u2").tobytes()
+
+
+def send_packed_mixer_state(current_time):
+    """Sends every mixer field that changed since the last blob (all fields on keyframes) as one message."""
+    global last_packed_keyframe_time, latency_traces_dropped
+    # Volume fields are left out while REAPER's faders are under manual control or run by receiver envelopes
+    include_volumes = vpython_control_faders_enabled and not USE_RECEIVER_ENVELOPES
+    keyframe = current_time - last_packed_keyframe_time >= PACKED_STATE_KEYFRAME_INTERVAL
+    threshold_quantized = PACKED_STATE_VALUE_THRESHOLD * 65535
+    track_field_count = 3 * len(track_numbers)
+
+    quantized = np.rint(np.clip(packed_field_values, 0.0, 1.0) * 65535).astype(np.int64)
+    if keyframe:
+        changed_mask = np.ones(packed_field_count, dtype=bool)
+    else:
+        difference = np.abs(quantized - packed_last_sent_quantized)
+        changed_mask = (difference != 0) & ((difference >= threshold_quantized) | (quantized == 0))
+    if not include_volumes:
+        changed_mask[0:track_field_count:3] = False
+
+    sent_volume_tracks = set()
+    if changed_mask.any():
+        throttle_time_ns = time.perf_counter_ns()
+        msg = osc_message_builder.OscMessageBuilder(address=PACKED_MIXER_STATE_ADDRESS)
+        msg.add_arg(encode_mixer_state_blob(changed_mask, quantized[changed_mask]), arg_type="b")
+        built_msg = msg.build()
+        encode_time_ns = time.perf_counter_ns()
+        if send_osc_content(built_msg, PACKED_MIXER_STATE_ADDRESS):
+            send_time_ns = time.perf_counter_ns()
+            if keyframe:
+                last_packed_keyframe_time = current_time
+            packed_last_sent_quantized[changed_mask] = quantized[changed_mask]
+            for track_index in np.flatnonzero(changed_mask[0:track_field_count:3]):
+                sent_volume_tracks.add(track_index)
+                reaper_track_volumes[track_numbers[track_index]] = float(packed_field_values[3 * track_index])
+                trace = pending_latency_traces[track_index]
+                if trace is not None:
+                    record_latency_stages(trace, throttle_time_ns, encode_time_ns, send_time_ns)
+                    pending_latency_traces[track_index] = None
+
+    # Hits whose volume change did not make it into a blob
+    if not USE_RECEIVER_ENVELOPES:
+        for track_index, trace in enumerate(pending_latency_traces):
+            if trace is not None and track_index not in sent_volume_tracks:
+                pending_latency_traces[track_index] = None
+                latency_traces_dropped += 1
+
+
+def build_initial_mixer_bundle():
+    """Builds one OSC bundle holding the initial volume, pan, Azimuth and Elevation of every track plus master FX."""
+    bundle = osc_bundle_builder.OscBundleBuilder(osc_bundle_builder.IMMEDIATELY)
+
+    def add_float_message(address, value):
+        msg = osc_message_builder.OscMessageBuilder(address=address)
+        msg.add_arg(float(value))
+        bundle.add_content(msg.build())
+
+    for track_num in track_numbers: # Tracks 2-10
+        add_float_message(f"/track/{track_num}/volume", 0.0)
+        add_float_message(f"/track/{track_num}/pan", pan_offset)
+        add_float_message(f"/track/{track_num}/fx/2/fxparam/8/value", default_azimuth) # Azimuth, FX slot 2
+        add_float_message(f"/track/{track_num}/fx/2/fxparam/9/value", default_elevation) # Elevation, FX slot 2
+
+    add_float_message(f"/track/{master_track_number}/reverb/drywet", master_reverb_drywet_off) # Master Reverb (Track 1)
+    add_float_message(f"/track/{master_track_number}/fx/1/fxparam/12/value", master_fx_param_12_value) # Master FX Param 12
+    return bundle.build()
+
+
+def send_startup_handshake():
+    """
+    Sends the initial mixer state as one bundle and optionally waits for REAPER's feedback.
+    Runs in a background thread so the VPython scene can be constructed at the same time.
+    """
+    global last_sent_master_reverb_drywet, last_sent_master_fx_param_12, last_master_reverb_send_time, \
+        last_master_fx_param_12_send_time, startup_ack_received, startup_handshake_duration
+    handshake_start = time.perf_counter()
+    send_osc_content(build_initial_mixer_bundle(), "initial mixer state bundle")
 
-time.sleep(0.1)
+    # Record the initial state as sent, so the threshold/interval logic in send_osc_message starts from it
+    send_time = sim_clock()
+    for i, track_num in enumerate(track_numbers):
+        last_sent_volume[i] = 0.0
+        last_volume_send_time[i] = send_time
+        last_sent_azimuth[i] = default_azimuth
+        last_azimuth_send_time[i] = send_time
+        last_sent_elevation[i] = default_elevation
+        last_elevation_send_time[i] = send_time
+        reaper_track_volumes[track_num] = 0.0
+    last_sent_master_reverb_drywet = master_reverb_drywet_off
+    last_master_reverb_send_time = send_time
+    last_sent_master_fx_param_12 = master_fx_param_12_value
+    last_master_fx_param_12_send_time = send_time
+
+    if STARTUP_WAIT_FOR_ACK:
+        startup_ack_received = startup_ack_event.wait(STARTUP_ACK_TIMEOUT)
+    startup_handshake_duration = time.perf_counter() - handshake_start
+
+
+# Send the initial mixer state while the VPython scene below is being constructed
+startup_handshake_thread = threading.Thread(target=send_startup_handshake)
+startup_handshake_thread.daemon = True
+startup_handshake_thread.start()
 
 scene.center = vector(0, 0, 0)
 scene.autoscale = False
@@ -359,6 +885,11 @@ dt = 0.005
 t = 0
 
 g = vector(0, -30, 0)
+
+# Integrator for balls and rings (see Integrators): "semi_implicit_euler" (velocity first, then position with the
+# new velocity), "velocity_verlet" (second order, needs one extra force evaluation per step) or "explicit_euler"
+# (position with the old velocity; unstable with the attraction spring, for comparison only)
+INTEGRATOR = "semi_implicit_euler"
 plane_cor = 0.6
 friction_coefficient_plane = 0.15
 
@@ -444,7 +975,6 @@ dot_vobj = sphere(pos=vector(ring_radius + dot_offset_from_ring_edge, 0, 0),
 pos1, vel1, angular_vel1 = generate_random_ring_initials(ring_radius)
 rotating_object = compound([ring_vobj, dot_vobj, ring_glow_obj], pos=pos1)
 rotating_object.vel = vel1
-rotating_object.angular_vel = angular_vel1
 rotating_object.mass = ring_mass # Set ring mass
 # Store references to internal objects and pulse parameters
 rotating_object.ring_vobj = ring_vobj
@@ -486,7 +1016,6 @@ dot_vobj_2 = sphere(pos=vector(ring_radius_2 + dot_offset_from_ring_edge * (2 /
 pos2, vel2, angular_vel2 = generate_random_ring_initials(ring_radius_2)
 rotating_object_2 = compound([ring_vobj_2, dot_vobj_2, ring_glow_obj_2], pos=pos2)
 rotating_object_2.vel = vel2
-rotating_object_2.angular_vel = angular_vel2
 rotating_object_2.mass = ring_mass # Set ring mass
 # Store references to internal objects and pulse parameters
 rotating_object_2.ring_vobj = ring_vobj_2
@@ -528,7 +1057,6 @@ dot_vobj_3 = sphere(pos=vector(ring_radius_3 + dot_offset_from_ring_edge * 0.75,
 pos3, vel3, angular_vel3 = generate_random_ring_initials(ring_radius_3)
 rotating_object_3 = compound([ring_vobj_3, dot_vobj_3, ring_glow_obj_3], pos=pos3)
 rotating_object_3.vel = vel3
-rotating_object_3.angular_vel = angular_vel3
 rotating_object_3.mass = ring_mass # Set ring mass
 # Store references to internal objects and pulse parameters
 rotating_object_3.ring_vobj = ring_vobj_3
@@ -570,7 +1098,6 @@ dot_vobj_4 = sphere(pos=vector(ring_radius_4 + dot_offset_from_ring_edge * 0.5,
 pos4, vel4, angular_vel4 = generate_random_ring_initials(ring_radius_4)
 rotating_object_4 = compound([ring_vobj_4, dot_vobj_4, ring_glow_obj_4], pos=pos4)
 rotating_object_4.vel = vel4
-rotating_object_4.angular_vel = angular_vel4
 rotating_object_4.mass = ring_mass # Set ring mass
 # Store references to internal objects and pulse parameters
 rotating_object_4.ring_vobj = ring_vobj_4
@@ -594,6 +1121,15 @@ ball_quadrant_colors = [
 
 inner_ball_cor = 0.8
 inner_ball_friction = 0.1
+# With SLEEPING_BODIES, ground and ring contacts approaching slower than this end at rest instead of bouncing, so
+# settled balls can fall asleep. Above g * dt (0.25 at the strongest gravity), so a ball lying on the plane or
+# against its ring isn't bounced off it by one frame's gravity. Without SLEEPING_BODIES every contact bounces.
+inner_ball_resting_speed = 0.5
+
+
+def ball_resting_speed():
+    """resting_speed for apply_collision_response on ball contacts (see inner_ball_resting_speed)."""
+    return inner_ball_resting_speed if SLEEPING_BODIES else 0.0
 
 inner_balls = [] # List of small balls for the first ring
 inner_balls_2 = [] # List of small balls for the second ring
@@ -606,7 +1142,7 @@ MIN_BALL_RADIUS = 0.02
 
 SPLIT_COOLDOWN = 0.5
 
-ball_contact_timers = {} # Ball contact timer
+ball_contact_timers = {} # Ball contact timer (pairwise path without USE_CONTACT_SOLVER)
 PROLONGED_CONTACT_THRESHOLD = 0.5
 RAPID_SEPARATION_SPEED = 20.0
 
@@ -614,6 +1150,11 @@ ring_contact_timers = {} # Ring contact timer
 PROLONGED_RING_CONTACT_THRESHOLD = 0.1
 RING_SEPARATION_SPEED = 10.0
 
+# Simulation time span covered by the current physics step (previous frame -> this frame), used to timestamp
+# contacts at the moment they happened inside the step (see contact_step_fraction)
+physics_step_start_time = sim_clock()
+physics_step_end_time = physics_step_start_time
+
 # Create normal indicators for each ring (hidden)
 ring_normal_indicator_1 = cylinder(pos=rotating_object.pos,
                                    axis=rotating_object.up.norm() * 1.0,
@@ -645,7 +1186,7 @@ ring_normal_indicator_4 = cylinder(pos=rotating_object_4.pos,
 
 release_speed = 30.0
 
-last_event_trigger_time = time.time()
+last_event_trigger_time = sim_clock()
 event_phase = "normal"
 release_velocity_applied = False
 
@@ -655,7 +1196,7 @@ class Particle:
         self.vobj = sphere(pos=pos, radius=radius, color=color, opacity=1.0, emissive=True)
         self.vel = vel
         self.lifespan = lifespan
-        self.creation_time = time.time()
+        self.creation_time = sim_clock()
         self.initial_opacity = 1.0
 
 
@@ -682,9 +1223,6 @@ scene.camera.axis = vector(0, -5, -5)
 previous_tilt_angle_x = 0
 previous_tilt_angle_z = 0
 
-section_angle_span = (2 * pi) / 9
-
-
 def lerp(start, end, t_val):
     return start * (1 - t_val) + end * t_val
 
@@ -751,13 +1289,7 @@ def create_new_ball_for_ring(target_ring_obj, target_ring_radius, current_pos=No
         initial_vel = temp_new_ball_dir.hat * speed
         initial_vel.y = current_vel.y
 
-    new_ball = sphere(pos=initial_pos,
-                      radius=current_ball_radius,
-                      color=color.yellow)
-    new_ball.vel = initial_vel
-    new_ball.times_split = 0
-    new_ball.last_split_time = time.time()
-    return new_ball
+    return activate_ball(take_ball_spheres(1)[0], initial_pos, current_ball_radius, initial_vel, target_ring_obj)
 
 
 # Initial ball creation lines removed. Balls will only appear when "Add Ball" is pressed.
@@ -766,6 +1298,130 @@ def create_new_ball_for_ring(target_ring_obj, target_ring_radius, current_pos=No
 # inner_balls_3.append(create_new_ball_for_ring(rotating_object_3, ring_radius_3))
 # inner_balls_4.append(create_new_ball_for_ring(rotating_object_4, ring_radius_4))
 
+
+# --- Ball Pool and Bulk Spawn ---
+# Removed balls are hidden and parked in ball_sphere_pool (retire_ball), and new balls reuse those spheres before
+# any new ones are created (take_ball_spheres). spawn_balls fills the rings in one frame ('B' key / Fill Rings
+# button) instead of one ball per 'A' press: the requested count is spread evenly over the rings with room left
+# under MAX_BALLS, and each ring's positions are a Poisson-disc sample of its inner disc. The sample is drawn by
+# dart throwing: BULK_SPAWN_CANDIDATES_PER_BALL candidates per ball, each with its own ball size, are tested
+# against the ring's balls and each other in one vectorized pass, then kept greedily in draw order. Every kept
+# ball clears all others by BULK_SPAWN_CLEARANCE, so a filled ring starts without contacts, hits or particles.
+BULK_SPAWN_COUNT = 200
+BULK_SPAWN_CANDIDATES_PER_BALL = 8
+BULK_SPAWN_CLEARANCE = 0.02
+BULK_SPAWN_MAX_SPEED = 0.5 # Initial speeds are uniform up to this, in random directions
+
+ball_sphere_pool = [] # Hidden spheres of removed balls
+
+
+def take_ball_spheres(count):
+    """Returns count spheres for new balls, reusing pooled ones first; activate_ball makes them visible."""
+    reused = [ball_sphere_pool.pop() for _ in range(min(count, len(ball_sphere_pool)))]
+    return reused + [sphere(pos=vector(0, 0, 0), radius=BALL_SIZES[0], color=color.yellow, visible=False)
+                     for _ in range(count - len(reused))]
+
+
+def activate_ball(ball, pos, radius, vel, ring_obj):
+    """Resets a sphere from take_ball_spheres to a fresh, awake ball of ring_obj."""
+    ball.pos = pos
+    ball.radius = radius
+    ball.color = color.yellow
+    ball.visible = True
+    ball.vel = vel
+    ball.times_split = 0
+    ball.last_split_time = sim_clock()
+    ball.asleep = False
+    ball.rest_frames = 0
+    ball.rest_check_vel = vector(0, 0, 0)
+    ball.home_ring = ring_obj
+    invalidate_wall_contact(ball)
+    return ball
+
+
+def retire_ball(ball):
+    """
+    Hides a removed ball and parks its sphere in ball_sphere_pool. Everything keyed by id(ball) is dropped, since
+    the id comes back with the sphere: otherwise a reused sphere would inherit the old ball's contact timers or be
+    warm-started with its contact impulses.
+    """
+    ball.visible = False
+    ball_id = id(ball)
+    ring_contact_timers.pop(ball_id, None)
+    ring_last_contact_times.pop(ball_id, None)
+    for contact_key in [key for key in ball_contact_timers if ball_id in key]:
+        del ball_contact_timers[contact_key]
+    impulses = ball.home_ring.contact_impulses
+    for contact_key in [key for key in impulses if ball_id in key]:
+        del impulses[contact_key]
+    ball_sphere_pool.append(ball)
+
+
+def poisson_disc_offsets(radii, inner_radius, occupied, needed, clearance, rng):
+    """
+    Dart-throwing Poisson-disc sample of up to needed balls of the candidate radii inside a disc of inner_radius.
+    occupied holds the (x, z offset, radius) of balls already in the disc. Returns the kept offsets and radii.
+    """
+    reach = np.maximum(inner_radius - radii, 0.0)
+    distances = reach * np.sqrt(rng.random(len(radii))) # Uniform over the area each candidate can reach
+    angles = rng.random(len(radii)) * 2 * pi
+    offsets = np.column_stack([distances * np.cos(angles), distances * np.sin(angles)])
+
+    blocked = np.zeros(len(radii), dtype=bool)
+    if len(occupied):
+        gaps = np.linalg.norm(offsets[:, None, :] - occupied[None, :, :2], axis=2) - radii[:, None] - occupied[None, :, 2]
+        blocked = (gaps < clearance).any(axis=1)
+    conflicts = np.linalg.norm(offsets[:, None, :] - offsets[None, :, :], axis=2) - radii[:, None] - radii[None, :] < clearance
+
+    kept = []
+    for i in np.flatnonzero(~blocked):
+        if blocked[i]:
+            continue
+        kept.append(i)
+        if len(kept) == needed:
+            break
+        blocked |= conflicts[i]
+    return offsets[kept], radii[kept]
+
+
+def spawn_balls(count=BULK_SPAWN_COUNT):
+    """Adds up to count non-overlapping balls, spread evenly over the rings, and returns how many were placed."""
+    ball_lists = [inner_balls, inner_balls_2, inner_balls_3, inner_balls_4]
+    rng = np.random.default_rng(random.getrandbits(32)) # Follows random's seed like the other spawns
+    room = [MAX_BALLS - len(balls) for balls in ball_lists]
+    shares = [0] * len(ball_lists)
+    for _ in range(count):
+        open_rings = [i for i in range(len(ball_lists)) if shares[i] < room[i]]
+        if not open_rings:
+            break
+        shares[min(open_rings, key=lambda i: shares[i])] += 1
+
+    placements = []
+    for ring_obj, balls, share in zip(ring_objects_list, ball_lists, shares):
+        if share == 0:
+            continue
+        inner_radius = ring_obj.base_radius - ring_thickness / 2 - 0.1 # Same margin as create_new_ball_for_ring
+        occupied = np.array([(b.pos.x - ring_obj.pos.x, b.pos.z - ring_obj.pos.z, b.radius) for b in balls]).reshape(-1, 3)
+        candidate_radii = rng.choice(BALL_SIZES, share * BULK_SPAWN_CANDIDATES_PER_BALL)
+        offsets, radii = poisson_disc_offsets(candidate_radii, inner_radius, occupied, share, BULK_SPAWN_CLEARANCE, rng)
+        placements.append((ring_obj, balls, offsets, radii))
+
+    spheres = iter(take_ball_spheres(sum(len(radii) for _, _, _, radii in placements)))
+    placed = 0
+    for ring_obj, balls, offsets, radii in placements:
+        headings = rng.random(len(radii)) * 2 * pi
+        speeds = rng.random(len(radii)) * BULK_SPAWN_MAX_SPEED
+        for (offset_x, offset_z), radius, heading, speed in zip(offsets.tolist(), radii.tolist(), headings.tolist(),
+                                                                speeds.tolist()):
+            pos = vector(ring_obj.pos.x + offset_x, ground_y_top_world + radius + 0.01, ring_obj.pos.z + offset_z)
+            vel = vector(speed * cos(heading), 0, speed * sin(heading))
+            balls.append(activate_ball(next(spheres), pos, radius, vel, ring_obj))
+        placed += len(radii)
+    if placed:
+        trigger_shake(0.3, 0.1)
+    print(f"Bulk spawn: placed {placed} of {count} balls ({len(ball_sphere_pool)} pooled spheres left)")
+    return placed
+
 tilting_pivot_point = vector(0, ground.pos.y - plane_thickness / 2, 0)
 
 # Fixed tilt angle values as sliders have been removed
@@ -780,9 +1436,9 @@ tilt_phase_offset_z = math.pi / 2
 def trigger_shake(intensity, duration):
     global shake_active, shake_start_time, active_shake_duration, active_shake_intensity
     if not shake_active or intensity > active_shake_intensity or \
-            duration > (active_shake_duration - (time.time() - shake_start_time)):
+            duration > (active_shake_duration - (sim_clock() - shake_start_time)):
         shake_active = True
-        shake_start_time = time.time()
+        shake_start_time = sim_clock()
         active_shake_duration = duration
         active_shake_intensity = intensity
 
@@ -790,6 +1446,7 @@ def trigger_shake(intensity, duration):
 def set_gravity(s):
     global g
     g.y = -s.value
+    invalidate_all_wall_contacts()
     trigger_shake(0.6, 0.2)
 
 
@@ -802,6 +1459,7 @@ def set_friction(s):
     global friction_coefficient_plane, inner_ball_friction
     friction_coefficient_plane = s.value
     inner_ball_friction = s.value
+    invalidate_all_wall_contacts()
     trigger_shake(0.2, 0.1)
 
 
@@ -845,30 +1503,35 @@ def add_ball_action():
 scene.append_to_caption(' ')
 button(text='Add Ball (A)', bind=add_ball_action)
 scene.append_to_caption('   ')
+button(text='Fill Rings (B)', bind=lambda: spawn_balls())
+scene.append_to_caption('   ')
 
 
 def clear_all_balls_action():
     global inner_balls, particles, inner_balls_2, inner_balls_3, inner_balls_4, event_phase, release_velocity_applied, clear_visual_effect_active, clear_visual_effect_start_time, quadrant_volume_clearing, quadrant_clear_start_time, quadrant_clear_initial_volume
     for ball in inner_balls:
-        ball.visible = False
+        retire_ball(ball)
     inner_balls = []
     for ball in inner_balls_2:
-        ball.visible = False
+        retire_ball(ball)
     inner_balls_2 = []
     for ball in inner_balls_3:
-        ball.visible = False
+        retire_ball(ball)
     inner_balls_3 = []
     for ball in inner_balls_4:
-        ball.visible = False
+        retire_ball(ball)
     inner_balls_4 = []
     for p in particles:
         p.vobj.visible = False
     particles = []
+    collision_events.discard_pending()
+    pending_spawns.clear()
+    invalidate_all_wall_contacts()
     event_phase = "normal"
     release_velocity_applied = False
 
     clear_visual_effect_active = True
-    clear_visual_effect_start_time = time.time()
+    clear_visual_effect_start_time = sim_clock()
     trigger_shake(2.0, 0.3)
     print("All balls and particles cleared, event phase reset to normal.")
 
@@ -882,16 +1545,21 @@ def clear_all_balls_action():
 
 
     # New: Turn off sound for all tracks (fades out over 3 seconds)
-    current_time = time.time()
+    current_time = sim_clock()
     for i in range(len(track_numbers)):
         # Store current volume to decay from
         quadrant_clear_initial_volume[i] = quadrant_volumes[i]
         quadrant_clear_start_time[i] = current_time
         quadrant_volume_clearing[i] = True # Activate clearing decay state
+        active_envelope_tracks.add(i)
+        if USE_RECEIVER_ENVELOPES and quadrant_volumes[i] > 0:
+            queue_envelope_start(i, quadrant_volumes[i], clear_volume_decay_duration, "linear", force=True)
 
         # Immediately reset Azimuth and Elevation to default values
         quadrant_azimuths[i] = default_azimuth
         quadrant_elevations[i] = default_elevation
+        azimuth_ramp_start_values[i] = default_azimuth
+        elevation_ramp_start_values[i] = default_elevation
         send_osc_message(f"/track/{track_numbers[i]}/fx/2/fxparam/8/value", default_azimuth, current_time,
                          last_sent_azimuth, last_azimuth_send_time)
         send_osc_message(f"/track/{track_numbers[i]}/fx/2/fxparam/9/value", default_elevation, current_time,
@@ -910,26 +1578,24 @@ def release_balls_action():
     global event_phase, last_event_trigger_time, reverb_active_time, release_velocity_applied, master_fx_param_12_state, master_fx_param_12_start_time, master_fx_param_12_value
     if event_phase == "normal":
         event_phase = "releasing"
-        last_event_trigger_time = time.time()
+        last_event_trigger_time = sim_clock()
         trigger_shake(1.6, 0.2)
         # Master Reverb dry/wet for track 1
-        send_osc_message(f"/track/{master_track_number}/reverb/drywet", master_reverb_drywet_on, time.time(), None,
+        send_osc_message(f"/track/{master_track_number}/reverb/drywet", master_reverb_drywet_on, sim_clock(), None,
                          None)
-        reverb_active_time = time.time()
+        reverb_active_time = sim_clock()
         # Send /marker message directly, no optimization
-        try:
-            osc_client.send_message("/marker/2/play", 1)
-        except Exception as e:
-            print(f"Error sending OSC message to /marker/2/play with value 1: {e}")
+        send_osc_value("/marker/2/play", 1)
 
         release_velocity_applied = False
 
         # Start master FX param 12 ramp up for track 1, FX slot 1
-        master_fx_param_12_start_time = time.time()
+        master_fx_param_12_start_time = sim_clock()
         master_fx_param_12_state = "ramping_up"
         master_fx_param_12_value = 0.0
 
         # New ring random ejection logic
+        invalidate_all_wall_contacts()
         min_ring_release_speed = 10.0
         max_ring_release_speed = 20.0
 
@@ -966,20 +1632,14 @@ scene.append_to_caption('   ')
 # Define reaper_play_action and reaper_stop_action functions here
 def reaper_play_action():
     # Send /play message directly, no optimization
-    try:
-        osc_client.send_message("/play", 1)
+    if send_osc_value("/play", 1):
         print("REAPER: Play")
-    except Exception as e:
-        print(f"Error sending OSC message to /play with value 1: {e}")
 
 
 def reaper_stop_action():
     # Send /stop message directly, no optimization
-    try:
-        osc_client.send_message("/stop", 1)
+    if send_osc_value("/stop", 1):
         print("REAPER: Stop")
-    except Exception as e:
-        print(f"Error sending OSC message to /stop with value 1: {e}")
 
 
 scene.append_to_caption(' ')
@@ -1023,6 +1683,7 @@ def toggle_attraction_strength():
         current_attraction_state = "small"
         attraction_toggle_button.text = f'Ball Attraction: Small ({SMALL_ATTRACTION_STRENGTH:.1f})'
         print(f"Ball attraction strength set to: Small ({ball_attraction_strength:.1f})")
+    invalidate_all_wall_contacts()
     trigger_shake(0.1, 0.1)
 
 scene.append_to_caption(' ')
@@ -1030,12 +1691,12 @@ attraction_toggle_button = button(text=f'Ball Attraction: Small ({SMALL_ATTRACTI
 scene.append_to_caption('\n')
 
 
-def apply_collision_response(obj_vel, normal, cor, friction_coeff, dt, mass=1.0):
-    """Applies collision response to an object's velocity."""
+def apply_collision_response(obj_vel, normal, cor, friction_coeff, dt, mass=1.0, resting_speed=0.0):
+    """Applies collision response to an object's velocity. Normal speeds below resting_speed don't bounce."""
     v_normal = dot(obj_vel, normal) * normal
     v_tangent = obj_vel - v_normal
 
-    v_normal_after_bounce = -v_normal * cor
+    v_normal_after_bounce = -v_normal * cor if v_normal.mag >= resting_speed else vector(0, 0, 0)
 
     if v_tangent.mag > 0:
         normal_force_magnitude = g.mag * mass
@@ -1050,41 +1711,46 @@ def apply_collision_response(obj_vel, normal, cor, friction_coeff, dt, mass=1.0)
     return v_normal_after_bounce + v_tangent
 
 
-def handle_ball_ground_collision(ball):
-    """Handles collision between a ball and the ground plane."""
-    ground_normal = ground.up.norm()
-    distance_ball_to_plane_top = dot(ball.pos - (ground.pos + (plane_thickness / 2) * ground_normal),
-                                     ground_normal)
+def handle_ball_ground_collision(ball, step=dt):
+    """
+    Handles collision between a ball and the ground plane.
+    A ball that reached the plane during this step (swept sphere) is resolved at its time of impact and finishes
+    the step with the bounced velocity; one that already touched it at the start of the step is pushed out.
+    In the table frame the plane's top face is y = ground_y_top_world (see Table Frame).
+    """
+    ground_normal = TABLE_UP_AXIS
+    distance_ball_to_plane_top = ball.pos.y - ground_y_top_world
+    normal_step_displacement = ball.vel.y * step
+
+    if distance_ball_to_plane_top < ball.radius and normal_step_displacement < 0:
+        if distance_ball_to_plane_top - normal_step_displacement >= ball.radius:
+            step_remainder = step * (distance_ball_to_plane_top - ball.radius) / normal_step_displacement
+            ball.pos -= ball.vel * step_remainder
+            ball.vel = apply_collision_response(ball.vel, ground_normal, inner_ball_cor, inner_ball_friction, step,
+                                                resting_speed=ball_resting_speed())
+            ball.pos += ball.vel * step_remainder
+            return
 
-    if distance_ball_to_plane_top < ball.radius and dot(ball.vel, ground_normal) < 0:
-        projection_on_plane_top_ball = ball.pos - distance_ball_to_plane_top * ground_normal
-        ball.pos = projection_on_plane_top_ball + ball.radius * ground_normal
+        ball.pos = vector(ball.pos.x, ground_y_top_world + ball.radius, ball.pos.z)
 
-        ball.vel = apply_collision_response(ball.vel, ground_normal, inner_ball_cor, inner_ball_friction, dt)
+        ball.vel = apply_collision_response(ball.vel, ground_normal, inner_ball_cor, inner_ball_friction, step,
+                                            resting_speed=ball_resting_speed())
 
 
 # Generic function to handle ring physics
 def handle_ring_physics_for_object(ring_obj, current_ring_radius):
     """Applies physics (gravity, angular momentum, collisions) to a ring object."""
-    ring_obj.vel += g * dt
-    ring_obj.pos += ring_obj.vel * dt
-
-    # Simplified angular momentum: maintain constant torque and apply additional impulse on collision
-    ring_obj.angular_vel += ring_obj.up.norm() * constant_torque_magnitude * dt
-    ring_obj.rotate(angle=ring_obj.angular_vel.mag * dt,
-                    axis=ring_obj.angular_vel.norm(),
-                    origin=ring_obj.pos)
-
-    ground_normal = ground.up.norm()
-    distance_center_to_plane_top = dot(ring_obj.pos - (ground.pos + (plane_thickness / 2) * ground_normal),
-                                       ground_normal)
+    integrate_motion(ring_obj, gravity_acceleration, dt, INTEGRATOR)
+    # Spin is integrated for all rings at once (see Ring Pose)
+
+    ground_normal = TABLE_UP_AXIS
+    distance_center_to_plane_top = ring_obj.pos.y - ground_y_top_world
     min_distance_for_no_penetration = ring_thickness / 2
 
     if distance_center_to_plane_top < min_distance_for_no_penetration:
-        projection_on_plane_top = ring_obj.pos - distance_center_to_plane_top * ground_normal
-        ring_obj.pos = projection_on_plane_top + min_distance_for_no_penetration * ground_normal
+        ring_obj.pos = vector(ring_obj.pos.x, ground_y_top_world + min_distance_for_no_penetration, ring_obj.pos.z)
 
-        if dot(ring_obj.vel, ground_normal) < 0:
+        if ring_obj.vel.y < 0:
             # Calculate ring restitution coefficient: smaller radius, higher restitution coefficient
             all_ring_radii = [ring_radius, ring_radius_2, ring_radius_3, ring_radius_4]
             min_overall_radius = min(all_ring_radii)
@@ -1102,39 +1768,233 @@ def handle_ring_physics_for_object(ring_obj, current_ring_radius):
             ring_obj.vel = apply_collision_response(ring_obj.vel, ground_normal, current_ring_cor,
                                                     friction_coefficient_plane, dt)
 
-    ground_local_x_axis = ground.axis.norm()
-    ground_local_z_axis = cross(ground_normal, ground_local_x_axis).norm()
-
-    vec_ring_to_ground_center = ring_obj.pos - ground.pos
-    local_x = dot(vec_ring_to_ground_center, ground_local_x_axis)
-    local_z = dot(vec_ring_to_ground_center, ground_local_z_axis)
+    # The plane's edges are the table frame's x and z axes
+    local_x = ring_obj.pos.x - ground.pos.x
+    local_z = ring_obj.pos.z - ground.pos.z
 
     max_x_bound = plane_length / 2 - current_ring_radius
     max_z_bound = plane_width / 2 - current_ring_radius
 
     if abs(local_x) > max_x_bound:
-        clamped_x = max_x_bound * sign(local_x)
-        correction_vec_x = (clamped_x - local_x) * ground_local_x_axis
-        ring_obj.pos += correction_vec_x
-        ring_obj.vel -= 2 * dot(ring_obj.vel, ground_local_x_axis) * ground_local_x_axis * 0.5
+        ring_obj.pos = vector(ground.pos.x + max_x_bound * sign(local_x), ring_obj.pos.y, ring_obj.pos.z)
+        note_ring_edge_bounce(ring_obj, abs(ring_obj.vel.x))
+        ring_obj.vel = vector(ring_obj.vel.x - 2 * ring_obj.vel.x * 0.5, ring_obj.vel.y, ring_obj.vel.z)
 
     if abs(local_z) > max_z_bound:
-        clamped_z = max_z_bound * sign(local_z)
-        correction_vec_z = (clamped_z - local_z) * ground_local_z_axis
-        ring_obj.pos += correction_vec_z
-        ring_obj.vel -= 2 * dot(ring_obj.vel, ground_local_z_axis) * ground_local_z_axis * 0.5
+        ring_obj.pos = vector(ring_obj.pos.x, ring_obj.pos.y, ground.pos.z + max_z_bound * sign(local_z))
+        note_ring_edge_bounce(ring_obj, abs(ring_obj.vel.z))
+        ring_obj.vel = vector(ring_obj.vel.x, ring_obj.vel.y, ring_obj.vel.z - 2 * ring_obj.vel.z * 0.5)
 
 
 # New: Define a list of all rings for volume control toggling
 ring_objects_list = [rotating_object, rotating_object_2, rotating_object_3, rotating_object_4]
+for ring_index, ring_obj in enumerate(ring_objects_list):
+    ring_obj.ring_index = ring_index # Stored in collision events instead of the object itself
+    ring_obj.contact_impulses = {} # Contact Solver warm-start impulses, keyed by ball pair
+    ring_obj.wall_contact_queue = [] # Wall Contact Scheduling: (predicted contact time, sequence, ball)
+    ring_obj.wall_contacts_stale = True
+    ring_obj.sector_track_indices = ring_sector_track_indices[ring_index]
+    ring_obj.sector_angle_span = (2 * pi) / len(ring_obj.sector_track_indices)
+
+
+# --- Ring Pose ---
+# Ring orientations and angular velocities live in plain arrays, one row per ring in ring_objects_list, with
+# orientations as unit quaternions (w, x, y, z) mapping ring-local to table coordinates (see Table Frame). Spin
+# is integrated for all rings at once; ring positions stay on ring_obj.pos, which is a plain translation.
+# The compounds are only given their orientation in push_ring_poses(), once per frame before rendering, instead
+# of going through compound.rotate's axis/up bookkeeping three times per frame. The ring-local frames used by
+# the collision code are derived once per step (update_ring_frames).
+RING_LOCAL_X_AXIS = np.array([1.0, 0.0, 0.0]) # compound.axis direction
+RING_LOCAL_UP_AXIS = np.array([0.0, 1.0, 0.0]) # compound.up direction, the spin-up torque axis
+
+
+def quaternion_multiply(a, b):
+    """Hamilton product of quaternions (w, x, y, z) along the last axis; a and b broadcast against each other."""
+    aw, ax, ay, az = np.moveaxis(np.asarray(a), -1, 0)
+    bw, bx, by, bz = np.moveaxis(np.asarray(b), -1, 0)
+    return np.stack([aw * bw - ax * bx - ay * by - az * bz,
+                     aw * bx + ax * bw + ay * bz - az * by,
+                     aw * by - ax * bz + ay * bw + az * bx,
+                     aw * bz + ax * by - ay * bx + az * bw], axis=-1)
+
+
+def quaternion_from_rotation_vectors(rotation_vectors):
+    """Unit quaternions for rotations by |v| radians about v, for rotation vectors v along the last axis."""
+    rotation_vectors = np.asarray(rotation_vectors, dtype=float)
+    angles = np.linalg.norm(rotation_vectors, axis=-1)
+    safe_angles = np.where(angles > 0, angles, 1.0)
+    scale = np.where(angles > 0, np.sin(angles / 2) / safe_angles, 0.5)
+    return np.concatenate([np.cos(angles / 2)[..., None], rotation_vectors * scale[..., None]], axis=-1)
+
+
+def quaternion_conjugate(quaternions):
+    """Inverse rotations of unit quaternions (..., 4)."""
+    return quaternions * [1, -1, -1, -1]
+
+
+def rotate_by_quaternions(quaternions, vectors):
+    """Rotates vectors (..., 3) by unit quaternions (..., 4)."""
+    w = quaternions[..., :1]
+    u = quaternions[..., 1:]
+    t = 2 * np.cross(u, vectors)
+    return vectors + w * t + np.cross(u, t)
+
+
+def quaternion_from_frame(x_axis, y_axis):
+    """Unit quaternion of the rotation taking the local x / y axes to the given (perpendicular) world vectors."""
+    x = np.array([x_axis.x, x_axis.y, x_axis.z]) / x_axis.mag
+    y = np.array([y_axis.x, y_axis.y, y_axis.z]) / y_axis.mag
+    m = np.column_stack([x, y, np.cross(x, y)])
+    # Shepperd's method: divide by the largest of the four candidate components
+    candidates = [1 + m[0, 0] + m[1, 1] + m[2, 2], 1 + m[0, 0] - m[1, 1] - m[2, 2],
+                  1 - m[0, 0] + m[1, 1] - m[2, 2], 1 - m[0, 0] - m[1, 1] + m[2, 2]]
+    largest = int(np.argmax(candidates))
+    s = 2 * sqrt(candidates[largest])
+    if largest == 0:
+        q = [s / 4, (m[2, 1] - m[1, 2]) / s, (m[0, 2] - m[2, 0]) / s, (m[1, 0] - m[0, 1]) / s]
+    elif largest == 1:
+        q = [(m[2, 1] - m[1, 2]) / s, s / 4, (m[0, 1] + m[1, 0]) / s, (m[0, 2] + m[2, 0]) / s]
+    elif largest == 2:
+        q = [(m[0, 2] - m[2, 0]) / s, (m[0, 1] + m[1, 0]) / s, s / 4, (m[1, 2] + m[2, 1]) / s]
+    else:
+        q = [(m[1, 0] - m[0, 1]) / s, (m[0, 2] + m[2, 0]) / s, (m[1, 2] + m[2, 1]) / s, s / 4]
+    return np.array(q) / np.linalg.norm(q)
+
+
+ring_orientations = np.array([quaternion_from_frame(ring_obj.axis, ring_obj.up) for ring_obj in ring_objects_list])
+ring_angular_velocities = np.array([(w.x, w.y, w.z) for w in (angular_vel1, angular_vel2, angular_vel3, angular_vel4)])
+ring_axis_lengths = [ring_obj.axis.mag for ring_obj in ring_objects_list] # compound.axis is pushed at this length
+
+
+def integrate_ring_orientations(step):
+    """Simplified angular momentum for all rings: constant torque about each ring's up axis, then spin."""
+    up_axes = rotate_by_quaternions(ring_orientations, RING_LOCAL_UP_AXIS)
+    ring_angular_velocities[:] += up_axes * constant_torque_magnitude * step
+    spun = quaternion_multiply(quaternion_from_rotation_vectors(ring_angular_velocities * step), ring_orientations)
+    ring_orientations[:] = spun / np.linalg.norm(spun, axis=1)[:, None]
+
+
+def update_ring_frames():
+    """Derives each ring's local frame for this step's collision code (sector angle and pan of ring contacts)."""
+    x_axes = rotate_by_quaternions(ring_orientations, RING_LOCAL_X_AXIS)
+    for ring_obj, x_axis in zip(ring_objects_list, x_axes.tolist()):
+        ring_local_up_axis = vector(*x_axis)
+        temp_ref = vector(1, 0, 0) if abs(dot(ring_local_up_axis, vector(1, 0, 0))) < 0.9 else vector(0, 0, 1)
+        ring_obj.local_right_axis = cross(ring_local_up_axis, temp_ref).norm()
+        ring_obj.local_forward_axis = cross(ring_obj.local_right_axis, ring_local_up_axis).norm()
+
+
+def push_ring_poses():
+    """Hands the rings' orientations to their compounds for rendering."""
+    x_axes = rotate_by_quaternions(ring_orientations, RING_LOCAL_X_AXIS)
+    up_axes = rotate_by_quaternions(ring_orientations, RING_LOCAL_UP_AXIS)
+    for ring_obj, x_axis, up_axis, axis_length in zip(ring_objects_list, x_axes.tolist(), up_axes.tolist(),
+                                                      ring_axis_lengths):
+        ring_obj.axis = vector(*x_axis) * axis_length
+        ring_obj.up = vector(*up_axis)
+
+
+update_ring_frames()
+
+
+# --- Table Frame ---
+# Physics runs in the table's own frame: the ground never moves, its top face is the plane
+# y = ground_y_top_world and its edges are the x and z axes. Balls and rings are never rotated with the table.
+# Instead, the tilt is a single orientation (table_orientation, table -> world) that turns world gravity into
+# table_gravity once per frame. VPython draws the scene in table coordinates too, so the sway is shown by
+# turning the camera, scene.up and the lights the opposite way (sync_table_view). Everything drawn therefore
+# moves with the table, including the ambisonics hemisphere. Consumers that need world coordinates (the
+# camera modes, elevation from ring height) convert with table_to_world.
+TABLE_UP_AXIS = vector(0, 1, 0)
+
+table_orientation = np.array([1.0, 0.0, 0.0, 0.0]) # Accumulated tilt, table -> world
+rendered_table_orientation = table_orientation.copy() # Tilt the camera was last placed with
+table_gravity = vector(g)
+tilt_light_directions = [(light, vector(light.direction)) for light in scene.lights] # World directions
+
+
+def rotate_by_table(direction, orientation):
+    rotated = rotate_by_quaternions(orientation, np.array([direction.x, direction.y, direction.z]))
+    return vector(*rotated.tolist())
+
+
+def table_to_world(pos, orientation=None):
+    """World position of a table-frame position (the current tilt unless orientation is given)."""
+    orientation = table_orientation if orientation is None else orientation
+    return tilting_pivot_point + rotate_by_table(pos - tilting_pivot_point, orientation)
+
+
+def world_to_table(pos, orientation=None):
+    orientation = table_orientation if orientation is None else orientation
+    return tilting_pivot_point + rotate_by_table(pos - tilting_pivot_point, quaternion_conjugate(orientation))
+
+
+def tilt_table(angle_x, angle_z):
+    """Applies one step of table sway (about world x, then z, through tilting_pivot_point)."""
+    global table_gravity
+    tilt = quaternion_multiply(quaternion_from_rotation_vectors([0.0, 0.0, angle_z]),
+                               quaternion_from_rotation_vectors([angle_x, 0.0, 0.0]))
+    tilted = quaternion_multiply(tilt, table_orientation)
+    table_orientation[:] = tilted / np.linalg.norm(tilted)
+    table_gravity = rotate_by_table(g, quaternion_conjugate(table_orientation))
+
+
+def sync_table_view(camera_world_pos, camera_world_axis):
+    """Places the camera and lights, given in world coordinates, into the table-frame scene."""
+    inverse = quaternion_conjugate(table_orientation)
+    scene.camera.pos = world_to_table(camera_world_pos)
+    scene.camera.axis = rotate_by_table(camera_world_axis, inverse)
+    scene.up = rotate_by_table(vector(0, 1, 0), inverse)
+    for light, world_direction in tilt_light_directions:
+        light.direction = rotate_by_table(world_direction, inverse)
+    rendered_table_orientation[:] = table_orientation
+
+
+def ring_sector(ring_obj, angle):
+    """Returns the sector of a ring that an angle (0..2*pi) falls in."""
+    return min(int(angle / ring_obj.sector_angle_span), len(ring_obj.sector_track_indices) - 1)
+
+
+def ring_sector_track(ring_obj, angle):
+    """Routes an angle (0..2*pi) on a ring to the index into track_numbers of the sector it falls in."""
+    return int(ring_obj.sector_track_indices[ring_sector(ring_obj, angle)])
+
+
+def contact_step_fraction(end_offset, step_displacement, contact_distance, contained):
+    """
+    Sub-step time of impact: the fraction (0..1) of the physics step at which a contact began, assuming linear
+    motion during the step. end_offset is the separation at the end of the step (before any correction) and
+    step_displacement how much it changed during the step. For contained bodies (a ball inside a ring) contact
+    means the separation grew past contact_distance, otherwise that it shrank below it. Returns 0 if the bodies
+    were already in contact at the start of the step.
+    """
+    # |end_offset - s * step_displacement| = contact_distance, with s = 1 - fraction counted back from the end
+    a = dot(step_displacement, step_displacement)
+    if a == 0:
+        return 0.0
+    b = dot(end_offset, step_displacement)
+    c = dot(end_offset, end_offset) - contact_distance * contact_distance
+    discriminant = b * b - a * c
+    if discriminant < 0:
+        return 0.0
+    root = math.sqrt(discriminant)
+    s = (b - root) / a if contained else (b + root) / a
+    return 1.0 - s if 0.0 <= s <= 1.0 else 0.0
+
+
+def step_time(fraction):
+    """Simulation time at a fraction (0..1) of the current physics step."""
+    return physics_step_start_time + fraction * (physics_step_end_time - physics_step_start_time)
 
 
 # Generic function to handle ball-ring collisions
-def handle_ball_ring_collision_for_object(ball, ring_obj, ring_radius_val, ring_glow_obj_val, ring_vobj_val,
-                                          current_time, balls_to_add, balls_to_remove):
+def handle_ball_ring_collision_for_object(ball, ring_obj, ring_radius_val, current_time, step=dt):
     """
     Handles collision between a ball and a ring.
-    Updates ball velocity, ring angular velocity, and triggers sound/visual effects.
+    Updates ball velocity and ring angular velocity, and publishes a collision event for the
+    sound/visual/particle consumers (see dispatch_collision_events).
+    A ball that reached the inner wall during this step (swept sphere) is resolved where and when it touched it and
+    finishes the step with the bounced velocity; one that already touched it at the start of the step is pushed out.
     """
     vec_ball_to_ring_center_xz = vector(ball.pos.x - ring_obj.pos.x, 0,
                                         ball.pos.z - ring_obj.pos.z)
@@ -1143,9 +2003,22 @@ def handle_ball_ring_collision_for_object(ball, ring_obj, ring_radius_val, ring_
     ring_inner_radius_effective = ring_radius_val - ring_thickness / 2
 
     if ball_horizontal_dist > ring_inner_radius_effective - ball.radius:
-        collision_normal_xz = vec_ball_to_ring_center_xz.norm()
-        penetration_depth = (ball_horizontal_dist + ball.radius) - ring_inner_radius_effective
-        ball.pos -= penetration_depth * vector(collision_normal_xz.x, 0, collision_normal_xz.z)
+        contact_time_ns = time.perf_counter_ns() if LATENCY_TRACING_ENABLED else 0
+        contact_fraction = contact_step_fraction(vec_ball_to_ring_center_xz, vector(ball.vel.x, 0, ball.vel.z) * step,
+                                                 ring_inner_radius_effective - ball.radius, True)
+        step_remainder = (1.0 - contact_fraction) * step if contact_fraction > 0 else 0.0
+        if step_remainder > 0:
+            # Back up to the time of impact; the normal is the wall's normal at the contact point
+            ball.pos -= ball.vel * step_remainder
+            collision_normal_xz = vector(ball.pos.x - ring_obj.pos.x, 0, ball.pos.z - ring_obj.pos.z).norm()
+        else:
+            collision_normal_xz = vec_ball_to_ring_center_xz.norm()
+            penetration_depth = (ball_horizontal_dist + ball.radius) - ring_inner_radius_effective
+            ball.pos -= penetration_depth * vector(collision_normal_xz.x, 0, collision_normal_xz.z)
+
+        last_contact_time = ring_last_contact_times.get(id(ball))
+        ring_last_contact_times[id(ball)] = current_time
+        is_new_contact = last_contact_time is None or current_time - last_contact_time > ONSET_REARM_TIME
 
         if id(ball) not in ring_contact_timers:
             ring_contact_timers[id(ball)] = current_time
@@ -1158,10 +2031,10 @@ def handle_ball_ring_collision_for_object(ball, ring_obj, ring_radius_val, ring_
                 return
 
         ball_vel_xz = vector(ball.vel.x, 0, ball.vel.z)
-        ball.vel = vector(
-            apply_collision_response(ball_vel_xz, collision_normal_xz, inner_ball_cor, inner_ball_friction, dt).x,
-            ball.vel.y,
-            apply_collision_response(ball_vel_xz, collision_normal_xz, inner_ball_cor, inner_ball_friction, dt).z)
+        vel_before_response = ball.vel
+        ball_vel_xz_after = apply_collision_response(ball_vel_xz, collision_normal_xz, inner_ball_cor, inner_ball_friction,
+                                                     step, resting_speed=ball_resting_speed())
+        ball.vel = vector(ball_vel_xz_after.x, ball.vel.y, ball_vel_xz_after.z)
 
         # Apply simplified angular momentum impulse to the ring
         # Calculate tangential velocity of the ball relative to the ring's center
@@ -1177,18 +2050,13 @@ def handle_ball_ring_collision_for_object(ball, ring_obj, ring_radius_val, ring_
                 # Impulse magnitude related to ball's tangential speed and a random factor
                 angular_impulse_magnitude = (abs(ball_tangential_speed) / 100.0) * random.uniform(0.01, 0.05)
                 # Impulse direction depends on the direction of tangential speed
-                ring_obj.angular_vel.y += angular_impulse_magnitude * sign(ball_tangential_speed)
+                ring_angular_velocities[ring_obj.ring_index, 1] += angular_impulse_magnitude * sign(ball_tangential_speed)
             else: # If tangential speed is very small, apply a tiny random impulse
-                ring_obj.angular_vel.y += random.uniform(-0.005, 0.005)
+                ring_angular_velocities[ring_obj.ring_index, 1] += random.uniform(-0.005, 0.005)
 
         relative_ball_pos = ball.pos - ring_obj.pos
-        ring_local_up_axis = ring_obj.axis.norm()
-        temp_ref = vector(1, 0, 0) if abs(dot(ring_local_up_axis, vector(1, 0, 0))) < 0.9 else vector(0, 0, 1)
-        ring_local_right_axis = cross(ring_local_up_axis, temp_ref).norm()
-        ring_local_forward_axis = cross(ring_local_right_axis, ring_local_up_axis).norm()
-
-        local_x_component = dot(relative_ball_pos, ring_local_right_axis)
-        local_z_component = dot(relative_ball_pos, ring_local_forward_axis)
+        local_x_component = dot(relative_ball_pos, ring_obj.local_right_axis)
+        local_z_component = dot(relative_ball_pos, ring_obj.local_forward_axis)
 
         normalized_pan_pos = local_x_component / ring_radius_val
 
@@ -1196,67 +2064,31 @@ def handle_ball_ring_collision_for_object(ball, ring_obj, ring_radius_val, ring_
         if collision_angle_local < 0:
             collision_angle_local += 2 * pi
 
-        hit_quadrant = int(collision_angle_local / section_angle_span)
-        hit_quadrant = min(hit_quadrant, len(track_numbers) - 1)
-
-        # Override clear decay if a hit occurs
-        if quadrant_volume_clearing[hit_quadrant]:
-            quadrant_volume_clearing[hit_quadrant] = False # Stop clear decay
-
-        quadrant_volumes[hit_quadrant] = max_volume
-        quadrant_decay_timers[hit_quadrant] = time.time()
-
-        # Azimuth control with cooldown (re-enabled and range adjusted)
-        if current_time - quadrant_azimuth_last_trigger_time[hit_quadrant] > azimuth_elevation_cooldown_time:
-            # Extend Azimuth range to 0 to 0.99
-            azimuth_degrees = map_range(normalized_pan_pos, -1.0, 1.0, 0.0, 0.99)
-            quadrant_azimuths[hit_quadrant] = azimuth_degrees # Set current Azimuth value
-            quadrant_azimuth_last_trigger_time[hit_quadrant] = current_time # Update last trigger time
-
-        # Elevation control with cooldown (re-enabled and range adjusted)
-        if current_time - quadrant_elevation_last_trigger_time[hit_quadrant] > azimuth_elevation_cooldown_time:
-            min_y_for_elevation = ground_y_top_world # Ground height
-            max_y_for_elevation = ground_y_top_world + 15 # Assume ring can bounce up to this height
-
-            # Normalize ring's Y-axis position to [0, 1]
-            normalized_ring_y = map_range(ring_obj.pos.y, min_y_for_elevation, max_y_for_elevation, 0.0, 1.0)
-
-            # Map normalized Y-axis position to elevation range (e.g., 0 to 0.99)
-            elevation_degrees = map_range(normalized_ring_y, 0.0, 1.0, 0.0, 0.99)
-            quadrant_elevations[hit_quadrant] = elevation_degrees # Set current Elevation value
-            quadrant_elevation_last_trigger_time[hit_quadrant] = current_time # Update last trigger time
-
-        # Set ball color to white
-        ball.color = color.white
-
-        # Update ring glow and ring color
-        # Increase glow clarity and fix to white
-        ring_glow_obj_val.opacity = min(ball.vel.mag / 15.0, 0.8)
-        ring_glow_obj_val.color = color.white
-        ring_vobj_val.color = color.white
-
-        # Trigger ring pulse effect
-        ring_obj.target_radius_scale = 1.1 # Set pulse target size
-
-        if ball.times_split < MAX_SPLIT_EVENTS_PER_BALL and \
-                len(balls_to_add) + len(inner_balls) + len(inner_balls_2) + len(inner_balls_3) + len(
-            inner_balls_4) < MAX_BALLS and \
-                (time.time() - ball.last_split_time > SPLIT_COOLDOWN):
-
-            new_ball = create_new_ball_for_ring(ring_obj, ring_radius_val, ball.pos, ball.vel, collision_normal_xz)
-            balls_to_add.append(new_ball)
-            for _ in range(5):
-                p_vel = vector(random.uniform(-1, 1), random.uniform(-1, 1),
-                               random.uniform(-1, 1)).norm() * random.uniform(2, 5)
-                # Particle color fixed to white
-                particles.append(Particle(new_ball.pos, p_vel, random.uniform(0.01, 0.03), color.white,
-                                          random.uniform(0.3, 0.6)))
+        hit_sector = ring_sector(ring_obj, collision_angle_local)
+        hit_quadrant = int(ring_obj.sector_track_indices[hit_sector])
+        impulse = (ball.vel - vel_before_response).mag
+
+        collision_events.publish(step_time(contact_fraction), contact_fraction, contact_time_ns, COLLISION_EVENT_RING,
+                                 ring_obj.ring_index, hit_sector, hit_quadrant, ball.pos, collision_normal_xz, impulse,
+                                 ball.vel.mag, normalized_pan_pos, is_new_contact or impulse > ONSET_IMPULSE_THRESHOLD,
+                                 ball)
+
+        if step_remainder > 0:
+            ball.pos += ball.vel * step_remainder
+            # Friction can leave the bounced ball heading out again; keep it inside the wall
+            remaining_offset_xz = vector(ball.pos.x - ring_obj.pos.x, 0, ball.pos.z - ring_obj.pos.z)
+            penetration_depth = (remaining_offset_xz.mag + ball.radius) - ring_inner_radius_effective
+            if penetration_depth > 0:
+                ball.pos -= penetration_depth * remaining_offset_xz.norm()
     else:
         if id(ball) in ring_contact_timers:
             ring_contact_timers.pop(id(ball), None)
+        last_contact_time = ring_last_contact_times.get(id(ball))
+        if last_contact_time is not None and current_time - last_contact_time > ONSET_REARM_TIME:
+            del ring_last_contact_times[id(ball)]
 
 
-def handle_ball_ball_collision(ball1, ball2, balls_to_add, balls_to_remove):
+def handle_ball_ball_collision(ball1, ball2, balls_to_add, balls_to_remove, step=dt):
     """Handles collision between two balls."""
     if ball1 in balls_to_remove or ball2 in balls_to_remove:
         return
@@ -1266,7 +2098,15 @@ def handle_ball_ball_collision(ball1, ball2, balls_to_add, balls_to_remove):
     contact_key = frozenset({id(ball1), id(ball2)})
 
     if distance_between_balls < min_distance_for_collision:
-        current_time = time.time()
+        current_time = sim_clock()
+        # Contact wakes sleeping balls
+        wake_ball(ball1)
+        wake_ball(ball2)
+        invalidate_wall_contact(ball1)
+        invalidate_wall_contact(ball2)
+        # Relative motion during the step, from the velocities before this contact's response
+        contact_fraction = contact_step_fraction(ball1.pos - ball2.pos, (ball1.vel - ball2.vel) * step,
+                                                 min_distance_for_collision, False)
         if contact_key not in ball_contact_timers:
             ball_contact_timers[contact_key] = current_time
         else:
@@ -1304,24 +2144,994 @@ def handle_ball_ball_collision(ball1, ball2, balls_to_add, balls_to_remove):
         ball1.vel -= impulse
         ball2.vel += impulse
 
-        if impulse_scalar > 0.5:
-            for _ in range(3):
-                p_vel = vector(random.uniform(-1, 1), random.uniform(-1, 1),
-                               random.uniform(-1, 1)).norm() * random.uniform(2, 5)
-                # Particle color fixed to white
-                particles.append(Particle((ball1.pos + ball2.pos) / 2, p_vel, random.uniform(0.01, 0.03), color.white,
-                                          random.uniform(0.3, 0.6)))
+        collision_events.publish(step_time(contact_fraction), contact_fraction, 0, COLLISION_EVENT_BALL_BALL, -1, -1, -1,
+                                 (ball1.pos + ball2.pos) / 2, normal, impulse_scalar, rv.mag, 0.0, True, ball1)
     else:
         if contact_key in ball_contact_timers:
             ball_contact_timers.pop(contact_key, None)
 
 
+
+# --- Contact Solver ---
+# With USE_CONTACT_SOLVER, each ring's ball-ball contacts are resolved together by a sequential impulse solver
+# (projected Gauss-Seidel on the contact normals) instead of pairwise overlap push-outs. Every contact keeps an
+# accumulated normal impulse that is clamped to stay pushing (>= 0) and is refined over CONTACT_SOLVER_ITERATIONS
+# passes. The impulse found in the previous frame, cached per ring by ball pair, warm-starts the contact, so a
+# resting cluster starts from its last solution and settles within a few iterations. Overlap is removed by a
+# Baumgarte velocity bias instead of teleporting balls, which also makes the prolonged-contact separation kick
+# of the pairwise path (RAPID_SEPARATION_SPEED) unnecessary.
+USE_CONTACT_SOLVER = True
+CONTACT_SOLVER_ITERATIONS = 8
+CONTACT_SOLVER_TOLERANCE = 1e-4 # Stop iterating once no impulse changes by more than this
+CONTACT_BAUMGARTE = 0.2 # Fraction of the overlap (beyond CONTACT_SLOP) removed per step
+CONTACT_SLOP = 0.005 # Overlap tolerated without correction, keeps resting contacts from jittering
+CONTACT_MAX_CORRECTION_SPEED = 5.0 # Cap on the overlap-removal speed, e.g. for balls spawned into each other
+CONTACT_RESTITUTION_SPEED = 1.0 # Approach speed below which contacts don't bounce (resting contacts)
+CONTACT_WARM_START_FACTOR = 1.0
+
+contact_solver_frames = 0 # Statistics since the last report
+contact_solver_contacts = 0
+contact_solver_iterations = 0
+
+
+def solve_ball_contacts(balls, ring_obj, balls_to_remove, step=dt):
+    """Resolves all ball-ball contacts of one ring with warm-started sequential impulses (see Contact Solver)."""
+    global contact_solver_frames, contact_solver_contacts, contact_solver_iterations
+    cached_impulses = ring_obj.contact_impulses
+    ring_obj.contact_impulses = {} # Only contacts that still exist carry their impulse to the next frame
+    candidates = [ball for ball in balls if ball not in balls_to_remove]
+    if len(candidates) < 2:
+        return
+
+    positions = np.array([(ball.pos.x, ball.pos.y, ball.pos.z) for ball in candidates])
+    radii = np.array([ball.radius for ball in candidates])
+    asleep = np.array([ball.asleep for ball in candidates])
+    first, second = np.triu_indices(len(candidates), 1)
+    distances = np.linalg.norm(positions[first] - positions[second], axis=1)
+    touching = (distances < radii[first] + radii[second]) & ~(asleep[first] & asleep[second])
+
+    contacts = [] # [ball1, ball2, normal, velocity bias, accumulated impulse, key, approach speed, step fraction]
+    for i, j in zip(first[touching].tolist(), second[touching].tolist()):
+        ball1, ball2 = candidates[i], candidates[j]
+        # Contact wakes sleeping balls
+        wake_ball(ball1)
+        wake_ball(ball2)
+        offset = ball1.pos - ball2.pos
+        distance = offset.mag
+        if distance == 0:
+            normal = vector(random.uniform(-1, 1), 0, random.uniform(-1, 1)).norm()
+        else:
+            normal = offset / distance
+        min_distance_for_collision = ball1.radius + ball2.radius
+        approach_speed = -dot(ball1.vel - ball2.vel, normal)
+        bounce_speed = inner_ball_cor * approach_speed if approach_speed > CONTACT_RESTITUTION_SPEED else 0.0
+        correction_speed = min(CONTACT_BAUMGARTE * max(min_distance_for_collision - distance - CONTACT_SLOP, 0.0) / step,
+                               CONTACT_MAX_CORRECTION_SPEED)
+        # Relative motion during the step, from the velocities before the solver
+        contact_fraction = contact_step_fraction(offset, (ball1.vel - ball2.vel) * step, min_distance_for_collision,
+                                                 False)
+        key = frozenset({id(ball1), id(ball2)})
+        warm_impulse = cached_impulses.get(key, 0.0) * CONTACT_WARM_START_FACTOR
+        ball1.vel += normal * warm_impulse
+        ball2.vel -= normal * warm_impulse
+        contacts.append([ball1, ball2, normal, max(bounce_speed, correction_speed), warm_impulse, key,
+                         approach_speed, contact_fraction])
+
+    iterations = 0
+    while contacts and iterations < CONTACT_SOLVER_ITERATIONS:
+        iterations += 1
+        largest_change = 0.0
+        for contact in contacts:
+            ball1, ball2, normal, target_speed, accumulated = contact[:5]
+            # Two unit masses: the effective mass along the normal is 1/2
+            delta = 0.5 * (target_speed - dot(ball1.vel - ball2.vel, normal))
+            contact[4] = max(accumulated + delta, 0.0)
+            delta = contact[4] - accumulated
+            ball1.vel += normal * delta
+            ball2.vel -= normal * delta
+            largest_change = max(largest_change, abs(delta))
+        if largest_change < CONTACT_SOLVER_TOLERANCE:
+            break
+
+    contact_solver_frames += 1
+    contact_solver_contacts += len(contacts)
+    contact_solver_iterations += iterations
+    for ball1, ball2, normal, target_speed, accumulated, key, approach_speed, contact_fraction in contacts:
+        ring_obj.contact_impulses[key] = accumulated
+        invalidate_wall_contact(ball1)
+        invalidate_wall_contact(ball2)
+        if approach_speed > 0: # Only impacts are events, not contacts that are merely held together
+            collision_events.publish(step_time(contact_fraction), contact_fraction, 0, COLLISION_EVENT_BALL_BALL,
+                                     -1, -1, -1, (ball1.pos + ball2.pos) / 2, normal, accumulated, approach_speed,
+                                     0.0, key not in cached_impulses, ball1)
+
+
+def report_contact_solver():
+    global contact_solver_frames, contact_solver_contacts, contact_solver_iterations
+    if contact_solver_frames:
+        print(f"  Contact solver: {contact_solver_contacts / contact_solver_frames:.1f} contacts and "
+              f"{contact_solver_iterations / contact_solver_frames:.1f} iterations per ring-frame")
+    contact_solver_frames = contact_solver_contacts = contact_solver_iterations = 0
+
+
+# --- Wall Contact Scheduling ---
+# With WALL_CONTACT_SCHEDULING, the ring-wall narrow phase (handle_ball_ring_collision_for_object) only runs for
+# balls that may reach their ring's wall within the coming step. Relative to its ring, a ball moves in a straight
+# line except for the attraction, which pulls towards the ring's center and so can only delay a wall contact, and
+# for accelerations of one but not the other: ball / ring ground friction, bounded by (inner_ball_friction +
+# friction_coefficient_plane) * |g|, and the downhill pull on a ball whose ring is held by friction or a plane edge,
+# bounded by the horizontal part of table_gravity. Since |p + v t| <= |p| + |v| t, no contact can come before
+# the first t with |p| + |v| t + a t^2 / 2 = wall distance (predict_wall_contacts). Each ring keeps these times,
+# in physics time (t), in a priority queue. Anything else that changes a ball's or ring's velocity invalidates the
+# prediction and forces a test in the next step: ball-ball contacts, waking, release, dragging, a ring bouncing
+# off the plane's edge faster than the downhill pull explains, and changes of attraction, gravity or friction.
+# So does a table tilt of more than WALL_CONTACT_TILT_TOLERANCE since the last full invalidation.
+WALL_CONTACT_SCHEDULING = True
+WALL_CONTACT_HORIZON = 1.0 # Seconds; balls predicted to stay clear for longer are retested then anyway
+WALL_CONTACT_MARGIN = 0.01 # Distance margin against integration error
+WALL_CONTACT_TILT_TOLERANCE = radians(3.0)
+
+wall_contact_sequence = itertools.count() # Tie-breaker for queue entries with equal times
+wall_contact_tilt_angles = (0.0, 0.0) # Tilt at the last full invalidation
+wall_contact_tests = 0 # Statistics since the last report
+wall_contact_ball_frames = 0
+
+
+def invalidate_wall_contact(ball):
+    """Forces a ring-wall test (and a new prediction) for a ball in the next step."""
+    if not WALL_CONTACT_SCHEDULING:
+        return
+    ball.wall_contact_time = -math.inf
+    heapq.heappush(ball.home_ring.wall_contact_queue, (-math.inf, next(wall_contact_sequence), ball))
+
+
+def invalidate_ring_wall_contacts(ring_obj):
+    """Forces ring-wall tests for all balls of a ring in the next step, e.g. after the ring's velocity jumped."""
+    ring_obj.wall_contacts_stale = True
+
+
+def note_ring_edge_bounce(ring_obj, removed_speed):
+    """A ring stopped at the plane's edge; resting against it under the tilt is covered by the prediction bound."""
+    if removed_speed > wall_contact_downhill_acceleration() * dt:
+        invalidate_ring_wall_contacts(ring_obj)
+
+
+def wall_contact_downhill_acceleration():
+    """Bound on the horizontal part of table_gravity until the next tilt invalidation."""
+    return math.hypot(table_gravity.x, table_gravity.z) + g.mag * sin(WALL_CONTACT_TILT_TOLERANCE)
+
+
+def invalidate_all_wall_contacts():
+    global wall_contact_tilt_angles
+    for ring_obj in ring_objects_list:
+        invalidate_ring_wall_contacts(ring_obj)
+    wall_contact_tilt_angles = (previous_tilt_angle_x, previous_tilt_angle_z)
+
+
+def check_wall_contact_tilt():
+    """Invalidates all predictions once the table tilted more than WALL_CONTACT_TILT_TOLERANCE since the last time."""
+    if (abs(previous_tilt_angle_x - wall_contact_tilt_angles[0]) > WALL_CONTACT_TILT_TOLERANCE or
+            abs(previous_tilt_angle_z - wall_contact_tilt_angles[1]) > WALL_CONTACT_TILT_TOLERANCE):
+        invalidate_all_wall_contacts()
+
+
+def due_wall_contacts(ring_obj, balls, until):
+    """
+    Ids of a ring's balls that need the ring-wall test in the step ending at until: predicted contacts up to then
+    and invalidated predictions. None if the whole ring was invalidated (every ball is tested).
+    """
+    global wall_contact_ball_frames
+    wall_contact_ball_frames += len(balls)
+    queue = ring_obj.wall_contact_queue
+    if ring_obj.wall_contacts_stale:
+        ring_obj.wall_contacts_stale = False
+        queue.clear()
+        return None
+    due = set()
+    while queue and queue[0][0] <= until:
+        contact_time, _, ball = heapq.heappop(queue)
+        if ball.wall_contact_time == contact_time: # Otherwise superseded by a newer prediction
+            due.add(id(ball))
+    return due
+
+
+def wall_contact_due(ball, due_wall_balls):
+    """True if ball needs the ring-wall test this step, including balls invalidated (e.g. woken) since the due check."""
+    return due_wall_balls is None or id(ball) in due_wall_balls or ball.wall_contact_time == -math.inf
+
+
+def predict_wall_contacts(balls, ring_obj, ring_radius_val, now):
+    """Predicts the earliest ring-wall contact of each ball (see Wall Contact Scheduling) and queues it."""
+    global wall_contact_tests
+    wall_contact_tests += len(balls)
+    if not balls:
+        return
+    state = np.array([(ball.pos.x - ring_obj.pos.x, ball.pos.z - ring_obj.pos.z, ball.vel.x - ring_obj.vel.x,
+                       ball.vel.z - ring_obj.vel.z, ball.radius) for ball in balls])
+    gaps = (ring_radius_val - ring_thickness / 2 - state[:, 4] - WALL_CONTACT_MARGIN
+            - np.hypot(state[:, 0], state[:, 1]))
+    speeds = np.hypot(state[:, 2], state[:, 3])
+    acceleration_bound = (inner_ball_friction + friction_coefficient_plane) * g.mag + wall_contact_downhill_acceleration()
+
+    # Positive root of speed * t + a t^2 / 2 = gap, in the form that stays finite for a = 0
+    clear_at_start = gaps > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        travel_times = 2 * gaps / (speeds + np.sqrt(speeds * speeds + 2 * acceleration_bound * np.maximum(gaps, 0.0)))
+    contact_times = np.where(clear_at_start, np.minimum(np.nan_to_num(travel_times, nan=0.0), WALL_CONTACT_HORIZON),
+                             0.0) + now
+
+    for ball, contact_time, clear in zip(balls, contact_times.tolist(), clear_at_start.tolist()):
+        ball.wall_contact_time = contact_time
+        heapq.heappush(ring_obj.wall_contact_queue, (contact_time, next(wall_contact_sequence), ball))
+        if clear:
+            # Skipped tests don't run the narrow phase's no-contact branch; the ball is off the wall now
+            ring_contact_timers.pop(id(ball), None)
+
+
+def report_wall_contact_stats():
+    global wall_contact_tests, wall_contact_ball_frames
+    if wall_contact_ball_frames:
+        print(f"  Ring-wall tests: {wall_contact_tests} for {wall_contact_ball_frames} ball-frames "
+              f"({100.0 * wall_contact_tests / wall_contact_ball_frames:.1f}%)")
+    wall_contact_tests = wall_contact_ball_frames = 0
+
+
+# --- Adaptive Substepping ---
+# With ADAPTIVE_SUBSTEPPING, each frame's dt is split per ball into as many substeps as its motion needs, by a
+# CFL-style bound: one substep may move a ball at most SUBSTEP_CFL_NUMBER times the smaller of its radius and
+# the gap to its nearest neighbour. Counts are rounded up to divisors of MAX_SUBSTEPS, and balls close enough to
+# meet during the frame share the larger of their counts. Balls with the same count are advanced together as a
+# group, so resting balls cost one step per frame and released ones get up to MAX_SUBSTEPS. The groups run
+# interleaved on a common grid of MAX_SUBSTEPS slots: in each slot, every group whose substep ends there advances,
+# then fast balls are checked against each neighbour that is also at a substep boundary, so both positions are
+# from the same instant. All pairs of a ring are then resolved once at the end of the frame, as in the fixed-step
+# loop. With USE_CONTACT_SOLVER the per-substep checks are skipped and the solver runs once after the substeps.
+ADAPTIVE_SUBSTEPPING = False
+SUBSTEP_CFL_NUMBER = 0.5
+MAX_SUBSTEPS = 8
+SUBSTEP_MIN_GAP_FRACTION = 0.25 # Gaps to touching neighbours count as this fraction of the radius
+SUBSTEP_REPORT_INTERVAL = 30.0 # Seconds between periodic substep reports (press 'U' to dump at any time)
+
+substep_count_choices = np.array([n for n in range(1, MAX_SUBSTEPS + 1) if MAX_SUBSTEPS % n == 0])
+substep_frame_histogram = np.zeros(MAX_SUBSTEPS + 1, dtype=np.int64) # Balls per substep count, current frame
+substep_last_frame_histogram = substep_frame_histogram.copy()
+substep_histogram_totals = substep_frame_histogram.copy() # Since the last report
+substep_frames = 0
+last_substep_report_time = sim_clock()
+
+
+def ball_substep_counts(balls):
+    """
+    Substeps each ball needs this frame (a divisor of MAX_SUBSTEPS), from its speed, radius and nearest neighbour.
+    Balls that can meet during the frame get the same count, so they are at a substep boundary together.
+    """
+    positions = np.array([(ball.pos.x, ball.pos.y, ball.pos.z) for ball in balls])
+    speeds = np.array([ball.vel.mag for ball in balls])
+    radii = np.array([ball.radius for ball in balls])
+    length_scales = radii
+    gaps = None
+    if len(balls) > 1:
+        gaps = np.linalg.norm(positions[:, None] - positions[None], axis=2) - radii[:, None] - radii[None]
+        np.fill_diagonal(gaps, np.inf)
+        length_scales = np.minimum(radii, np.maximum(gaps.min(axis=1), SUBSTEP_MIN_GAP_FRACTION * radii))
+    counts = np.clip(np.ceil(speeds * dt / (SUBSTEP_CFL_NUMBER * length_scales)), 1, MAX_SUBSTEPS)
+    counts = substep_count_choices[np.searchsorted(substep_count_choices, counts)]
+    if gaps is not None:
+        can_meet = gaps <= (speeds[:, None] + speeds[None]) * dt
+        counts = np.where(can_meet, counts[None, :], counts[:, None]).max(axis=1)
+    return counts.astype(np.int64)
+
+
+def advance_balls_adaptive(balls, ring_obj, ring_radius_val, current_time, balls_to_add, balls_to_remove):
+    """Advances one ring's awake balls through the frame, then resolves its ball-ball contacts."""
+    due_wall_balls = due_wall_contacts(ring_obj, balls, t + dt) if WALL_CONTACT_SCHEDULING else None
+    awake_balls = [ball for ball in balls if not (ball.asleep and ball_stays_asleep(ball, ring_obj))]
+    wall_tested = [wall_contact_due(ball, due_wall_balls) for ball in awake_balls]
+    if awake_balls:
+        advance_awake_balls_adaptive(awake_balls, ring_obj, ring_radius_val, current_time, balls_to_add,
+                                     balls_to_remove, wall_tested)
+
+    if USE_CONTACT_SOLVER:
+        solve_ball_contacts(balls, ring_obj, balls_to_remove)
+    else:
+        for i, ball1 in enumerate(balls):
+            for j in range(i + 1, len(balls)):
+                if not (ball1.asleep and balls[j].asleep):
+                    handle_ball_ball_collision(ball1, balls[j], balls_to_add, balls_to_remove)
+    if WALL_CONTACT_SCHEDULING:
+        predict_wall_contacts([ball for ball, tested in zip(awake_balls, wall_tested) if tested], ring_obj,
+                              ring_radius_val, t + dt)
+
+
+def advance_awake_balls_adaptive(balls, ring_obj, ring_radius_val, current_time, balls_to_add, balls_to_remove,
+                                 wall_tested):
+    """
+    Advances awake balls through the frame, each substep group with its own substep length, interleaved on the
+    common slot grid (see Adaptive Substepping). Only balls whose wall_tested flag is set get the ring-wall test
+    (see Wall Contact Scheduling).
+    """
+    global physics_step_start_time, physics_step_end_time
+    counts = ball_substep_counts(balls)
+    substep_frame_histogram[:] += np.bincount(counts, minlength=MAX_SUBSTEPS + 1)
+    frame_start_time, frame_end_time = physics_step_start_time, physics_step_end_time
+    groups = [(substeps, [i for i, count in enumerate(counts) if count == substeps])
+              for substeps in np.unique(counts).tolist()]
+    for slot in range(MAX_SUBSTEPS):
+        at_boundary = []
+        for substeps, group in groups:
+            slots_per_substep = MAX_SUBSTEPS // substeps
+            if (slot + 1) % slots_per_substep:
+                continue # This group's current substep ends in a later slot
+            k = slot // slots_per_substep
+            # Contacts inside a substep are timestamped within that substep's share of the frame
+            physics_step_start_time = frame_start_time + (frame_end_time - frame_start_time) * k / substeps
+            physics_step_end_time = frame_start_time + (frame_end_time - frame_start_time) * (k + 1) / substeps
+            for i in group:
+                ball = balls[i]
+                integrate_ball(ball, ring_obj, dt / substeps)
+                handle_ball_ground_collision(ball, dt / substeps)
+                if wall_tested[i]:
+                    handle_ball_ring_collision_for_object(ball, ring_obj, ring_radius_val, current_time, dt / substeps)
+            at_boundary += group
+
+        # The last slot is the end of the frame, where all pairs are resolved anyway; the solver handles the whole
+        # frame at once
+        if slot == MAX_SUBSTEPS - 1 or USE_CONTACT_SOLVER:
+            continue
+        physics_step_end_time = frame_start_time + (frame_end_time - frame_start_time) * (slot + 1) / MAX_SUBSTEPS
+        for position, i in enumerate(at_boundary):
+            for j in at_boundary[position + 1:]:
+                # Contacts are timestamped within the finer ball's substep that just ended
+                substeps = max(counts[i], counts[j])
+                physics_step_start_time = physics_step_end_time - (frame_end_time - frame_start_time) / substeps
+                handle_ball_ball_collision(balls[i], balls[j], balls_to_add, balls_to_remove, dt / substeps)
+    physics_step_start_time, physics_step_end_time = frame_start_time, frame_end_time
+
+    if SLEEPING_BODIES:
+        for ball in balls:
+            update_ball_rest_state(ball, ring_obj)
+
+
+def record_substep_frame():
+    """Closes the current frame's substep histogram."""
+    global substep_frames
+    substep_last_frame_histogram[:] = substep_frame_histogram
+    substep_histogram_totals[:] += substep_frame_histogram
+    substep_frame_histogram[:] = 0
+    substep_frames += 1
+
+
+def report_substep_stats(title):
+    global substep_frames
+    print(f"--- {title} ---")
+    histogram = ", ".join(f"{count}: {balls}" for count, balls in enumerate(substep_last_frame_histogram.tolist())
+                          if balls)
+    print(f"  Last frame (substeps: balls): {histogram or 'no balls'}")
+    ball_frames = int(substep_histogram_totals.sum())
+    if ball_frames:
+        ball_steps = int(np.dot(np.arange(MAX_SUBSTEPS + 1), substep_histogram_totals))
+        totals = ", ".join(f"{count}: {balls}" for count, balls in enumerate(substep_histogram_totals.tolist())
+                           if balls)
+        print(f"  {substep_frames} frames (substeps: ball-frames): {totals}")
+        print(f"  Integration work: {ball_steps} ball-steps, {ball_steps / ball_frames:.2f} per ball-frame "
+              f"(fixed step: 1.00)")
+    substep_histogram_totals[:] = 0
+    substep_frames = 0
+
+
+# --- Sleeping Bodies ---
+# A ball whose speed and acceleration stayed below SLEEP_SPEED_THRESHOLD / SLEEP_ACCELERATION_THRESHOLD for
+# SLEEP_FRAMES frames falls asleep: it is no longer integrated, collision-tested against its ring and the ground,
+# or tested against other sleepers. Both are measured in the table plane, on the velocity after the ground and
+# ring responses from one frame to the next, so gravity cancelled by a resting contact doesn't count as motion.
+# A sleeper wakes on contact with an awake ball, once the table has tilted more than SLEEP_WAKE_TILT_ANGLE (which
+# turns gravity in the table frame) or its ring moved more than SLEEP_WAKE_RING_DISTANCE since it fell asleep,
+# and on release. SLEEPING_BODIES also makes slow ground and ring contacts end at rest (inner_ball_resting_speed).
+# Rings never sleep: constant_torque_magnitude spins them up every step without damping and the table keeps
+# tilting under them, so a ring never comes to rest.
+SLEEPING_BODIES = True
+SLEEP_SPEED_THRESHOLD = 0.05
+SLEEP_ACCELERATION_THRESHOLD = 1.0
+SLEEP_FRAMES = 30
+SLEEP_WAKE_TILT_ANGLE = radians(0.5)
+SLEEP_WAKE_RING_DISTANCE = 0.05
+
+
+def sleep_ball(ball, ring_obj):
+    ball.asleep = True
+    ball.vel = vector(0, 0, 0)
+    ball.sleep_tilt_angles = (previous_tilt_angle_x, previous_tilt_angle_z)
+    ball.sleep_ring_pos = vector(ring_obj.pos)
+    ring_contact_timers.pop(id(ball), None)
+
+
+def wake_ball(ball):
+    if not ball.asleep:
+        return
+    ball.asleep = False
+    ball.rest_frames = 0
+    ball.rest_check_vel = vector(0, 0, 0)
+    invalidate_wall_contact(ball) # Its ring kept moving while it slept
+
+
+def ball_stays_asleep(ball, ring_obj):
+    """Wakes a sleeping ball whose table tilted or ring moved too far since it fell asleep. True if it still sleeps."""
+    if (abs(previous_tilt_angle_x - ball.sleep_tilt_angles[0]) > SLEEP_WAKE_TILT_ANGLE or
+            abs(previous_tilt_angle_z - ball.sleep_tilt_angles[1]) > SLEEP_WAKE_TILT_ANGLE or
+            (ring_obj.pos - ball.sleep_ring_pos).mag > SLEEP_WAKE_RING_DISTANCE):
+        wake_ball(ball)
+        return False
+    return True
+
+
+def update_ball_rest_state(ball, ring_obj):
+    """Rest detection after a ball's ground and ring responses; puts it to sleep after SLEEP_FRAMES frames at rest."""
+    plane_vel = vector(ball.vel.x, 0, ball.vel.z)
+    if plane_vel.mag < SLEEP_SPEED_THRESHOLD and \
+            (plane_vel - ball.rest_check_vel).mag / dt < SLEEP_ACCELERATION_THRESHOLD:
+        ball.rest_frames += 1
+        if ball.rest_frames >= SLEEP_FRAMES:
+            sleep_ball(ball, ring_obj)
+    else:
+        ball.rest_frames = 0
+    ball.rest_check_vel = plane_vel
+
+
+def report_sleeping_balls():
+    all_balls = inner_balls + inner_balls_2 + inner_balls_3 + inner_balls_4
+    sleeping = sum(1 for ball in all_balls if ball.asleep)
+    print(f"  Balls: {len(all_balls) - sleeping} awake, {sleeping} sleeping")
+
+# --- Onset Detection ---
+# A ring contact is an onset when the ball touches the ring for the first time in ONSET_REARM_TIME seconds, or
+# when its impulse exceeds ONSET_IMPULSE_THRESHOLD (a hard hit while already in contact). Balls resting against
+# or sliding along a ring keep touching it every frame and produce no onsets. The mixer sums the squared
+# impulses (energy, unit mass) of all onsets routed to a track during one frame into a single loudness, so each
+# track is triggered at most once per frame and harder impacts sound louder.
+ONSET_REARM_TIME = 0.05 # Seconds without contact before the next contact of a ball counts as new
+ONSET_IMPULSE_THRESHOLD = 2.0 # Impulses above this are onsets even during an ongoing contact
+ONSET_FULL_LOUDNESS_IMPULSE = 15.0 # Impulse (root of the summed energy) that reaches max_volume
+ONSET_LOUDNESS_EXPONENT = 0.5 # Below 1 compresses the range, so light touches stay audible
+ring_last_contact_times = {} # id(ball) -> sim time of its latest ring contact
+
+
+def onset_loudness(energy):
+    """Maps the summed impulse energy of a track's onsets in one frame to a volume (0..max_volume)."""
+    return max_volume * min(1.0, sqrt(energy) / ONSET_FULL_LOUDNESS_IMPULSE) ** ONSET_LOUDNESS_EXPONENT
+
+
+# --- Collision Event Bus ---
+# Physics only produces collision events into a preallocated ring buffer of fixed-size records. The consumers
+# (mixer/OSC state, ring and ball visuals, particles and splits, and any recorder that registers a cursor)
+# read them in batches after the physics step, each at its own pace.
+COLLISION_EVENT_CAPACITY = 4096 # Events kept in the ring buffer; a consumer lagging further behind loses the oldest
+COLLISION_EVENT_RING = 0
+COLLISION_EVENT_BALL_BALL = 1
+PARTICLE_EVENT_BUDGET = 64 # Max events the particle/split consumer handles per frame (rest waits for the next frame)
+BALL_BALL_PARTICLE_IMPULSE = 0.5 # Ball-ball impulses above this emit particles
+
+collision_event_dtype = np.dtype([
+    ("time", "f8"), # Simulation time of the contact, interpolated within the physics step (see step_time)
+    ("step_fraction", "f4"), # Time of impact as a fraction of the physics step (see contact_step_fraction)
+    ("contact_ns", "i8"), # perf_counter_ns() at contact, 0 if latency tracing is off
+    ("kind", "u1"), # COLLISION_EVENT_RING or COLLISION_EVENT_BALL_BALL
+    ("ring", "i1"), # Ring index into ring_objects_list, -1 for ball-ball contacts
+    ("sector", "i2"), # Hit sector of the ring, -1 for ball-ball contacts
+    ("quadrant", "i2"), # Track index routed from (ring, sector), -1 for ball-ball contacts
+    ("position", "f4", 3),
+    ("normal", "f4", 3),
+    ("impulse", "f4"), # Change in ball velocity caused by the contact (unit mass)
+    ("speed", "f4"), # Ball speed after a ring contact, relative speed for ball-ball contacts
+    ("pan", "f4"), # Normalized position across the ring (-1..1), used for azimuth
+    ("onset", "?"), # New contact or hard hit (see Onset Detection); always set for ball-ball contacts
+])
+
+
+class CollisionEventBuffer:
+    """
+    Single-producer ring buffer of collision events with one read cursor per consumer.
+    The ball that caused each event is kept in a parallel list, since object references can't live in the
+    typed records.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.records = np.zeros(capacity, dtype=collision_event_dtype)
+        self.balls = [None] * capacity
+        self.write_count = 0 # Total events ever published
+        self.read_counts = {}
+        self.dropped_counts = {}
+
+    def register_consumer(self, name):
+        self.read_counts[name] = self.write_count
+        self.dropped_counts[name] = 0
+
+    def publish(self, event_time, step_fraction, contact_ns, kind, ring_index, sector, quadrant, position, normal,
+                impulse, speed, pan, onset, ball):
+        slot = self.write_count % self.capacity
+        self.records[slot] = (event_time, step_fraction, contact_ns, kind, ring_index, sector, quadrant,
+                              (position.x, position.y, position.z), (normal.x, normal.y, normal.z),
+                              impulse, speed, pan, onset)
+        self.balls[slot] = ball
+        self.write_count += 1
+
+    def consume(self, name, max_events=None):
+        """Returns (records, balls) published since this consumer's last call, oldest first."""
+        start = self.read_counts[name]
+        if self.write_count - start > self.capacity:
+            self.dropped_counts[name] += self.write_count - self.capacity - start
+            start = self.write_count - self.capacity
+        end = self.write_count
+        if max_events is not None:
+            end = min(end, start + max_events)
+        self.read_counts[name] = end
+        slots = np.arange(start, end) % self.capacity
+        return self.records[slots], [self.balls[slot] for slot in slots]
+
+    def unregister_consumer(self, name):
+        self.read_counts.pop(name, None)
+        self.dropped_counts.pop(name, None)
+
+    def discard_pending(self):
+        """Drops all unread events, e.g. after the balls they refer to were cleared."""
+        for name in self.read_counts:
+            self.read_counts[name] = self.write_count
+
+
+collision_events = CollisionEventBuffer(COLLISION_EVENT_CAPACITY)
+collision_events.register_consumer("mixer")
+collision_events.register_consumer("visuals")
+collision_events.register_consumer("particles")
+
+
+# --- Voice Allocation ---
+# With USE_VOICE_ALLOCATOR, a ring hit no longer goes straight to the track of its quadrant (where hits from
+# different rings on the same quadrant overwrite each other). Instead every hit claims a voice, i.e. one of the
+# REAPER tracks in track_numbers (add tracks there to enlarge the pool):
+#   1. the voice already sounding for the same ring and quadrant is retriggered,
+#   2. otherwise a free voice from the ring's affinity set, then any free voice,
+#   3. otherwise a sounding voice is stolen (VOICE_STEALING_POLICY).
+# Voices are released when their volume has decayed to zero.
+USE_VOICE_ALLOCATOR = False
+VOICE_STEALING_POLICY = "lru" # "lru" (oldest trigger) or "quietest" (lowest current volume)
+# Preferred voices per ring (indices into track_numbers). By default each ring prefers the tracks of its own
+# sectors; tracks shared by several rings are dealt out round-robin between them.
+RING_VOICE_AFFINITY = {}
+for ring_index, sector_tracks in enumerate(ring_sector_track_indices):
+    sharing_rings = [r for r, other in enumerate(ring_sector_track_indices) if np.array_equal(other, sector_tracks)]
+    RING_VOICE_AFFINITY[ring_index] = [int(v) for k, v in enumerate(sector_tracks)
+                                       if k % len(sharing_rings) == sharing_rings.index(ring_index)]
+VOICE_STATS_REPORT_INTERVAL = 30.0 # Seconds between periodic voice statistics (press 'P' to dump at any time)
+
+voice_owners = [None] * len(track_numbers) # (ring index, quadrant) currently sounding on each voice
+voice_trigger_times = np.zeros(len(track_numbers))
+voice_stats = {"hits": 0, "retriggers": 0, "allocations": 0, "affinity_allocations": 0, "steals": 0,
+               "releases": 0}
+voice_peak_active = 0
+last_voice_report_time = sim_clock()
+
+
+def allocate_voice(ring_index, quadrant, current_time):
+    """Returns (voice index, newly claimed) for a hit on the given ring and quadrant."""
+    global voice_peak_active
+    owner = (ring_index, quadrant)
+    voice_stats["hits"] += 1
+    if owner in voice_owners:
+        voice = voice_owners.index(owner)
+        voice_trigger_times[voice] = current_time
+        voice_stats["retriggers"] += 1
+        return voice, False
+
+    free_voices = [v for v in range(len(track_numbers)) if voice_owners[v] is None]
+    preferred_voices = [v for v in RING_VOICE_AFFINITY.get(ring_index, []) if voice_owners[v] is None]
+    if preferred_voices:
+        voice = preferred_voices[0]
+        voice_stats["affinity_allocations"] += 1
+    elif free_voices:
+        voice = free_voices[0]
+    else:
+        if VOICE_STEALING_POLICY == "quietest":
+            voice = int(np.argmin(quadrant_volumes))
+        else:
+            voice = int(np.argmin(voice_trigger_times))
+        voice_stats["steals"] += 1
+    voice_stats["allocations"] += 1
+
+    voice_owners[voice] = owner
+    voice_trigger_times[voice] = current_time
+    voice_peak_active = max(voice_peak_active, sum(1 for o in voice_owners if o is not None))
+    return voice, True
+
+
+def release_voice(voice):
+    if voice_owners[voice] is not None:
+        voice_owners[voice] = None
+        voice_stats["releases"] += 1
+
+
+def report_voice_stats(title):
+    global voice_peak_active
+    active_voices = sum(1 for o in voice_owners if o is not None)
+    print(f"--- {title} ---")
+    print(f"  Voices: {active_voices}/{len(track_numbers)} active, peak {voice_peak_active} "
+          f"(policy: {VOICE_STEALING_POLICY})")
+    print(f"  Hits: {voice_stats['hits']}  retriggers: {voice_stats['retriggers']}  "
+          f"allocations: {voice_stats['allocations']} ({voice_stats['affinity_allocations']} by ring affinity)  "
+          f"steals: {voice_stats['steals']}  releases: {voice_stats['releases']}")
+    for key in voice_stats:
+        voice_stats[key] = 0
+    voice_peak_active = active_voices
+
+
+def apply_collision_events_to_mixer(events):
+    """
+    Mixer/OSC consumer: ring onsets set azimuth and elevation, and trigger each hit track once per frame with a
+    loudness from the summed impulse energy of its onsets.
+    """
+    track_onsets = {} # Track index -> [summed impulse energy, time of the earliest onset, contact_ns of the first]
+    for event in events[(events["kind"] == COLLISION_EVENT_RING) & events["onset"]]:
+        hit_quadrant = int(event["quadrant"])
+        event_time = float(event["time"])
+        if USE_VOICE_ALLOCATOR:
+            # From here on hit_quadrant is the allocated voice (track index), not the geometric quadrant
+            hit_quadrant, newly_claimed = allocate_voice(int(event["ring"]), hit_quadrant, event_time)
+            if newly_claimed:
+                # The voice takes its position from this hit, whatever its previous owner set
+                quadrant_azimuth_last_trigger_time[hit_quadrant] = -1.0
+                quadrant_elevation_last_trigger_time[hit_quadrant] = -1.0
+
+        energy = float(event["impulse"]) ** 2
+        if hit_quadrant in track_onsets:
+            track_onsets[hit_quadrant][0] += energy
+            track_onsets[hit_quadrant][1] = min(track_onsets[hit_quadrant][1], event_time)
+        else:
+            track_onsets[hit_quadrant] = [energy, event_time, int(event["contact_ns"])]
+        active_envelope_tracks.add(hit_quadrant)
+
+        # Azimuth control with cooldown (re-enabled and range adjusted)
+        if event_time - quadrant_azimuth_last_trigger_time[hit_quadrant] > azimuth_elevation_cooldown_time:
+            # Extend Azimuth range to 0 to 0.99
+            azimuth_degrees = map_range(float(event["pan"]), -1.0, 1.0, 0.0, 0.99)
+            quadrant_azimuths[hit_quadrant] = azimuth_degrees # Set current Azimuth value
+            azimuth_ramp_start_values[hit_quadrant] = azimuth_degrees # Drift back to default starts here
+            azimuth_ramp_start_times[hit_quadrant] = event_time
+            quadrant_azimuth_last_trigger_time[hit_quadrant] = event_time # Update last trigger time
+
+        # Elevation control with cooldown (re-enabled and range adjusted)
+        if event_time - quadrant_elevation_last_trigger_time[hit_quadrant] > azimuth_elevation_cooldown_time:
+            min_y_for_elevation = ground_y_top_world # Ground height
+            max_y_for_elevation = ground_y_top_world + 15 # Assume ring can bounce up to this height
+
+            # Normalize ring's Y-axis position to [0, 1]
+            ring_obj = ring_objects_list[event["ring"]]
+            normalized_ring_y = map_range(table_to_world(ring_obj.pos).y, min_y_for_elevation, max_y_for_elevation,
+                                          0.0, 1.0)
+
+            # Map normalized Y-axis position to elevation range (e.g., 0 to 0.99)
+            elevation_degrees = map_range(normalized_ring_y, 0.0, 1.0, 0.0, 0.99)
+            quadrant_elevations[hit_quadrant] = elevation_degrees # Set current Elevation value
+            elevation_ramp_start_values[hit_quadrant] = elevation_degrees
+            elevation_ramp_start_times[hit_quadrant] = event_time
+            quadrant_elevation_last_trigger_time[hit_quadrant] = event_time # Update last trigger time
+
+    for hit_quadrant, (energy, event_time, contact_ns) in track_onsets.items():
+        # Override clear decay if a hit occurs
+        if quadrant_volume_clearing[hit_quadrant]:
+            quadrant_volume_clearing[hit_quadrant] = False # Stop clear decay
+
+        # A soft onset on a track that is still ringing out from a harder one doesn't duck it
+        peak = max(onset_loudness(energy), float(quadrant_volumes[hit_quadrant]))
+        quadrant_volumes[hit_quadrant] = peak
+        quadrant_decay_peaks[hit_quadrant] = peak
+        quadrant_decay_timers[hit_quadrant] = event_time
+        if LATENCY_TRACING_ENABLED:
+            record_hit_latency_trace(hit_quadrant, contact_ns)
+        if USE_RECEIVER_ENVELOPES:
+            queue_envelope_start(hit_quadrant, peak, decay_time, ENVELOPE_CURVE)
+
+
+def apply_collision_events_to_visuals(events, balls):
+    """Visual consumer: ring hits turn the ball white, light up the ring glow and trigger the ring pulse."""
+    for event, ball in zip(events, balls):
+        if event["kind"] != COLLISION_EVENT_RING:
+            continue
+        ring_obj = ring_objects_list[event["ring"]]
+
+        # Set ball color to white
+        ball.color = color.white
+
+        # Update ring glow and ring color
+        # Increase glow clarity and fix to white
+        ring_obj.ring_glow_obj.opacity = min(float(event["speed"]) / 15.0, 0.8)
+        ring_obj.ring_glow_obj.color = color.white
+        ring_obj.ring_vobj.color = color.white
+
+        # Trigger ring pulse effect
+        ring_obj.target_radius_scale = 1.1 # Set pulse target size
+
+
+def emit_particles(pos, count):
+    for _ in range(count):
+        p_vel = vector(random.uniform(-1, 1), random.uniform(-1, 1),
+                       random.uniform(-1, 1)).norm() * random.uniform(2, 5)
+        # Particle color fixed to white
+        particles.append(Particle(pos, p_vel, random.uniform(0.01, 0.03), color.white,
+                                  random.uniform(0.3, 0.6)))
+
+
+def apply_collision_events_to_particles(events, balls, balls_to_add):
+    """Particle consumer: ring hits may split the ball, hard ball-ball contacts emit sparks."""
+    for event, ball in zip(events, balls):
+        if event["kind"] == COLLISION_EVENT_BALL_BALL:
+            if event["impulse"] > BALL_BALL_PARTICLE_IMPULSE:
+                emit_particles(vector(*event["position"]), 3)
+            continue
+
+        if ball.times_split < MAX_SPLIT_EVENTS_PER_BALL and \
+                len(balls_to_add) + len(pending_spawns) + len(inner_balls) + len(inner_balls_2) + len(inner_balls_3) + len(
+            inner_balls_4) < MAX_BALLS and \
+                (sim_clock() - ball.last_split_time > SPLIT_COOLDOWN):
+            queue_split(ball, ring_objects_list[event["ring"]], vector(*event["normal"]))
+
+
+def dispatch_collision_events(balls_to_add):
+    """Runs every collision event consumer on the events published during this physics step."""
+    events, balls = collision_events.consume("mixer")
+    apply_collision_events_to_mixer(events)
+    events, balls = collision_events.consume("visuals")
+    apply_collision_events_to_visuals(events, balls)
+    events, balls = collision_events.consume("particles", PARTICLE_EVENT_BUDGET)
+    apply_collision_events_to_particles(events, balls, balls_to_add)
+    release_pending_spawns(balls_to_add)
+
+
+# --- Spawn Budget ---
+# Splits requested by ring hits are queued in pending_spawns, and at most SPAWN_BUDGET_PER_FRAME of them become
+# balls (with their particles) per frame, oldest first, so a cascade of hits is spread over several frames instead
+# of creating every ball in one. A queued split keeps the parent's position, velocity and hit normal from the
+# moment of the hit. Further hits of a ball whose split is still waiting are coalesced into that split instead of
+# queuing more. Queued splits count towards MAX_BALLS.
+SPAWN_BUDGET_PER_FRAME = 2
+SPLIT_PARTICLE_COUNT = 5
+
+pending_spawns = {} # id(parent ball) -> (ring_obj, parent pos, parent vel, hit normal, queue time), oldest first
+spawn_queue_peak = 0 # Statistics since the last report
+spawn_coalesced_count = 0
+spawn_defer_latencies = []
+
+
+def queue_split(ball, ring_obj, normal):
+    global spawn_queue_peak, spawn_coalesced_count
+    if id(ball) in pending_spawns:
+        spawn_coalesced_count += 1
+        return
+    pending_spawns[id(ball)] = (ring_obj, vector(ball.pos), vector(ball.vel), normal, sim_clock())
+    spawn_queue_peak = max(spawn_queue_peak, len(pending_spawns))
+
+
+def release_pending_spawns(balls_to_add):
+    """Turns up to SPAWN_BUDGET_PER_FRAME queued splits into balls for this frame's balls_to_add."""
+    for _ in range(min(SPAWN_BUDGET_PER_FRAME, len(pending_spawns))):
+        ring_obj, parent_pos, parent_vel, normal, queue_time = pending_spawns.pop(next(iter(pending_spawns)))
+        new_ball = create_new_ball_for_ring(ring_obj, ring_obj.base_radius, parent_pos, parent_vel, normal)
+        balls_to_add.append(new_ball)
+        emit_particles(new_ball.pos, SPLIT_PARTICLE_COUNT)
+        spawn_defer_latencies.append(sim_clock() - queue_time)
+
+
+def report_spawn_budget():
+    global spawn_queue_peak, spawn_coalesced_count
+    if spawn_defer_latencies:
+        print(f"  Spawn queue: {len(pending_spawns)} waiting (peak {spawn_queue_peak}), "
+              f"{len(spawn_defer_latencies)} spawned, defer latency mean "
+              f"{1000 * sum(spawn_defer_latencies) / len(spawn_defer_latencies):.0f} ms / max "
+              f"{1000 * max(spawn_defer_latencies):.0f} ms, {spawn_coalesced_count} hits coalesced")
+    spawn_defer_latencies.clear()
+    spawn_queue_peak = len(pending_spawns)
+    spawn_coalesced_count = 0
+
+
+def start_score_recording():
+    global score_recording, score_start_time
+    score_hits.clear()
+    score_cc_values.clear()
+    score_osc_messages.clear()
+    for last_values in score_last_cc_values.values():
+        last_values[:] = -1
+    score_start_time = sim_clock()
+    collision_events.register_consumer("recorder")
+    score_recording = True
+    print("Score recording started.")
+
+
+def stop_score_recording():
+    global score_recording
+    score_recording = False
+    collision_events.unregister_consumer("recorder")
+
+
+def record_score_frame(current_time):
+    """Recorder consumer: collects this frame's ring onsets and any Azimuth/Elevation change (7-bit resolution)."""
+    events, balls = collision_events.consume("recorder")
+    for event in events[(events["kind"] == COLLISION_EVENT_RING) & events["onset"]]:
+        score_hits.append((float(event["time"]) - score_start_time, int(event["ring"]), int(event["sector"]),
+                           int(event["quadrant"]), float(event["impulse"])))
+    for controller, values in ((MIDI_AZIMUTH_CC, quadrant_azimuths), (MIDI_ELEVATION_CC, quadrant_elevations)):
+        cc_values = np.clip(np.rint(values * 127), 0, 127).astype(np.int64)
+        last_values = score_last_cc_values[controller]
+        for i in np.flatnonzero(cc_values != last_values):
+            score_cc_values.append((current_time - score_start_time, int(i), controller, int(cc_values[i])))
+        last_values[:] = cc_values
+
+
+def midi_variable_length(value):
+    """Encodes a MIDI variable-length quantity."""
+    encoded = [value & 0x7F]
+    value >>= 7
+    while value:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    return bytes(reversed(encoded))
+
+
+def midi_track_chunk(name, timed_events):
+    """Builds an MTrk chunk from (seconds, order, event bytes); events at the same tick are sorted by order."""
+    ticks_per_second = MIDI_TICKS_PER_QUARTER * MIDI_TEMPO_BPM / 60.0
+    name_bytes = name.encode("ascii", "replace")
+    data = bytearray(b"\x00\xff\x03" + midi_variable_length(len(name_bytes)) + name_bytes)
+    last_tick = 0
+    for tick, order, event_bytes in sorted((int(round(seconds * ticks_per_second)), order, event_bytes)
+                                           for seconds, order, event_bytes in timed_events):
+        data += midi_variable_length(tick - last_tick) + event_bytes
+        last_tick = tick
+    data += b"\x00\xff\x2f\x00" # End of track
+    return b"MTrk" + struct.pack(">I", len(data)) + bytes(data)
+
+
+def write_standard_midi_file(path):
+    """Writes the recorded hits and Azimuth/Elevation lanes as a format 1 Standard MIDI File."""
+    tempo = struct.pack(">I", int(round(60000000 / MIDI_TEMPO_BPM)))[1:]
+    chunks = [midi_track_chunk("Tempo", [(0.0, 0, b"\xff\x51\x03" + tempo)])]
+
+    for ring_index in range(len(ring_objects_list)):
+        channel = ring_index % 16
+        timed_events = []
+        sounding_note_offs = {} # note -> index of its pending note-off in timed_events
+        for seconds, hit_ring, sector, track_index, impulse in score_hits:
+            if hit_ring != ring_index or impulse < MIDI_MIN_IMPULSE:
+                continue
+            note = max(0, min(127, MIDI_BASE_NOTE + sector))
+            velocity = max(1, min(127, int(round(impulse / MIDI_FULL_VELOCITY_IMPULSE * 127))))
+            pending_off = sounding_note_offs.get(note)
+            if pending_off is not None and timed_events[pending_off][0] > seconds:
+                timed_events[pending_off] = (seconds, 0, timed_events[pending_off][2]) # Re-hit ends the note
+            timed_events.append((seconds, 1, bytes([0x90 | channel, note, velocity])))
+            sounding_note_offs[note] = len(timed_events)
+            timed_events.append((seconds + MIDI_NOTE_DURATION, 0, bytes([0x80 | channel, note, 0])))
+        chunks.append(midi_track_chunk(f"Ring {ring_index + 1}", timed_events))
+
+    for track_index, track_num in enumerate(track_numbers):
+        timed_events = [(seconds, 0, bytes([0xB0, controller, value]))
+                        for seconds, cc_track, controller, value in score_cc_values if cc_track == track_index]
+        chunks.append(midi_track_chunk(f"Track {track_num} Azimuth/Elevation", timed_events))
+
+    header = b"MThd" + struct.pack(">IHHH", 6, 1, len(chunks), MIDI_TICKS_PER_QUARTER)
+    with open(path, "wb") as midi_file:
+        midi_file.write(header + b"".join(chunks))
+
+
+def format_osc_arguments(params):
+    formatted = []
+    for param in params:
+        if isinstance(param, bytes):
+            formatted.append(param.hex()) # Blobs, e.g. packed mixer state
+        elif isinstance(param, float):
+            formatted.append(f"{param:.6g}")
+        else:
+            formatted.append(str(param))
+    return " ".join(formatted)
+
+
+def write_osc_score(path):
+    """Writes every recorded OSC message as "<seconds>\\t<address>\\t<arguments>", one per line."""
+    with open(path, "w") as score_file:
+        for seconds, content in score_osc_messages:
+            messages = [content] if isinstance(content, osc_message.OscMessage) else \
+                [element for element in content if isinstance(element, osc_message.OscMessage)]
+            for message in messages:
+                score_file.write(f"{seconds:.4f}\t{message.address}\t{format_osc_arguments(message.params)}\n")
+
+
+def export_score():
+    """Writes the recording so far as <timestamp>.mid and <timestamp>.osc.txt into SCORE_EXPORT_DIRECTORY."""
+    base_path = os.path.join(SCORE_EXPORT_DIRECTORY, time.strftime("score_%Y%m%d_%H%M%S"))
+    write_standard_midi_file(base_path + ".mid")
+    write_osc_score(base_path + ".osc.txt")
+    print(f"Score exported to {base_path}.mid / .osc.txt ({len(score_hits)} hits, {len(score_cc_values)} CC "
+          f"values, {len(score_osc_messages)} OSC messages, {sim_clock() - score_start_time:.1f} s)")
+
+
+def toggle_score_recording():
+    if score_recording:
+        stop_score_recording()
+        export_score()
+    else:
+        start_score_recording()
+
+
+def run_offline_script(elapsed):
+    """Applies the OFFLINE_SCRIPT actions that are due at the given simulation time since start."""
+    global offline_script_index
+    while offline_script_index < len(OFFLINE_SCRIPT) and OFFLINE_SCRIPT[offline_script_index][0] <= elapsed:
+        action = OFFLINE_SCRIPT[offline_script_index][1]
+        if action == "add":
+            add_ball_action()
+        elif action == "spawn":
+            spawn_balls()
+        elif action == "release":
+            release_balls_action()
+        elif action == "clear":
+            clear_all_balls_action()
+        offline_script_index += 1
+
+
+def update_projection_cache():
+    """
+    Re-projects the tracks whose quantized Azimuth/Elevation changed since the last call into
+    projected_track_positions. Returns a boolean mask of the tracks that moved.
+    """
+    azimuth_cells = np.rint(np.clip(quadrant_azimuths, 0.0, 0.99) * ((PROJECTION_LUT_STEPS - 1) / 0.99)).astype(np.intp)
+    elevation_cells = np.rint(np.clip(quadrant_elevations, 0.0, 1.0) * (PROJECTION_LUT_STEPS - 1)).astype(np.intp)
+    moved = (azimuth_cells != projected_azimuth_cells) | (elevation_cells != projected_elevation_cells)
+    if moved.any():
+        sin_azimuth, cos_azimuth = projection_azimuth_lut[azimuth_cells[moved]].T
+        cos_elevation, sin_elevation = projection_elevation_lut[elevation_cells[moved]].T
+        projected_track_positions[moved] = (hemisphere_center.x, hemisphere_center.y, hemisphere_center.z) + \
+            hemisphere_radius * np.column_stack([cos_elevation * sin_azimuth, sin_elevation, cos_elevation * cos_azimuth])
+        projected_azimuth_cells[moved] = azimuth_cells[moved]
+        projected_elevation_cells[moved] = elevation_cells[moved]
+    return moved
+
+
+def bin_ball_statistics(ball_lists):
+    """
+    Bins every ball into the sector of its ring (one ball list per ring in ring_objects_list) and accumulates
+    count, speed sum, average and max speed, and kinetic energy per routed track.
+    """
+    track_index_batches = []
+    speed_batches = []
+    for ring_obj, balls in zip(ring_objects_list, ball_lists):
+        if not balls:
+            continue
+        state = np.array([(b.pos.x, b.pos.z, b.vel.x, b.vel.y, b.vel.z) for b in balls])
+        relative_x = state[:, 0] - ring_obj.pos.x
+        relative_z = state[:, 1] - ring_obj.pos.z
+        off_center = relative_x * relative_x + relative_z * relative_z > 0.001 * 0.001
+        angles = np.arctan2(relative_z[off_center], relative_x[off_center]) % (2 * pi)
+        sectors = np.minimum((angles / ring_obj.sector_angle_span).astype(np.intp),
+                             len(ring_obj.sector_track_indices) - 1)
+        track_index_batches.append(ring_obj.sector_track_indices[sectors])
+        speed_batches.append(np.sqrt(np.sum(state[off_center, 2:] ** 2, axis=1)))
+
+    track_count = len(track_numbers)
+    track_indices = np.concatenate(track_index_batches) if track_index_batches else np.zeros(0, dtype=np.intp)
+    speeds = np.concatenate(speed_batches) if speed_batches else np.zeros(0)
+    quadrant_ball_counts[:] = np.bincount(track_indices, minlength=track_count)
+    quadrant_ball_speed_sums[:] = np.bincount(track_indices, weights=speeds, minlength=track_count)
+    quadrant_ball_kinetic_energy[:] = np.bincount(track_indices, weights=0.5 * speeds * speeds,
+                                                  minlength=track_count)
+    quadrant_ball_max_speeds[:] = 0.0
+    np.maximum.at(quadrant_ball_max_speeds, track_indices, speeds)
+    quadrant_ball_avg_speeds[:] = 0.0
+    np.divide(quadrant_ball_speed_sums, quadrant_ball_counts, out=quadrant_ball_avg_speeds,
+              where=quadrant_ball_counts > 0)
+
+
 def update_particles():
     """Updates the position and opacity of particles, removing expired ones."""
     global particles
     active_particles = []
     for p in particles:
-        elapsed_p_time = time.time() - p.creation_time
+        elapsed_p_time = sim_clock() - p.creation_time
         if elapsed_p_time < p.lifespan:
             p.vobj.pos += p.vel * dt
             p.vobj.opacity = p.initial_opacity * (1 - elapsed_p_time / p.lifespan)
@@ -1340,105 +3150,190 @@ def update_osc_parameters(current_time):
         master_fx_param_12_value, master_fx_param_12_start_time, master_fx_param_12_state, vpython_control_faders_enabled
 
     if reverb_active_time != -1.0:
-        elapsed_since_reverb_active = current_time - reverb_active_time
-
-        if elapsed_since_reverb_active < reverb_full_wet_duration:
-            current_reverb_wet = master_reverb_drywet_on
-        elif elapsed_since_reverb_active < reverb_full_wet_duration + reverb_decay_duration:
-            decay_progress = (elapsed_since_reverb_active - reverb_full_wet_duration) / reverb_decay_duration
-            current_reverb_wet = master_reverb_drywet_on * (1 - decay_progress)
-        else:
-            current_reverb_wet = master_reverb_drywet_off
+        # Fully wet for reverb_full_wet_duration, then a linear decay back to dry
+        current_reverb_wet = float(ramp_values(master_reverb_drywet_on, master_reverb_drywet_off,
+                                               reverb_active_time + reverb_full_wet_duration,
+                                               reverb_decay_duration, "linear", current_time))
+        if current_time - reverb_active_time >= reverb_full_wet_duration + reverb_decay_duration:
             reverb_active_time = -1.0 # Reset reverb timer here when it's fully off
 
         send_osc_message(f"/track/{master_track_number}/reverb/drywet", current_reverb_wet, current_time, None, None)
 
-    for i in range(len(track_numbers)): # Now updating parameters for tracks 2-10
-        # Volume decay logic
-        if quadrant_volume_clearing[i]:
-            elapsed_time = current_time - quadrant_clear_start_time[i]
-            if elapsed_time < clear_volume_decay_duration:
-                decay_progress = elapsed_time / clear_volume_decay_duration
-                new_volume = lerp(quadrant_clear_initial_volume[i], 0.0, decay_progress)
-                quadrant_volumes[i] = max(0, new_volume)
-                # Only send volume if VPython fader control is enabled
-                if vpython_control_faders_enabled:
-                    send_osc_message(f"/track/{track_numbers[i]}/volume", quadrant_volumes[i], current_time,
-                                     last_sent_volume, last_volume_send_time)
-            else:
-                quadrant_volumes[i] = 0.0
-                if vpython_control_faders_enabled:
-                    send_osc_message(f"/track/{track_numbers[i]}/volume", quadrant_volumes[i], current_time,
-                                     last_sent_volume, last_volume_send_time)
-                quadrant_volume_clearing[i] = False # Turn off clearing state
-        elif quadrant_decay_timers[i] != -1: # Only apply normal decay if not in clearing state
-            elapsed_time = current_time - quadrant_decay_timers[i]
-            if elapsed_time < decay_time:
-                decay_factor = 1 - (elapsed_time / decay_time)
-                new_volume = max_volume * decay_factor
-                quadrant_volumes[i] = max(0, new_volume)
-                if vpython_control_faders_enabled:
-                    send_osc_message(f"/track/{track_numbers[i]}/volume", quadrant_volumes[i], current_time,
-                                     last_sent_volume, last_volume_send_time)
-            else:
-                if quadrant_volumes[i] > 0:
-                    quadrant_volumes[i] = 0.0
-                    if vpython_control_faders_enabled:
-                        send_osc_message(f"/track/{track_numbers[i]}/volume", quadrant_volumes[i], current_time,
-                                         last_sent_volume, last_volume_send_time)
-                quadrant_decay_timers[i] = -1
-
-        # Azimuth decay logic (now continuously decays, unaffected by cooldown)
-        if abs(quadrant_azimuths[i] - default_azimuth) > 0.001:
-            quadrant_azimuths[i] = lerp(quadrant_azimuths[i], default_azimuth, dt / azimuth_decay_time)
-            if abs(quadrant_azimuths[i] - default_azimuth) < 0.001:
-                quadrant_azimuths[i] = default_azimuth
-        send_osc_message(f"/track/{track_numbers[i]}/fx/2/fxparam/8/value", quadrant_azimuths[i], current_time,
-                         last_sent_azimuth, last_azimuth_send_time)
+    # In receiver envelope mode, hits only send their envelope start; the volume ramps below stay local
+    stream_volumes = vpython_control_faders_enabled and not USE_RECEIVER_ENVELOPES
+    if USE_RECEIVER_ENVELOPES:
+        flush_envelope_starts(current_time)
 
-        # Elevation decay logic (now continuously decays, unaffected by cooldown)
-        if abs(quadrant_elevations[i] - default_elevation) > 0.001:
-            quadrant_elevations[i] = lerp(quadrant_elevations[i], default_elevation, dt / elevation_decay_time)
-            if abs(quadrant_elevations[i] - default_elevation) < 0.001:
-                quadrant_elevations[i] = default_elevation
-        send_osc_message(f"/track/{track_numbers[i]}/fx/2/fxparam/9/value", quadrant_elevations[i], current_time,
-                         last_sent_elevation, last_elevation_send_time)
+    # Only tracks with running envelopes are touched; an idle scene skips this entirely
+    if active_envelope_tracks:
+        update_active_track_envelopes(current_time, stream_volumes)
 
-    # Master FX Param 12 state machine
-    if master_fx_param_12_state == "ramping_up":
+    # Master FX Param 12 state, derived from the time since the release
+    if master_fx_param_12_state != "off":
+        master_fx_param_12_value = master_fx_param_12_at(current_time)
         elapsed = current_time - master_fx_param_12_start_time
-        progress = min(1.0, elapsed / master_fx_param_12_ramp_duration)
-        master_fx_param_12_value = lerp(0.0, 1.0, progress)
-        if progress >= 1.0:
-            master_fx_param_12_state = "decaying" # Transition to decaying immediately after ramp up
-            master_fx_param_12_start_time = current_time # Reset start time for decay phase
-    elif master_fx_param_12_state == "decaying":
-        elapsed = current_time - master_fx_param_12_start_time
-        progress = min(1.0, elapsed / master_fx_param_12_decay_duration)
-        master_fx_param_12_value = lerp(1.0, 0.0, progress)
-        if progress >= 1.0:
+        if elapsed >= master_fx_param_12_ramp_duration + master_fx_param_12_decay_duration:
             master_fx_param_12_state = "off"
             master_fx_param_12_value = 0.0 # Ensure it ends at 0
+        elif elapsed >= master_fx_param_12_ramp_duration:
+            master_fx_param_12_state = "decaying"
 
     # Send Master FX Param 12 OSC message to FX slot 1
     send_osc_message(f"/track/{master_track_number}/fx/1/fxparam/12/value", master_fx_param_12_value, current_time,
                      None, None)
 
+    if USE_PACKED_MIXER_STATE:
+        send_packed_mixer_state(current_time)
+
+
+def update_active_track_envelopes(current_time, stream_volumes):
+    """Advances volume, Azimuth and Elevation envelopes of the tracks in active_envelope_tracks (vectorized)."""
+    active = np.fromiter(active_envelope_tracks, dtype=np.intp, count=len(active_envelope_tracks))
+    volumes = quadrant_volumes[active]
+
+    # Volume decay logic
+    was_clearing = quadrant_volume_clearing[active]
+    clear_elapsed = current_time - quadrant_clear_start_time[active]
+    clear_running = was_clearing & (clear_elapsed < clear_volume_decay_duration)
+    clear_done = was_clearing & ~clear_running
+    volumes[clear_running] = np.maximum(0, ramp_values(quadrant_clear_initial_volume[active][clear_running], 0.0,
+                                                       quadrant_clear_start_time[active][clear_running],
+                                                       clear_volume_decay_duration, "linear", current_time))
+    volumes[clear_done] = 0.0
+    quadrant_volume_clearing[active[clear_done]] = False # Turn off clearing state
+
+    # Only apply normal decay if not in clearing state
+    decay_timers = quadrant_decay_timers[active]
+    decaying = ~was_clearing & (decay_timers != -1)
+    decay_elapsed = current_time - decay_timers
+    decay_running = decaying & (decay_elapsed < decay_time)
+    decay_done = decaying & ~decay_running
+    volumes[decay_running] = np.maximum(0, ramp_values(quadrant_decay_peaks[active][decay_running], 0.0,
+                                                       decay_timers[decay_running], decay_time,
+                                                       VOLUME_DECAY_CURVE, current_time))
+    volume_changed = clear_running | clear_done | decay_running | (decay_done & (volumes > 0))
+    volumes[decay_done] = 0.0
+    quadrant_decay_timers[active[decay_done]] = -1
+    quadrant_volumes[active] = volumes
+    if USE_VOICE_ALLOCATOR:
+        for i in active[clear_done | decay_done]:
+            release_voice(i)
+
+    # The receiver runs the same ramp, so mirror it locally for the Ambisonics visualization
+    if USE_RECEIVER_ENVELOPES and vpython_control_faders_enabled:
+        reaper_track_volumes.update(zip([track_numbers[i] for i in active], volumes.tolist()))
+
+    # Azimuth and Elevation decay logic (now continuously decays, unaffected by cooldown)
+    quadrant_azimuths[active] = ramp_values(azimuth_ramp_start_values[active], default_azimuth,
+                                            azimuth_ramp_start_times[active], azimuth_decay_time,
+                                            AZIMUTH_ELEVATION_RAMP_CURVE, current_time)
+    quadrant_elevations[active] = ramp_values(elevation_ramp_start_values[active], default_elevation,
+                                              elevation_ramp_start_times[active], elevation_decay_time,
+                                              AZIMUTH_ELEVATION_RAMP_CURVE, current_time)
+
+    if USE_PACKED_MIXER_STATE:
+        # The blob carries every field; change detection happens in send_packed_mixer_state
+        if stream_volumes:
+            packed_field_values[3 * active] = volumes
+        packed_field_values[3 * active + 1] = quadrant_azimuths[active]
+        packed_field_values[3 * active + 2] = quadrant_elevations[active]
+    else:
+        send_track_parameter_updates(current_time, active, volume_changed & stream_volumes)
+
+    # Settled tracks leave the active set, once their final values are on the wire
+    settled = ~quadrant_volume_clearing[active] & (quadrant_decay_timers[active] == -1) & \
+              (quadrant_azimuths[active] == default_azimuth) & (quadrant_elevations[active] == default_elevation)
+    for i in active[settled]:
+        if USE_PACKED_MIXER_STATE or flush_settled_track(i, current_time, stream_volumes):
+            active_envelope_tracks.discard(int(i))
+
+
+def flush_settled_track(i, current_time, stream_volumes):
+    """Sends the final values of a settled track that differ from the last sent ones. Returns False on send failure."""
+    all_sent = True
+    if stream_volumes and last_sent_volume[i] != quadrant_volumes[i]:
+        if send_osc_value(f"/track/{track_numbers[i]}/volume", float(quadrant_volumes[i])):
+            last_sent_volume[i] = quadrant_volumes[i]
+            last_volume_send_time[i] = current_time
+            reaper_track_volumes[track_numbers[i]] = float(quadrant_volumes[i])
+        else:
+            all_sent = False
+    for values, last_sent, last_send_time, fx_param in (
+            (quadrant_azimuths, last_sent_azimuth, last_azimuth_send_time, 8),
+            (quadrant_elevations, last_sent_elevation, last_elevation_send_time, 9)):
+        if last_sent[i] != values[i]:
+            if send_osc_value(f"/track/{track_numbers[i]}/fx/2/fxparam/{fx_param}/value", float(values[i])):
+                last_sent[i] = values[i]
+                last_send_time[i] = current_time
+            else:
+                all_sent = False
+    return all_sent
 
-# New: Apply attraction force to balls
-def apply_attraction_force_to_ball(ball, ring_obj, strength):
-    """Applies an attraction force to a ball, pulling it towards the ring's center."""
-    # Calculate vector from ball to ring center in XZ plane
-    vec_to_center_xz = vector(ring_obj.pos.x - ball.pos.x, 0, ring_obj.pos.z - ball.pos.z)
-    distance_xz = vec_to_center_xz.mag
 
-    if distance_xz > 0.1: # Avoid division by zero or excessively strong force at very close distances
-        # Attraction force strength is proportional to distance (linear attraction)
-        force_magnitude = strength * distance_xz
+def send_track_parameter_updates(current_time, active, volume_changed):
+    """
+    Sends the volume (where volume_changed), Azimuth and Elevation messages of the active tracks that pass the
+    per-track threshold / interval tests, at most OSC_TRACK_MESSAGE_BUDGET per frame.
+    """
+    global latency_traces_dropped
+    volumes = quadrant_volumes[active]
+    azimuths = quadrant_azimuths[active]
+    elevations = quadrant_elevations[active]
+    volume_delta = np.abs(volumes - last_sent_volume[active])
+    volume_due = volume_changed & ((volume_delta > OSC_VALUE_THRESHOLD) |
+                                   (current_time - last_volume_send_time[active] > OSC_UPDATE_INTERVAL) |
+                                   ((volumes == 0.0) & (last_sent_volume[active] != 0.0)))
+    azimuth_delta = np.abs(azimuths - last_sent_azimuth[active])
+    azimuth_due = (azimuth_delta > OSC_VALUE_THRESHOLD) | \
+                  (current_time - last_azimuth_send_time[active] > OSC_UPDATE_INTERVAL)
+    elevation_delta = np.abs(elevations - last_sent_elevation[active])
+    elevation_due = (elevation_delta > OSC_VALUE_THRESHOLD) | \
+                    (current_time - last_elevation_send_time[active] > OSC_UPDATE_INTERVAL)
+
+    # Hits whose volume change is not going to be sent (below threshold or faders not under VPython control)
+    for i in active[(quadrant_decay_timers[active] != -1) & ~volume_due]:
+        if pending_latency_traces[i] is not None:
+            pending_latency_traces[i] = None
+            latency_traces_dropped += 1
+
+    # Candidates as (kind, position in active); volume first (priority offset 2), then by size of the change
+    active_count = len(active)
+    due = np.concatenate([volume_due, azimuth_due, elevation_due])
+    priority = np.concatenate([volume_delta + 2.0, azimuth_delta, elevation_delta])
+    candidates = np.flatnonzero(due)
+    if len(candidates) > OSC_TRACK_MESSAGE_BUDGET:
+        candidates = candidates[np.argsort(-priority[candidates], kind="stable")[:OSC_TRACK_MESSAGE_BUDGET]]
+
+    for candidate in candidates:
+        kind, position = divmod(int(candidate), active_count)
+        i = int(active[position])
+        if kind == 0:
+            send_osc_message(f"/track/{track_numbers[i]}/volume", float(quadrant_volumes[i]), current_time,
+                             last_sent_volume, last_volume_send_time)
+        elif kind == 1:
+            send_osc_message(f"/track/{track_numbers[i]}/fx/2/fxparam/8/value", float(quadrant_azimuths[i]),
+                             current_time, last_sent_azimuth, last_azimuth_send_time)
+        else:
+            send_osc_message(f"/track/{track_numbers[i]}/fx/2/fxparam/9/value", float(quadrant_elevations[i]),
+                             current_time, last_sent_elevation, last_elevation_send_time)
+
+
+# --- Integrators ---
+# integrate_motion, attraction_acceleration and the fixed-seed energy characterization live in integrators.py, so
+# test_integrators.py can run them without a VPython scene. Press 'I' to print the characterization; it runs in a
+# background thread so the render and OSC loop keep going.
+def gravity_acceleration(pos):
+    return table_gravity
 
-        # Apply force to ball's velocity
-        attraction_force = vec_to_center_xz.norm() * force_magnitude
-        ball.vel += attraction_force * dt # Apply force as acceleration
+
+def integrate_ball(ball, ring_obj, step=dt):
+    """Advances a ball by one step under gravity and the attraction towards its ring's center."""
+    integrate_motion(ball, lambda pos: table_gravity + attraction_acceleration(pos, ring_obj.pos, ball_attraction_strength),
+                     step, INTEGRATOR)
+
+
+def start_integrator_report():
+    threading.Thread(target=characterize_integrators, args=(LARGE_ATTRACTION_STRENGTH,), daemon=True).start()
 
 
 def update_ring_visuals(current_time):
@@ -1521,16 +3416,20 @@ def update_camera(current_time):
     """Updates the camera's position and orientation based on current mode and shake effect."""
     global shake_active, shake_start_time, active_shake_duration, active_shake_intensity
 
+    # The camera moves in world coordinates here and is placed into the table-frame scene at the end
+    camera_pos = table_to_world(scene.camera.pos, rendered_table_orientation)
+    camera_axis = rotate_by_table(scene.camera.axis, rendered_table_orientation)
+
     if shake_active:
         elapsed_shake_time = current_time - shake_start_time
         if elapsed_shake_time < active_shake_duration:
             current_shake_factor = 1 - (elapsed_shake_time / active_shake_duration)
             current_intensity = active_shake_intensity * current_shake_factor
             # Increase camera shake magnitude
-            scene.camera.pos += vector(random.uniform(-1, 1), random.uniform(-1, 1),
-                                       random.uniform(-1, 1)).norm() * current_intensity * 2.0
-            scene.camera.axis += vector(random.uniform(-1, 1), random.uniform(-1, 1),
-                                        random.uniform(-1, 1)).norm() * current_intensity * 1.0
+            camera_pos += vector(random.uniform(-1, 1), random.uniform(-1, 1),
+                                 random.uniform(-1, 1)).norm() * current_intensity * 2.0
+            camera_axis += vector(random.uniform(-1, 1), random.uniform(-1, 1),
+                                  random.uniform(-1, 1)).norm() * current_intensity * 1.0
         else:
             shake_active = False
             active_shake_intensity = 0
@@ -1540,7 +3439,7 @@ def update_camera(current_time):
     target_look_at_pos = vector(0, 0, 0)
 
     # Calculate mid_point at the beginning of the function so it's always defined
-    all_ring_positions = [rotating_object.pos, rotating_object_2.pos, rotating_object_3.pos, rotating_object_4.pos]
+    all_ring_positions = [table_to_world(ring_obj.pos) for ring_obj in ring_objects_list]
     mid_point = sum(all_ring_positions, vector(0, 0, 0)) / len(all_ring_positions)
 
     current_mode = camera_modes[current_camera_mode_index]
@@ -1550,19 +3449,19 @@ def update_camera(current_time):
         target_camera_pos = target_center + fixed_camera_offset
         target_look_at_pos = target_center + fixed_look_at_offset
     elif current_mode == "track_ring_1":
-        target_center = rotating_object.pos
+        target_center = all_ring_positions[0]
         target_camera_pos = target_center + vector(0, 5, 5)
         target_look_at_pos = target_center
     elif current_mode == "track_ring_2":
-        target_center = rotating_object_2.pos
+        target_center = all_ring_positions[1]
         target_camera_pos = target_center + vector(0, 5, 5)
         target_look_at_pos = target_center
     elif current_mode == "track_ring_3":
-        target_center = rotating_object_3.pos
+        target_center = all_ring_positions[2]
         target_camera_pos = target_center + vector(0, 5, 5)
         target_look_at_pos = target_center
     elif current_mode == "track_ring_4":
-        target_center = rotating_object_4.pos
+        target_center = all_ring_positions[3]
         target_camera_pos = target_center + vector(0, 5, 5)
         target_look_at_pos = target_center
     elif current_mode == "overhead_view":
@@ -1574,9 +3473,10 @@ def update_camera(current_time):
         target_camera_pos = target_center + vector(0, 1, 15)
         target_look_at_pos = target_center + vector(0, 0, 0)
     elif current_mode == "inside_ring_1":
-        target_center = rotating_object.pos
+        target_center = all_ring_positions[0]
         # Camera inside the ring, looking at the ring center
-        target_camera_pos = target_center + rotating_object.axis.norm() * (ring_radius / 2) + vector(0, 0.5, 0)
+        target_camera_pos = target_center + rotate_by_table(rotating_object.axis.norm(), table_orientation) * (
+                ring_radius / 2) + vector(0, 0.5, 0)
         target_look_at_pos = target_center
     elif current_mode == "side_view_plane":
         target_center = vector(0, 0, 0)
@@ -1584,9 +3484,9 @@ def update_camera(current_time):
         target_camera_pos = target_center + vector(plane_length / 2 + 5, 5, 0)
         target_look_at_pos = target_center
     elif current_mode == "ambisonics_view":
-        target_center = hemisphere_center
-        target_camera_pos = hemisphere_center + vector(0, hemisphere_radius * 1.5, hemisphere_radius * 1.5)
-        target_look_at_pos = hemisphere_center
+        target_center = table_to_world(hemisphere_center) # The hemisphere is drawn in the table frame
+        target_camera_pos = target_center + vector(0, hemisphere_radius * 1.5, hemisphere_radius * 1.5)
+        target_look_at_pos = target_center
 
     if event_phase == "releasing":
         # During the release phase, the camera might zoom in or move to a more dynamic position
@@ -1594,8 +3494,9 @@ def update_camera(current_time):
         target_camera_pos = mid_point + vector(0, 10, 10) # Slightly pull back and raise
         target_look_at_pos = mid_point + vector(0, -2, -2)
 
-    scene.camera.pos = lerp(scene.camera.pos, target_camera_pos, camera_tracking_speed)
-    scene.camera.axis = lerp(scene.camera.axis, target_look_at_pos - scene.camera.pos, camera_tracking_speed)
+    camera_pos = lerp(camera_pos, target_camera_pos, camera_tracking_speed)
+    camera_axis = lerp(camera_axis, target_look_at_pos - camera_pos, camera_tracking_speed)
+    sync_table_view(camera_pos, camera_axis)
 
 
 dragging_object = None # Track the currently dragged object
@@ -1651,6 +3552,7 @@ def on_mousemove(evt):
 
         dragging_object.pos.x = new_x
         dragging_object.pos.z = new_z
+        invalidate_ring_wall_contacts(dragging_object)
 
 
 def on_mouseup(evt):
@@ -1670,10 +3572,22 @@ def on_keydown(evt):
         release_balls_action()
     elif evt.key == 'a' or evt.key == 'A':
         add_ball_action()
+    elif evt.key == 'b' or evt.key == 'B': # New shortcut 'B' to fill the rings with BULK_SPAWN_COUNT balls
+        spawn_balls()
     elif evt.key == 'c' or evt.key == 'C':
         clear_all_balls_action()
     elif evt.key == 'v' or evt.key == 'V': # New shortcut 'V' to switch camera mode
         switch_camera_mode()
+    elif evt.key == 'l' or evt.key == 'L': # New shortcut 'L' to dump collision-to-wire latency histograms
+        report_latency_histograms("Collision-to-Wire Latency (on demand)")
+    elif evt.key == 'p' or evt.key == 'P': # New shortcut 'P' to dump voice allocation statistics
+        report_voice_stats("Voice Allocation (on demand)")
+    elif evt.key == 'i' or evt.key == 'I': # New shortcut 'I' to compare the integrators' energy behaviour
+        start_integrator_report()
+    elif evt.key == 'u' or evt.key == 'U': # New shortcut 'U' to dump the adaptive substep histogram
+        report_substep_stats("Adaptive Substepping (on demand)")
+    elif evt.key == 'e' or evt.key == 'E': # New shortcut 'E' to start score recording / stop and export it
+        toggle_score_recording()
 
 
 scene.bind('keydown', on_keydown)
@@ -1700,9 +3614,6 @@ azimuth_elevation_zero_label = label(pos=azimuth_elevation_zero_marker.pos + vec
 for track_num in track_numbers:
     # Create a single sphere for each track, initially visible
     s = sphere(radius=INDIVIDUAL_SOUND_SOURCE_RADIUS, color=color.white, emissive=True, opacity=0.1, visible=True)
-    # Random angular velocity (visual effect is not obvious for spheres, but logic is retained)
-    s.angular_velocity = vector(random.uniform(-1, 1), random.uniform(-1, 1),
-                                random.uniform(-1, 1)).norm() * random.uniform(0.5, 2.0)
     s.current_scale = 1.0 # For pulse effect
     projected_sound_sources[track_num] = s # Store the single sphere object directly
     # Create the label once
@@ -1711,12 +3622,48 @@ for track_num in track_numbers:
                                               border=4, font='sans', box=False, color=color.white, visible=True)
 
 # New: Timer for periodically printing reaper_track_volumes
-last_print_time = time.time()
+last_print_time = sim_clock()
 PRINT_INTERVAL = 1.0 # Print once per second
 
+# Make sure the initial mixer state has been sent (and acknowledged, if requested) before the first frame
+startup_handshake_thread.join()
+first_frame_reported = False
+
+offline_script_index = 0
+if OFFLINE_RENDER:
+    offline_render_start_time = offline_clock_time
+    offline_render_wall_start = time.perf_counter()
+    start_score_recording()
+physics_step_end_time = sim_clock()
+
 while True:
-    rate(100) # Run simulation at 100 frames per second
-    current_sim_time = time.time()
+    if OFFLINE_RENDER:
+        # No pacing: the simulation clock advances one frame period per frame, as fast as the CPU allows
+        offline_clock_time += OFFLINE_FRAME_PERIOD
+        offline_elapsed = offline_clock_time - offline_render_start_time
+        if offline_elapsed >= OFFLINE_RENDER_DURATION:
+            stop_score_recording()
+            export_score()
+            print(f"Offline render: {offline_elapsed:.1f} s of simulation in "
+                  f"{time.perf_counter() - offline_render_wall_start:.1f} s")
+            break
+        run_offline_script(offline_elapsed)
+    else:
+        rate(100) # Run simulation at 100 frames per second
+    current_sim_time = sim_clock()
+    physics_step_start_time = physics_step_end_time
+    physics_step_end_time = current_sim_time
+
+    if not first_frame_reported:
+        if not STARTUP_WAIT_FOR_ACK:
+            ack_status = "not requested"
+        elif startup_ack_received:
+            ack_status = "received"
+        else:
+            ack_status = f"not received within {STARTUP_ACK_TIMEOUT:.2f} s"
+        print(f"Startup: first frame after {(time.perf_counter() - startup_begin_time) * 1000:.1f} ms "
+              f"(initial state bundle {startup_handshake_duration * 1000:.1f} ms, REAPER ack {ack_status})")
+        first_frame_reported = True
 
     if event_phase == "normal":
         pass
@@ -1742,7 +3689,9 @@ while True:
                     direction_from_ring_center_xz = vector(random.uniform(-1, 1), 0, random.uniform(-1, 1)).norm()
                 else:
                     direction_from_ring_center_xz = direction_from_ring_center_xz.norm()
+                wake_ball(ball)
                 ball.vel = direction_from_ring_center_xz * release_speed + vector(0, release_speed * 0.2, 0)
+                invalidate_wall_contact(ball)
             release_velocity_applied = True
 
         # Reverb time is shared, reset event phase when it ends
@@ -1763,157 +3712,152 @@ while True:
     incremental_tilt_angle_z = new_tilt_angle_z - previous_tilt_angle_z
     previous_tilt_angle_z = new_tilt_angle_z
 
-    ground.rotate(angle=incremental_tilt_angle_x, axis=vector(1, 0, 0), origin=tilting_pivot_point)
-    ground.rotate(angle=incremental_tilt_angle_z, axis=vector(0, 0, 1), origin=tilting_pivot_point)
-    rotating_object.rotate(angle=incremental_tilt_angle_x, axis=vector(1, 0, 0), origin=tilting_pivot_point)
-    rotating_object.rotate(angle=incremental_tilt_angle_z, axis=vector(0, 0, 1), origin=tilting_pivot_point)
-    rotating_object_2.rotate(angle=incremental_tilt_angle_x, axis=vector(1, 0, 0), origin=tilting_pivot_point)
-    rotating_object_2.rotate(angle=incremental_tilt_angle_z, axis=vector(0, 0, 1), origin=tilting_pivot_point)
-    rotating_object_3.rotate(angle=incremental_tilt_angle_x, axis=vector(1, 0, 0), origin=tilting_pivot_point)
-    rotating_object_3.rotate(angle=incremental_tilt_angle_z, axis=vector(0, 0, 1), origin=tilting_pivot_point)
-    rotating_object_4.rotate(angle=incremental_tilt_angle_x, axis=vector(1, 0, 0), origin=tilting_pivot_point)
-    rotating_object_4.rotate(angle=incremental_tilt_angle_z, axis=vector(0, 0, 1), origin=tilting_pivot_point)
-
-    for ball in inner_balls + inner_balls_2 + inner_balls_3 + inner_balls_4:
-        ball.rotate(angle=incremental_tilt_angle_x, axis=vector(1, 0, 0), origin=tilting_pivot_point)
-        ball.rotate(angle=incremental_tilt_angle_z, axis=vector(0, 0, 1), origin=tilting_pivot_point)
+    tilt_table(incremental_tilt_angle_x, incremental_tilt_angle_z) # Turns gravity; objects stay in the table frame
+    if WALL_CONTACT_SCHEDULING:
+        check_wall_contact_tilt()
 
     # Handle physics for each ring
+    integrate_ring_orientations(dt)
+    update_ring_frames()
     handle_ring_physics_for_object(rotating_object, ring_radius)
     handle_ring_physics_for_object(rotating_object_2, ring_radius_2)
     handle_ring_physics_for_object(rotating_object_3, ring_radius_3)
     handle_ring_physics_for_object(rotating_object_4, ring_radius_4)
 
-    # Reset quadrant statistics for all rings (now only for shared tracks)
-    for i in range(len(track_numbers)):
-        quadrant_ball_stats[i]["count"] = 0
-        quadrant_ball_stats[i]["total_speed"] = 0.0
-
     balls_to_add = []
     balls_to_remove = []
 
     # Process balls for the first ring
-    for i, ball1 in enumerate(inner_balls):
-        ball1.vel += g * dt
-        apply_attraction_force_to_ball(ball1, rotating_object, ball_attraction_strength) # Apply attraction force
-        ball1.pos += ball1.vel * dt
-
-        handle_ball_ground_collision(ball1)
-        handle_ball_ring_collision_for_object(ball1, rotating_object, ring_radius, ring_glow_obj, ring_vobj,
-                                              current_sim_time, balls_to_add, balls_to_remove)
-
-        relative_ball_pos_xz = vector(ball1.pos.x - rotating_object.pos.x, 0, ball1.pos.z - rotating_object.pos.z)
-        if relative_ball_pos_xz.mag > 0.001:
-            current_ball_angle_local = atan2(relative_ball_pos_xz.z, relative_ball_pos_xz.x)
-            if current_ball_angle_local < 0:
-                current_ball_angle_local += 2 * pi
-
-            current_quadrant = int(current_ball_angle_local / section_angle_span)
-            current_quadrant = min(current_quadrant, len(track_numbers) - 1)
-
-            quadrant_ball_stats[current_quadrant]["count"] += 1
-            quadrant_ball_stats[current_quadrant]["total_speed"] += ball1.vel.mag
-
-        for j in range(i + 1, len(inner_balls)):
-            ball2 = inner_balls[j]
-            handle_ball_ball_collision(ball1, ball2, balls_to_add, balls_to_remove)
+    if ADAPTIVE_SUBSTEPPING:
+        advance_balls_adaptive(inner_balls, rotating_object, ring_radius, current_sim_time, balls_to_add, balls_to_remove)
+    else:
+        due_wall_balls = due_wall_contacts(rotating_object, inner_balls, t + dt) if WALL_CONTACT_SCHEDULING else None
+        wall_tested_balls = []
+        for i, ball1 in enumerate(inner_balls):
+            if not (ball1.asleep and ball_stays_asleep(ball1, rotating_object)):
+                integrate_ball(ball1, rotating_object) # Gravity and attraction force
+
+                handle_ball_ground_collision(ball1)
+                if wall_contact_due(ball1, due_wall_balls):
+                    handle_ball_ring_collision_for_object(ball1, rotating_object, ring_radius, current_sim_time)
+                    wall_tested_balls.append(ball1)
+                if SLEEPING_BODIES:
+                    update_ball_rest_state(ball1, rotating_object)
+
+            if not USE_CONTACT_SOLVER:
+                for j in range(i + 1, len(inner_balls)):
+                    ball2 = inner_balls[j]
+                    if not (ball1.asleep and ball2.asleep): # Sleepers aren't tested against each other
+                        handle_ball_ball_collision(ball1, ball2, balls_to_add, balls_to_remove)
+        if USE_CONTACT_SOLVER:
+            solve_ball_contacts(inner_balls, rotating_object, balls_to_remove)
+        if WALL_CONTACT_SCHEDULING:
+            predict_wall_contacts(wall_tested_balls, rotating_object, ring_radius, t + dt)
 
     # Process balls for the second ring
-    for i, ball1 in enumerate(inner_balls_2):
-        ball1.vel += g * dt
-        apply_attraction_force_to_ball(ball1, rotating_object_2, ball_attraction_strength) # Apply attraction force
-        ball1.pos += ball1.vel * dt
-
-        handle_ball_ground_collision(ball1)
-        handle_ball_ring_collision_for_object(ball1, rotating_object_2, ring_radius_2, ring_glow_obj_2, ring_vobj_2,
-                                              current_sim_time, balls_to_add, balls_to_remove)
-
-        relative_ball_pos_xz = vector(ball1.pos.x - rotating_object_2.pos.x, 0, ball1.pos.z - rotating_object_2.pos.z)
-        if relative_ball_pos_xz.mag > 0.001:
-            current_ball_angle_local = atan2(relative_ball_pos_xz.z, relative_ball_pos_xz.x)
-            if current_ball_angle_local < 0:
-                current_ball_angle_local += 2 * pi
-
-            current_quadrant = int(current_ball_angle_local / section_angle_span)
-            current_quadrant = min(current_quadrant, len(track_numbers) - 1)
-
-            quadrant_ball_stats[current_quadrant]["count"] += 1
-            quadrant_ball_stats[current_quadrant]["total_speed"] += ball1.vel.mag
-
-        for j in range(i + 1, len(inner_balls_2)):
-            ball2 = inner_balls_2[j]
-            handle_ball_ball_collision(ball1, ball2, balls_to_add, balls_to_remove)
+    if ADAPTIVE_SUBSTEPPING:
+        advance_balls_adaptive(inner_balls_2, rotating_object_2, ring_radius_2, current_sim_time, balls_to_add, balls_to_remove)
+    else:
+        due_wall_balls = due_wall_contacts(rotating_object_2, inner_balls_2, t + dt) if WALL_CONTACT_SCHEDULING else None
+        wall_tested_balls = []
+        for i, ball1 in enumerate(inner_balls_2):
+            if not (ball1.asleep and ball_stays_asleep(ball1, rotating_object_2)):
+                integrate_ball(ball1, rotating_object_2) # Gravity and attraction force
+
+                handle_ball_ground_collision(ball1)
+                if wall_contact_due(ball1, due_wall_balls):
+                    handle_ball_ring_collision_for_object(ball1, rotating_object_2, ring_radius_2, current_sim_time)
+                    wall_tested_balls.append(ball1)
+                if SLEEPING_BODIES:
+                    update_ball_rest_state(ball1, rotating_object_2)
+
+            if not USE_CONTACT_SOLVER:
+                for j in range(i + 1, len(inner_balls_2)):
+                    ball2 = inner_balls_2[j]
+                    if not (ball1.asleep and ball2.asleep): # Sleepers aren't tested against each other
+                        handle_ball_ball_collision(ball1, ball2, balls_to_add, balls_to_remove)
+        if USE_CONTACT_SOLVER:
+            solve_ball_contacts(inner_balls_2, rotating_object_2, balls_to_remove)
+        if WALL_CONTACT_SCHEDULING:
+            predict_wall_contacts(wall_tested_balls, rotating_object_2, ring_radius_2, t + dt)
 
     # Process balls for the third ring
-    for i, ball1 in enumerate(inner_balls_3):
-        ball1.vel += g * dt
-        apply_attraction_force_to_ball(ball1, rotating_object_3, ball_attraction_strength) # Apply attraction force
-        ball1.pos += ball1.vel * dt
-
-        handle_ball_ground_collision(ball1)
-        handle_ball_ring_collision_for_object(ball1, rotating_object_3, ring_radius_3, ring_glow_obj_3, ring_vobj_3,
-                                              current_sim_time, balls_to_add, balls_to_remove)
-
-        relative_ball_pos_xz = vector(ball1.pos.x - rotating_object_3.pos.x, 0, ball1.pos.z - rotating_object_3.pos.z)
-        if relative_ball_pos_xz.mag > 0.001:
-            current_ball_angle_local = atan2(relative_ball_pos_xz.z, relative_ball_pos_xz.x)
-            if current_ball_angle_local < 0:
-                current_ball_angle_local += 2 * pi
-
-            current_quadrant = int(current_ball_angle_local / section_angle_span)
-            current_quadrant = min(current_quadrant, len(track_numbers) - 1)
-
-            quadrant_ball_stats[current_quadrant]["count"] += 1
-            quadrant_ball_stats[current_quadrant]["total_speed"] += ball1.vel.mag
-
-        for j in range(i + 1, len(inner_balls_3)):
-            ball2 = inner_balls_3[j]
-            handle_ball_ball_collision(ball1, ball2, balls_to_add, balls_to_remove)
+    if ADAPTIVE_SUBSTEPPING:
+        advance_balls_adaptive(inner_balls_3, rotating_object_3, ring_radius_3, current_sim_time, balls_to_add, balls_to_remove)
+    else:
+        due_wall_balls = due_wall_contacts(rotating_object_3, inner_balls_3, t + dt) if WALL_CONTACT_SCHEDULING else None
+        wall_tested_balls = []
+        for i, ball1 in enumerate(inner_balls_3):
+            if not (ball1.asleep and ball_stays_asleep(ball1, rotating_object_3)):
+                integrate_ball(ball1, rotating_object_3) # Gravity and attraction force
+
+                handle_ball_ground_collision(ball1)
+                if wall_contact_due(ball1, due_wall_balls):
+                    handle_ball_ring_collision_for_object(ball1, rotating_object_3, ring_radius_3, current_sim_time)
+                    wall_tested_balls.append(ball1)
+                if SLEEPING_BODIES:
+                    update_ball_rest_state(ball1, rotating_object_3)
+
+            if not USE_CONTACT_SOLVER:
+                for j in range(i + 1, len(inner_balls_3)):
+                    ball2 = inner_balls_3[j]
+                    if not (ball1.asleep and ball2.asleep): # Sleepers aren't tested against each other
+                        handle_ball_ball_collision(ball1, ball2, balls_to_add, balls_to_remove)
+        if USE_CONTACT_SOLVER:
+            solve_ball_contacts(inner_balls_3, rotating_object_3, balls_to_remove)
+        if WALL_CONTACT_SCHEDULING:
+            predict_wall_contacts(wall_tested_balls, rotating_object_3, ring_radius_3, t + dt)
 
     # Process balls for the fourth ring
-    for i, ball1 in enumerate(inner_balls_4):
-        ball1.vel += g * dt
-        apply_attraction_force_to_ball(ball1, rotating_object_4, ball_attraction_strength) # Apply attraction force
-        ball1.pos += ball1.vel * dt
-
-        handle_ball_ground_collision(ball1)
-        handle_ball_ring_collision_for_object(ball1, rotating_object_4, ring_radius_4, ring_glow_obj_4, ring_vobj_4,
-                                              current_sim_time, balls_to_add, balls_to_remove)
-
-        relative_ball_pos_xz = vector(ball1.pos.x - rotating_object_4.pos.x, 0, ball1.pos.z - rotating_object_4.pos.z)
-        if relative_ball_pos_xz.mag > 0.001:
-            current_ball_angle_local = atan2(relative_ball_pos_xz.z, relative_ball_pos_xz.x)
-            if current_ball_angle_local < 0:
-                current_ball_angle_local += 2 * pi
-
-            current_quadrant = int(current_ball_angle_local / section_angle_span)
-            current_quadrant = min(current_quadrant, len(track_numbers) - 1)
-
-            quadrant_ball_stats[current_quadrant]["count"] += 1
-            quadrant_ball_stats[current_quadrant]["total_speed"] += ball1.vel.mag
-
-        for j in range(i + 1, len(inner_balls_4)):
-            ball2 = inner_balls_4[j]
-            handle_ball_ball_collision(ball1, ball2, balls_to_add, balls_to_remove)
-
-    # Update average speed and distance for all rings (now only for shared tracks)
-    for i in range(len(track_numbers)):
-        if quadrant_ball_stats[i]["count"] > 0:
-            quadrant_ball_stats[i]["avg_speed"] = quadrant_ball_stats[i]["total_speed"] / quadrant_ball_stats[i][
-                "count"]
-        else:
-            quadrant_ball_stats[i]["avg_speed"] = 0.0
+    if ADAPTIVE_SUBSTEPPING:
+        advance_balls_adaptive(inner_balls_4, rotating_object_4, ring_radius_4, current_sim_time, balls_to_add, balls_to_remove)
+    else:
+        due_wall_balls = due_wall_contacts(rotating_object_4, inner_balls_4, t + dt) if WALL_CONTACT_SCHEDULING else None
+        wall_tested_balls = []
+        for i, ball1 in enumerate(inner_balls_4):
+            if not (ball1.asleep and ball_stays_asleep(ball1, rotating_object_4)):
+                integrate_ball(ball1, rotating_object_4) # Gravity and attraction force
+
+                handle_ball_ground_collision(ball1)
+                if wall_contact_due(ball1, due_wall_balls):
+                    handle_ball_ring_collision_for_object(ball1, rotating_object_4, ring_radius_4, current_sim_time)
+                    wall_tested_balls.append(ball1)
+                if SLEEPING_BODIES:
+                    update_ball_rest_state(ball1, rotating_object_4)
+
+            if not USE_CONTACT_SOLVER:
+                for j in range(i + 1, len(inner_balls_4)):
+                    ball2 = inner_balls_4[j]
+                    if not (ball1.asleep and ball2.asleep): # Sleepers aren't tested against each other
+                        handle_ball_ball_collision(ball1, ball2, balls_to_add, balls_to_remove)
+        if USE_CONTACT_SOLVER:
+            solve_ball_contacts(inner_balls_4, rotating_object_4, balls_to_remove)
+        if WALL_CONTACT_SCHEDULING:
+            predict_wall_contacts(wall_tested_balls, rotating_object_4, ring_radius_4, t + dt)
+
+    if ADAPTIVE_SUBSTEPPING:
+        record_substep_frame()
+
+    # Hand this step's collision events to the mixer, visual and particle consumers
+    dispatch_collision_events(balls_to_add)
+
+    # Per-sector ball statistics for all rings at once
+    bin_ball_statistics([inner_balls, inner_balls_2, inner_balls_3, inner_balls_4])
 
     # OSC parameter update (now called once, handling shared track data)
     update_osc_parameters(current_sim_time)
 
+    # Score recorder (ring hits and Azimuth/Elevation lanes of this frame)
+    if score_recording:
+        record_score_frame(current_sim_time)
+
     # Update inner_balls lists, removing balls marked for removal
     next_inner_balls = []
     for ball in inner_balls:
         if ball not in balls_to_remove:
             next_inner_balls.append(ball)
         else:
-            ball.visible = False
+            retire_ball(ball)
 
     inner_balls = next_inner_balls
 
@@ -1922,7 +3866,7 @@ while True:
         if ball not in balls_to_remove:
             next_inner_balls_2.append(ball)
         else:
-            ball.visible = False
+            retire_ball(ball)
 
     inner_balls_2 = next_inner_balls_2
 
@@ -1931,7 +3875,7 @@ while True:
         if ball not in balls_to_remove:
             next_inner_balls_3.append(ball)
         else:
-            ball.visible = False
+            retire_ball(ball)
 
     inner_balls_3 = next_inner_balls_3
 
@@ -1940,17 +3884,20 @@ while True:
         if ball not in balls_to_remove:
             next_inner_balls_4.append(ball)
         else:
-            ball.visible = False
+            retire_ball(ball)
 
     inner_balls_4 = next_inner_balls_4
 
     # Distribute newly created balls to random rings
     for b_add in balls_to_add:
-        target_list = random.choice([inner_balls, inner_balls_2, inner_balls_3, inner_balls_4])
+        target_list, target_ring = random.choice(list(zip([inner_balls, inner_balls_2, inner_balls_3, inner_balls_4],
+                                                          ring_objects_list)))
         if len(target_list) < MAX_BALLS: # Check against MAX_BALLS, not individual list capacity
             target_list.append(b_add)
+            b_add.home_ring = target_ring
+            invalidate_wall_contact(b_add)
         else:
-            b_add.visible = False
+            retire_ball(b_add)
 
     update_particles()
 
@@ -1990,12 +3937,9 @@ while True:
     track_11_volume = reaper_track_volumes.get(11, 0.0)
 
     # Iterate through each track to update its corresponding projected sphere and label
+    # Azimuth and Elevation are still controlled by VPython's internal logic and sent to REAPER
+    moved_tracks = update_projection_cache()
     for i, track_num in enumerate(track_numbers):
-        # Retrieve current Azimuth and Elevation values for this track
-        # Azimuth and Elevation are still controlled by VPython's internal logic and sent to REAPER
-        current_azimuth_norm = quadrant_azimuths[i]
-        current_elevation_norm = quadrant_elevations[i]
-
         # Get the fader volume for this track, default to 0.0 if not yet received
         # Here, the actual fader volume received from REAPER is used to control the sphere's appearance
         fader_volume = reaper_track_volumes.get(track_num, 0.0)
@@ -2009,21 +3953,20 @@ while True:
         s = projected_sound_sources[track_num]
         current_label = projected_sound_labels[track_num]
 
-        # Always calculate position
-        azimuth_angle = map_range(current_azimuth_norm, 0.0, 0.99, math.pi, -math.pi)
-        elevation_angle = map_range(current_elevation_norm, 0.0, 1.0, 0.0, math.pi / 2)
-
-        projected_x = hemisphere_radius * math.cos(elevation_angle) * math.sin(azimuth_angle)
-        projected_y = hemisphere_radius * math.sin(elevation_angle)
-        projected_z = hemisphere_radius * math.cos(elevation_angle) * math.cos(azimuth_angle)
-        projected_pos = hemisphere_center + vector(projected_x, projected_y, projected_z)
-        s.pos = projected_pos
+        # Position only changes when the track's quantized Azimuth/Elevation did
+        if moved_tracks[i]:
+            s.pos = vector(*projected_track_positions[i])
 
         # Pulse effect: adjust size based on effective brightness intensity
         # When effective brightness is 0, target_scale is 1.0, sphere remains original size
         target_scale = 1.0 + effective_brightness_factor * 1.0 # Increase responsiveness to effective brightness
-        s.current_scale = lerp(s.current_scale, target_scale, 0.1)
-        s.radius = INDIVIDUAL_SOUND_SOURCE_RADIUS * s.current_scale
+        new_scale = lerp(s.current_scale, target_scale, 0.1)
+        if abs(target_scale - new_scale) < SOUND_SOURCE_SCALE_EPSILON:
+            new_scale = target_scale
+        rescaled = new_scale != s.current_scale
+        if rescaled:
+            s.current_scale = new_scale
+            s.radius = INDIVIDUAL_SOUND_SOURCE_RADIUS * s.current_scale
 
         # Color and opacity change based on effective brightness
         s.color = lerp(color.blue, color.white, effective_brightness_factor) # Color changes from blue to white with brightness
@@ -2034,12 +3977,8 @@ while True:
         # Set emissive property based on effective brightness (e.g., if bright enough, it glows)
         s.emissive = effective_brightness_factor > 0.05
 
-        # Apply rotation (visual effect is not obvious for spheres, but logic is retained)
-        s.rotate(angle=s.angular_velocity.mag * dt, axis=s.angular_velocity.norm(), origin=s.pos)
-
-        current_label.text = str(track_num)
-        current_label.pos = projected_pos + vector(0.2, 0.2, 0.2) * s.current_scale
-        current_label.color = color.white
+        if moved_tracks[i] or rescaled:
+            current_label.pos = s.pos + vector(0.2, 0.2, 0.2) * s.current_scale
 
         # Control sphere and label visibility based on REAPER play status
         # Modify this so that it's always visible when REAPER is playing, even if volume is 0 (but will be very dim)
@@ -2049,6 +3988,7 @@ while True:
 
     update_ring_visuals(current_sim_time)
 
+    push_ring_poses()
     update_camera(current_sim_time)
 
     t += dt
@@ -2059,4 +3999,28 @@ while True:
         # Print volumes for all received tracks
         for track_num in sorted(reaper_track_volumes.keys()):
             print(f"  Track {track_num}: {reaper_track_volumes[track_num]:.2f}")
+        report_sleeping_balls()
+        if USE_CONTACT_SOLVER:
+            report_contact_solver()
+        if WALL_CONTACT_SCHEDULING:
+            report_wall_contact_stats()
+        report_spawn_budget()
         last_print_time = current_sim_time
+
+    # Summarize OSC send errors (at most one line per OSC_ERROR_LOG_INTERVAL)
+    osc_send_health.maybe_log(time.monotonic())
+
+    # Periodically report collision-to-wire latency histograms
+    if LATENCY_TRACING_ENABLED and current_sim_time - last_latency_report_time > LATENCY_REPORT_INTERVAL:
+        report_latency_histograms("Collision-to-Wire Latency (periodic)")
+        last_latency_report_time = current_sim_time
+
+    # Periodically report voice allocation statistics
+    if USE_VOICE_ALLOCATOR and current_sim_time - last_voice_report_time > VOICE_STATS_REPORT_INTERVAL:
+        report_voice_stats("Voice Allocation (periodic)")
+        last_voice_report_time = current_sim_time
+
+    # Periodically report the adaptive substep histogram
+    if ADAPTIVE_SUBSTEPPING and current_sim_time - last_substep_report_time > SUBSTEP_REPORT_INTERVAL:
+        report_substep_stats("Adaptive Substepping (periodic)")
+        last_substep_report_time = current_sim_time
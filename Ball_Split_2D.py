@@ -82,6 +82,25 @@ MAX_GENERATION = 2  # 只有世代為 0 或 1 的球才能生成新的球 (gener
 MAX_TOTAL_BALLS = 1000  # 最大球體數量，防止過多球導致性能下降
 GENERATION_COOLDOWN = 0.2  # 新生成的球體可以再次生成下一代的冷卻時間 (秒)
 
+# --- 生成排程 (spawn budget) 參數 ---
+# 撞牆時的分裂不再立刻建立三顆新球，而是先放進 pending_splits 佇列：新球的位置與速度在撞牆當下就依父球狀態算好，
+# 之後每幀最多建立 SPAWN_BUDGET_PER_FRAME 顆 (先進先出)，連鎖分裂因此分散到多幀，幀時間保持平穩。
+# 同一顆父球的分裂還在佇列中時，它再次撞牆會合併 (coalesce) 到原本的分裂，不會再排入新的一組。
+# 佇列中的新球也計入 MAX_TOTAL_BALLS。
+SPAWN_BUDGET_PER_FRAME = 6  # 每幀最多建立的新球數 (兩次分裂)
+SPAWN_REPORT_INTERVAL = 1.0  # 佇列深度與延遲統計的更新間隔 (模擬秒)
+pending_splits = {}  # id(父球資料) -> {'children': [待建立的新球資料], 'queued_at': 排入時間 t}，依排入順序
+spawn_defer_latencies = []  # 上次統計後建立的新球的延遲 (秒)
+spawn_coalesced_count = 0  # 上次統計後被合併的分裂次數
+last_spawn_report_time = 0
+
+# --- 休眠 (sleeping bodies) 參數 ---
+# 速度與加速度連續 SLEEP_FRAMES 幀都低於門檻的球會進入休眠：不再計算摩擦、位置、牆壁碰撞與生成，
+# 靜止的球幾乎不佔用計算量。球與球之間沒有碰撞，所以目前只有「開始模擬」會喚醒休眠的球。
+SLEEP_SPEED_THRESHOLD = 0.02
+SLEEP_ACCELERATION_THRESHOLD = 0.1  # 摩擦造成的減速度 (friction_coefficient) 低於此值
+SLEEP_FRAMES = 50
+
 # --- 初始速度與運行狀態 ---
 running = False  # 程式一開始是暫停狀態
 t = 0  # 初始化時間變數
@@ -154,7 +173,9 @@ balls.append({
     'generation': 0,  # 第一個球是第0代
     'can_generate_next_at_time': 0,  # 初始球可以立即生成，因為 t 從 0 開始
     'color_inc': {'r': 0.001, 'g': 0.002, 'b': 0.0015},  # 初始變色參數
-    'color_val': {'r': 1.0, 'g': 0.0, 'b': 0.0}  # 將初始顏色值設為紅色，確保可見
+    'color_val': {'r': 1.0, 'g': 0.0, 'b': 0.0},  # 將初始顏色值設為紅色，確保可見
+    'asleep': False,  # 是否處於休眠狀態
+    'rest_frames': 0  # 連續靜止的幀數
 })
 
 
@@ -182,6 +203,8 @@ def start_simulation_action(b):
         first_ball_data['vel'] = final_direction_vec * initial_launch_speed_value
         first_ball_data['obj'].color = color.red  # 重新設定顏色，確保開始時是紅色
         first_ball_data['can_generate_next_at_time'] = t  # 確保開始時可以生成
+        first_ball_data['asleep'] = False  # 喚醒第一個球
+        first_ball_data['rest_frames'] = 0
 
     running = True  # 設定為運行狀態，開始模擬
 
@@ -200,6 +223,35 @@ def toggle_play_pause(b):
 play_pause_button = button(text="Pause", bind=toggle_play_pause)
 scene.append_to_caption(" ")
 
+# 顯示清醒與休眠的球數
+scene.append_to_caption("\n")
+sleep_status_text = wtext(text="")
+
+# 顯示生成佇列深度與延遲
+scene.append_to_caption("\n")
+spawn_status_text = wtext(text="")
+
+
+def pending_spawn_count():
+    """佇列中還沒建立的新球數。"""
+    return sum(len(split['children']) for split in pending_splits.values())
+
+
+def release_pending_spawns():
+    """依排入順序建立最多 SPAWN_BUDGET_PER_FRAME 顆佇列中的新球，回傳它們的資料。"""
+    released = []
+    while pending_splits and len(released) < SPAWN_BUDGET_PER_FRAME:
+        parent_key = next(iter(pending_splits))
+        split = pending_splits[parent_key]
+        child = split['children'].pop(0)
+        child['obj'] = sphere(pos=child.pop('pos'), radius=child['radius'], color=color.white)
+        child['can_generate_next_at_time'] = t + GENERATION_COOLDOWN  # 冷卻時間從實際建立時開始計算
+        released.append(child)
+        spawn_defer_latencies.append(t - split['queued_at'])
+        if not split['children']:
+            del pending_splits[parent_key]
+    return released
+
 # --- 場景視角設定 ---
 scene.camera.pos = vector(0, side_length * 1.5, side_length * 1.5)
 scene.camera.axis = vector(0, -side_length * 1.5, -side_length * 1.5)
@@ -260,11 +312,15 @@ while True:
             # 檢查球是否已經被移除（例如，因為它已經停止並被清理）
             if not ball_data['obj'].visible:
                 continue
+            # 休眠中的球不參與物理計算
+            if ball_data['asleep']:
+                continue
 
             ball_obj = ball_data['obj']
             ball_vel = ball_data['vel']
             ball_radius = ball_data['radius']
             ball_gen = ball_data['generation']  # 獲取球的世代
+            previous_vel = vector(ball_vel)  # 本幀開始時的速度 (用於休眠偵測)
             can_generate_next_at_time = ball_data['can_generate_next_at_time']  # 獲取生成冷卻時間
 
             # --- 應用摩擦力 ---
@@ -323,8 +379,11 @@ while True:
             # 只有世代為 0 或 1 的球才能生成新的球 (generation < MAX_GENERATION)
             # 並且需要通過冷卻時間檢查
             if collided_this_frame and ball_gen < MAX_GENERATION and t >= can_generate_next_at_time:  # 使用 t 變數
-                # 確保總球數未超過上限
-                if len(balls) + len(new_balls_to_add) < MAX_TOTAL_BALLS:
+                # 確保總球數 (含佇列中的新球) 未超過上限；分裂還在佇列中的父球則合併到原本的分裂
+                if id(ball_data) in pending_splits:
+                    spawn_coalesced_count += 1
+                elif len(balls) + pending_spawn_count() < MAX_TOTAL_BALLS:
+                    children = []
                     current_speed = ball_vel.mag  # 碰撞後的速度大小
                     new_radius = ball_radius / 2  # 新球半徑減半
                     if new_radius > 0.02:  # 設置最小半徑，避免球太小
@@ -355,17 +414,19 @@ while True:
                             offset_pos = ball_obj.pos + new_ball_vel.hat * (ball_radius + new_radius + 0.01)
                             offset_pos.y = thickness / 2 + new_radius  # 新球的Y位置也要調整
 
-                            new_ball_obj = sphere(pos=offset_pos, radius=new_radius, color=color.white)
-                            new_balls_to_add.append({
-                                'obj': new_ball_obj,
+                            # 球體在 release_pending_spawns 中才建立，這裡只記下撞牆當下算好的位置
+                            children.append({
+                                'pos': offset_pos,
                                 'vel': new_ball_vel,
                                 'radius': new_radius,
                                 'generation': ball_gen + 1,  # 新生成的球世代加1
-                                'can_generate_next_at_time': t + GENERATION_COOLDOWN,  # 設定新球的冷卻時間，使用 t 變數
                                 'color_inc': {'r': random.uniform(0.0005, 0.002), 'g': random.uniform(0.0005, 0.002),
                                               'b': random.uniform(0.0005, 0.002)},
-                                'color_val': {'r': random.random(), 'g': random.random(), 'b': random.random()}
+                                'color_val': {'r': random.random(), 'g': random.random(), 'b': random.random()},
+                                'asleep': False,
+                                'rest_frames': 0
                             })
+                        pending_splits[id(ball_data)] = {'children': children, 'queued_at': t}
                 # 如果生成了新球，更新當前球的冷卻時間，防止同一幀再次生成
                 ball_data['can_generate_next_at_time'] = t + GENERATION_COOLDOWN  # 使用 t 變數
 
@@ -375,7 +436,18 @@ while True:
             # 更新球體的速度 (因為可能在碰撞中改變)
             ball_data['vel'] = ball_vel
 
-        # 將新生成的球添加到主列表中
+            # --- 休眠偵測：速度與加速度連續 SLEEP_FRAMES 幀都很小就進入休眠 ---
+            if ball_vel.mag < SLEEP_SPEED_THRESHOLD and \
+                    (ball_vel - previous_vel).mag / dt < SLEEP_ACCELERATION_THRESHOLD:
+                ball_data['rest_frames'] += 1
+                if ball_data['rest_frames'] >= SLEEP_FRAMES:
+                    ball_data['asleep'] = True
+                    ball_data['vel'] = vector(0, 0, 0)
+            else:
+                ball_data['rest_frames'] = 0
+
+        # 將本幀預算內的新球添加到主列表中
+        new_balls_to_add.extend(release_pending_spawns())
         balls.extend(new_balls_to_add)
         # 清理停止移動且半徑過小的球（可選，用於性能優化）
         balls_to_remove = []
@@ -392,3 +464,20 @@ while True:
         # 從後往前刪除，避免索引問題
         for i in sorted(balls_to_remove, reverse=True):
             del balls[i]
+
+        # 更新清醒 / 休眠球數 (只有數字改變時才更新文字)
+        sleeping_count = sum(1 for ball_data in balls if ball_data['asleep'])
+        sleep_status = f"Awake balls: {len(balls) - sleeping_count}   Sleeping balls: {sleeping_count}"
+        if sleep_status_text.text != sleep_status:
+            sleep_status_text.text = sleep_status
+
+        # 每 SPAWN_REPORT_INTERVAL 更新一次生成佇列深度與延遲
+        if t - last_spawn_report_time >= SPAWN_REPORT_INTERVAL:
+            spawn_status = f"Spawn queue: {pending_spawn_count()} balls   Coalesced splits: {spawn_coalesced_count}"
+            if spawn_defer_latencies:
+                spawn_status += (f"   Defer latency: mean {1000 * sum(spawn_defer_latencies) / len(spawn_defer_latencies):.0f} ms"
+                                 f" / max {1000 * max(spawn_defer_latencies):.0f} ms")
+            spawn_status_text.text = spawn_status
+            spawn_defer_latencies.clear()
+            spawn_coalesced_count = 0
+            last_spawn_report_time = t
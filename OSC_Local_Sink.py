@@ -0,0 +1,219 @@
+import math
+import struct
+import time
+import threading
+from pythonosc import dispatcher
+from pythonosc import osc_server
+from pythonosc import udp_client
+
+# --- Local OSC Sink (receiver-side reference implementation) ---
+# Run this on the REAPER computer (or on the same computer for testing) and point reaper_ip / osc_port in
+# BallTest_v1.py at it. It receives the simulation's OSC traffic and:
+#   - runs receiver-side volume envelopes started by "/envelope/start" at its own rate (ENVELOPE_RATE),
+#   - decodes packed "/mixer/state" blobs back into the individual track / master FX parameters,
+#   - forwards the resulting /track/N/... values and every other message to REAPER (FORWARD_TO_REAPER),
+#   - prints a traffic summary every REPORT_INTERVAL seconds.
+# With FORWARD_TO_REAPER = False it only records what arrives, which is how the sender modes are tested
+# without a DAW.
+SINK_IP = "0.0.0.0"
+SINK_PORT = 8000
+
+FORWARD_TO_REAPER = False
+REAPER_IP = "127.0.0.1"
+REAPER_PORT = 8001 # REAPER's OSC listening port when the sink sits in front of it
+
+ENVELOPE_RATE = 200 # Envelope evaluation rate (Hz)
+ENVELOPE_VALUE_THRESHOLD = 0.001 # Minimum change before an envelope output is sent again
+EXPONENTIAL_CURVE_STEEPNESS = 5.0 # Larger values make the "exponential" curve drop faster at the start
+
+REPORT_INTERVAL = 5.0
+
+reaper_client = udp_client.SimpleUDPClient(REAPER_IP, REAPER_PORT) if FORWARD_TO_REAPER else None
+
+# Active envelopes, keyed by track number: {"peak", "duration", "curve", "start_time"}
+active_envelopes = {}
+envelope_lock = threading.Lock()
+
+# Last volume produced for each track (what REAPER's fader is set to)
+track_output_volumes = {}
+
+# Mixer state decoded from packed blobs, keyed by OSC address
+PACKED_MIXER_STATE_VERSION = 1
+decoded_mixer_state = {}
+
+# Traffic statistics since the last report
+received_message_counts = {}
+received_blob_bytes = 0
+decoded_blob_fields = 0
+forwarded_envelope_values = 0
+stats_lock = threading.Lock()
+
+
+def envelope_value(peak, duration, curve, elapsed):
+    """Evaluates a decay envelope that starts at peak and reaches 0 after duration seconds."""
+    if elapsed <= 0:
+        return peak
+    if duration <= 0 or elapsed >= duration:
+        return 0.0
+    progress = elapsed / duration
+    if curve == "exponential":
+        floor_value = math.exp(-EXPONENTIAL_CURVE_STEEPNESS)
+        return peak * (math.exp(-EXPONENTIAL_CURVE_STEEPNESS * progress) - floor_value) / (1 - floor_value)
+    return peak * (1 - progress) # "linear"
+
+
+def count_message(address):
+    with stats_lock:
+        received_message_counts[address] = received_message_counts.get(address, 0) + 1
+
+
+def forward_message(address, *args):
+    if reaper_client is not None:
+        try:
+            reaper_client.send_message(address, list(args))
+        except Exception as e:
+            print(f"Error forwarding OSC message to {address}: {e}")
+
+
+def decode_mixer_state_blob(blob):
+    """
+    Decodes a packed mixer state blob sent by BallTest_v1.py (USE_PACKED_MIXER_STATE).
+    Returns {OSC address: value} for every field whose bit is set in the changed-field bitmask.
+    """
+    version, track_count, master_track = struct.unpack_from("<BBB", blob, 0)
+    if version != PACKED_MIXER_STATE_VERSION:
+        raise ValueError(f"unsupported mixer state version {version}")
+    offset = 3
+    track_nums = list(blob[offset:offset + track_count])
+    offset += track_count
+    field_count = 3 * track_count + 2
+    mask_length = (field_count + 7) // 8
+    mask = blob[offset:offset + mask_length]
+    offset += mask_length
+    fields = [field for field in range(field_count) if (mask[field >> 3] >> (field & 7)) & 1]
+    quantized_values = struct.unpack_from(f"<{len(fields)}H", blob, offset)
+
+    decoded = {}
+    for field, quantized in zip(fields, quantized_values):
+        if field < 3 * track_count:
+            track_num = track_nums[field // 3]
+            address = [f"/track/{track_num}/volume",
+                       f"/track/{track_num}/fx/2/fxparam/8/value", # Azimuth
+                       f"/track/{track_num}/fx/2/fxparam/9/value"][field % 3] # Elevation
+        elif field == 3 * track_count:
+            address = f"/track/{master_track}/reverb/drywet"
+        else:
+            address = f"/track/{master_track}/fx/1/fxparam/12/value"
+        decoded[address] = quantized / 65535.0
+    return decoded
+
+
+# --- OSC Message Handling Functions (called by OSC server) ---
+def handle_envelope_start(address, *args):
+    """Handles /envelope/start <track> <peak> <decay time> <curve>"""
+    count_message(address)
+    try:
+        track_num = int(args[0])
+        peak = float(args[1])
+        duration = float(args[2])
+        curve = str(args[3]) if len(args) > 3 else "linear"
+    except (ValueError, IndexError):
+        print(f"Malformed envelope start message: {args}")
+        return
+    with envelope_lock:
+        active_envelopes[track_num] = {"peak": peak, "duration": duration, "curve": curve,
+                                       "start_time": time.monotonic()}
+
+
+def handle_mixer_state(address, *args):
+    """Handles /mixer/state <blob>: decodes it and forwards each changed field as its own message."""
+    global received_blob_bytes, decoded_blob_fields
+    count_message(address)
+    try:
+        decoded = decode_mixer_state_blob(bytes(args[0]))
+    except (ValueError, IndexError, struct.error) as e:
+        print(f"Malformed mixer state blob: {e}")
+        return
+    with stats_lock:
+        received_blob_bytes += len(args[0])
+        decoded_blob_fields += len(decoded)
+    decoded_mixer_state.update(decoded)
+    for field_address, value in decoded.items():
+        forward_message(field_address, float(value))
+
+
+def handle_other_message(address, *args):
+    """Counts every other message and passes it through to REAPER unchanged."""
+    count_message(address)
+    forward_message(address, *args)
+
+
+def update_envelopes(now):
+    """Advances all active envelopes and sends their current value when it changed enough."""
+    global forwarded_envelope_values
+    with envelope_lock:
+        envelopes = list(active_envelopes.items())
+    for track_num, envelope in envelopes:
+        value = envelope_value(envelope["peak"], envelope["duration"], envelope["curve"],
+                               now - envelope["start_time"])
+        finished = value <= 0.0
+        last_value = track_output_volumes.get(track_num)
+        if last_value is None or abs(value - last_value) > ENVELOPE_VALUE_THRESHOLD or finished:
+            track_output_volumes[track_num] = value
+            forward_message(f"/track/{track_num}/volume", float(value))
+            with stats_lock:
+                forwarded_envelope_values += 1
+        if finished:
+            with envelope_lock:
+                # Only remove it if no new envelope was started for this track in the meantime
+                if active_envelopes.get(track_num) is envelope:
+                    del active_envelopes[track_num]
+
+
+def report_traffic(elapsed):
+    global forwarded_envelope_values, received_blob_bytes, decoded_blob_fields
+    with stats_lock:
+        counts = dict(received_message_counts)
+        received_message_counts.clear()
+        envelope_outputs = forwarded_envelope_values
+        forwarded_envelope_values = 0
+        blob_bytes = received_blob_bytes
+        blob_fields = decoded_blob_fields
+        received_blob_bytes = 0
+        decoded_blob_fields = 0
+    total = sum(counts.values())
+    print(f"\n--- Local OSC Sink: {total} messages in last {elapsed:.1f} s ({total / elapsed:.1f}/s) ---")
+    for address in sorted(counts):
+        print(f"  {address}: {counts[address]}")
+    print(f"  Envelope volume updates produced: {envelope_outputs} ({len(active_envelopes)} envelopes active)")
+    if blob_bytes:
+        print(f"  Mixer state blobs: {blob_bytes} bytes carrying {blob_fields} field updates")
+
+
+# --- Configure OSC Dispatcher ---
+dispatcher_instance = dispatcher.Dispatcher()
+dispatcher_instance.map("/envelope/start", handle_envelope_start)
+dispatcher_instance.map("/mixer/state", handle_mixer_state)
+dispatcher_instance.set_default_handler(handle_other_message)
+
+
+def start_osc_server():
+    server = osc_server.ThreadingOSCUDPServer((SINK_IP, SINK_PORT), dispatcher_instance)
+    print(f"Local OSC Sink listening on {SINK_IP}:{SINK_PORT}"
+          + (f", forwarding to REAPER at {REAPER_IP}:{REAPER_PORT}" if FORWARD_TO_REAPER else ""))
+    server.serve_forever()
+
+
+osc_server_thread = threading.Thread(target=start_osc_server)
+osc_server_thread.daemon = True
+osc_server_thread.start()
+
+last_report_time = time.monotonic()
+while True:
+    time.sleep(1.0 / ENVELOPE_RATE)
+    current_time = time.monotonic()
+    update_envelopes(current_time)
+
+    if current_time - last_report_time > REPORT_INTERVAL:
+        report_traffic(current_time - last_report_time)
+        last_report_time = current_time
@@ -2,8 +2,14 @@ from vpython import *
 import math
 import time
 from pythonosc import udp_client
+from pythonosc import osc_bundle_builder
+from pythonosc import osc_message_builder
+import threading
 import random
 
+# Startup timing reference (used to report cold start to first rendered frame)
+startup_begin_time = time.perf_counter()
+
 # --- OSC (Open Sound Control) Configuration ---
 reaper_ip = "172.20.10.5"  # REAPER 所在的 IP 地址
 reaper_port = 8000  # REAPER 監聽的 UDP 端口
@@ -47,26 +53,139 @@ quadrant_pans = [0.0] * len(track_numbers)
 last_hit_quadrant = -1  # Not strictly used, but kept for consistency if needed
 
 
-# --- OSC Send Function ---
-def send_osc_message(address, value):
-    """Generic function to send an OSC message."""
+# --- OSC Send Health (circuit breaker while REAPER's host is unreachable) ---
+# After OSC_FAILURE_THRESHOLD consecutive send errors the circuit opens: sends are skipped (cheaply) and a
+# single probe message is let through after an exponentially growing backoff. The first successful send
+# closes the circuit again. Errors are printed as one aggregated line per OSC_ERROR_LOG_INTERVAL instead of
+# one line per failed message, so console I/O cannot stall the frame rate.
+OSC_FAILURE_THRESHOLD = 3
+OSC_BACKOFF_INITIAL = 0.25 # Seconds until the first probe after the circuit opens
+OSC_BACKOFF_MAX = 2.0 # Upper bound for the probe interval (seconds)
+OSC_ERROR_LOG_INTERVAL = 5.0
+
+
+class OscSendHealth:
+    """Tracks OSC send failures and decides whether a message may be sent (closed / open / half-open)."""
+    def __init__(self):
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.backoff = OSC_BACKOFF_INITIAL
+        self.next_probe_time = 0.0
+        self.window_start_time = time.monotonic()
+        self.window_failures = 0
+        self.window_suppressed = 0
+        self.last_error = None
+        self.first_error_reported = False
+
+    def allow_send(self, now):
+        if self.state == "closed":
+            return True
+        if self.state == "open" and now >= self.next_probe_time:
+            self.state = "half_open" # Let exactly one probe message through
+            return True
+        self.window_suppressed += 1
+        return False
+
+    def record_success(self, now):
+        if self.state != "closed":
+            print("OSC: REAPER host reachable again, resuming sends")
+            self.state = "closed"
+            self.backoff = OSC_BACKOFF_INITIAL
+            self.first_error_reported = False
+        self.consecutive_failures = 0
+
+    def record_failure(self, now, address, error):
+        self.consecutive_failures += 1
+        self.window_failures += 1
+        self.last_error = f"{address}: {error}"
+        if not self.first_error_reported: # The first error after a healthy period is printed right away
+            print(f"Error sending OSC message to {address}: {error} "
+                  f"(further errors are summarized every {OSC_ERROR_LOG_INTERVAL:.0f} s)")
+            self.first_error_reported = True
+        if self.state == "half_open": # Probe failed, back off further
+            self.backoff = min(self.backoff * 2, OSC_BACKOFF_MAX)
+            self.state = "open"
+            self.next_probe_time = now + self.backoff
+        elif self.state == "closed" and self.consecutive_failures >= OSC_FAILURE_THRESHOLD:
+            self.state = "open"
+            self.backoff = OSC_BACKOFF_INITIAL
+            self.next_probe_time = now + self.backoff
+            print(f"OSC: {self.consecutive_failures} consecutive send failures, pausing sends to "
+                  f"{reaper_ip}:{reaper_port} and probing for the host periodically")
+
+    def maybe_log(self, now):
+        """Prints one aggregated line per OSC_ERROR_LOG_INTERVAL while errors are happening."""
+        if now - self.window_start_time < OSC_ERROR_LOG_INTERVAL:
+            return
+        if self.window_failures > 0 or self.window_suppressed > 0:
+            print(f"OSC: {self.window_failures} send failures in last {now - self.window_start_time:.0f} s, "
+                  f"{self.window_suppressed} messages skipped while paused (state: {self.state}, "
+                  f"last error: {self.last_error})")
+        self.window_start_time = now
+        self.window_failures = 0
+        self.window_suppressed = 0
+
+
+osc_send_health = OscSendHealth()
+
+
+def send_osc_content(content, address=""):
+    """Sends a built OSC message or bundle through the circuit breaker. Returns True if it was sent."""
+    now = time.monotonic()
+    if not osc_send_health.allow_send(now):
+        return False
     try:
-        client.send_message(address, float(value))
-        # print(f"Sent OSC: {address} {value:.2f}") # For debugging
+        client.send(content)
     except Exception as e:
-        print(f"Error sending OSC message to {address} with value {value}: {e}")
+        osc_send_health.record_failure(now, address, e)
+        return False
+    osc_send_health.record_success(now)
+    return True
+
+
+# --- OSC Send Function ---
+def send_osc_message(address, value):
+    """Generic function to send an OSC message (skipped while the circuit breaker is open)."""
+    msg = osc_message_builder.OscMessageBuilder(address=address)
+    msg.add_arg(float(value))
+    send_osc_content(msg.build(), address)
+    # print(f"Sent OSC: {address} {value:.2f}") # For debugging
+
+
+def build_initial_mixer_bundle():
+    """Builds one OSC bundle that resets volume, pitch and pan of every track and the master reverb."""
+    bundle = osc_bundle_builder.OscBundleBuilder(osc_bundle_builder.IMMEDIATELY)
+
+    def add_float_message(address, value):
+        msg = osc_message_builder.OscMessageBuilder(address=address)
+        msg.add_arg(float(value))
+        bundle.add_content(msg.build())
+
+    for track_num in track_numbers:
+        add_float_message(f"/track/{track_num}/volume", 0.0)
+        add_float_message(f"/track/{track_num}/pitch", 0.0)  # Reset pitch
+        add_float_message(f"/track/{track_num}/pan", 0.0)  # Reset pan
+
+    # Reset master effects: Ensure master reverb is off at start
+    add_float_message(f"/track/{master_track_number}/reverb/drywet", master_reverb_drywet_off)
+    return bundle.build()
 
 
-# Initial OSC setup: ensure all tracks are at 0 volume and default pitch/pan
-for i in range(len(track_numbers)):
-    send_osc_message(f"/track/{track_numbers[i]}/volume", 0.0)
-    send_osc_message(f"/track/{track_numbers[i]}/pitch", 0.0)  # Reset pitch
-    send_osc_message(f"/track/{track_numbers[i]}/pan", 0.0)  # Reset pan
+startup_handshake_duration = 0.0
 
-# Reset master effects: Ensure master reverb is off at start
-send_osc_message(f"/track/{master_track_number}/reverb/drywet", master_reverb_drywet_off)
 
-time.sleep(0.1)  # Give REAPER a moment to process initial messages
+def send_startup_handshake():
+    """Sends the initial OSC setup as a single bundle (runs while the VPython scene is being built)."""
+    global startup_handshake_duration
+    handshake_start = time.perf_counter()
+    send_osc_content(build_initial_mixer_bundle(), "initial mixer state bundle")
+    startup_handshake_duration = time.perf_counter() - handshake_start
+
+
+# Initial OSC setup: ensure all tracks are at 0 volume and default pitch/pan (no fixed sleep needed)
+startup_handshake_thread = threading.Thread(target=send_startup_handshake)
+startup_handshake_thread.daemon = True
+startup_handshake_thread.start()
 
 # --- VPython Scene Setup ---
 scene.center = vector(0, 0, 0)
@@ -840,10 +959,19 @@ def update_particles():
 
 
 # --- Main Simulation Loop ---
+# Make sure the initial OSC setup has gone out before the first frame
+startup_handshake_thread.join()
+first_frame_reported = False
+
 while True:
     rate(100)  # Update 100 times per second
     current_sim_time = time.time()
 
+    if not first_frame_reported:
+        print(f"Startup: first frame after {(time.perf_counter() - startup_begin_time) * 1000:.1f} ms "
+              f"(initial state bundle {startup_handshake_duration * 1000:.1f} ms)")
+        first_frame_reported = True
+
     # --- Event Logic (Attraction/Release) ---
     # Removed the 'global' keyword here as these variables are already global.
     # event_phase, ready_to_attract_time, last_event_trigger_time, ring_hit_count, camera_shake_active, shake_start_time, reverb_active_time
@@ -989,3 +1117,6 @@ while True:
     update_osc_parameters(current_sim_time)
 
     t += dt  # Update time for tilt animation
+
+    # --- Summarize OSC send errors (at most one line per OSC_ERROR_LOG_INTERVAL) ---
+    osc_send_health.maybe_log(time.monotonic())
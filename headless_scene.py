@@ -0,0 +1,193 @@
+import math
+from math import *
+
+# --- Headless Scene (BallTest_v1.py with OFFLINE_RENDER) ---
+# Stand-ins for the VPython names BallTest_v1.py uses, so an offline render needs no display: importing vpython
+# already creates its canvas and starts the browser connection. vector follows VPython's arithmetic; drawables,
+# the canvas and widgets only keep the attributes they are given (pos, axis, up and color as vector copies, like
+# VPython), so the simulation can read its state back from them. Nothing is drawn and rate() doesn't wait.
+
+
+class vector:
+    """VPython-compatible 3D vector."""
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        if isinstance(x, vector):
+            x, y, z = x.x, x.y, x.z
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def __add__(self, other):
+        return vector(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __radd__(self, other):
+        return vector(self) if other == 0 else self + other # sum() starts from 0
+
+    def __sub__(self, other):
+        return vector(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, factor):
+        factor = float(factor)
+        return vector(self.x * factor, self.y * factor, self.z * factor)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor):
+        divisor = float(divisor)
+        return vector(self.x / divisor, self.y / divisor, self.z / divisor)
+
+    def __neg__(self):
+        return vector(-self.x, -self.y, -self.z)
+
+    def __pos__(self):
+        return vector(self)
+
+    def __eq__(self, other):
+        return isinstance(other, vector) and self.x == other.x and self.y == other.y and self.z == other.z
+
+    __hash__ = None # Mutable, like VPython's vector
+
+    def __repr__(self):
+        return f"<{self.x:.6g}, {self.y:.6g}, {self.z:.6g}>"
+
+    @property
+    def mag(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    @property
+    def mag2(self):
+        return self.x * self.x + self.y * self.y + self.z * self.z
+
+    @property
+    def hat(self):
+        length = self.mag
+        return vector(0, 0, 0) if length == 0 else self / length
+
+    def norm(self):
+        return self.hat
+
+    def dot(self, other):
+        return self.x * other.x + self.y * other.y + self.z * other.z
+
+    def cross(self, other):
+        return vector(self.y * other.z - self.z * other.y, self.z * other.x - self.x * other.z,
+                      self.x * other.y - self.y * other.x)
+
+    def rotate(self, angle=0.0, axis=None):
+        """Rodrigues rotation by angle about axis (default z), as VPython's rotate."""
+        unit_axis = vector(0, 0, 1) if axis is None else axis.hat
+        cos_angle = math.cos(angle)
+        return (self * cos_angle + unit_axis.cross(self) * math.sin(angle)
+                + unit_axis * (unit_axis.dot(self) * (1 - cos_angle)))
+
+    def diff_angle(self, other):
+        return math.acos(max(-1.0, min(1.0, self.hat.dot(other.hat))))
+
+
+vec = vector
+
+
+def mag(v): return v.mag
+def norm(v): return v.hat
+def hat(v): return v.hat
+def dot(a, b): return a.dot(b)
+def cross(a, b): return a.cross(b)
+def rotate(v, angle=0.0, axis=None): return v.rotate(angle, axis)
+def sign(x): return 1 if x > 0 else (-1 if x < 0 else 0)
+
+
+class _Colors:
+    """VPython's named colors."""
+    black = vector(0, 0, 0)
+    white = vector(1, 1, 1)
+    red = vector(1, 0, 0)
+    green = vector(0, 1, 0)
+    blue = vector(0, 0, 1)
+    yellow = vector(1, 1, 0)
+    cyan = vector(0, 1, 1)
+    magenta = vector(1, 0, 1)
+    orange = vector(1, 0.6, 0)
+    purple = vector(0.4, 0.2, 0.6)
+
+    @staticmethod
+    def gray(luminance):
+        return vector(luminance, luminance, luminance)
+
+
+color = _Colors()
+
+
+class _Attributes:
+    """Keeps whatever attributes it is given; vector attributes are copied on assignment, as in VPython."""
+    def __init__(self, **attributes):
+        for name, value in attributes.items():
+            setattr(self, name, value)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, vector(value) if isinstance(value, vector) else value)
+
+
+class _Drawable(_Attributes):
+    """A VPython object that is never drawn."""
+    def __init__(self, **attributes):
+        self.pos = vector(0, 0, 0)
+        self.axis = vector(attributes.pop("length", 1), 0, 0)
+        self.up = vector(0, 1, 0)
+        self.color = vector(1, 1, 1)
+        self.opacity = 1.0
+        self.visible = True
+        self.radius = 1.0
+        super().__init__(**attributes)
+
+    def delete(self):
+        self.visible = False
+
+
+class sphere(_Drawable): pass
+class box(_Drawable): pass
+class ring(_Drawable): pass
+class cylinder(_Drawable): pass
+class label(_Drawable): pass
+class distant_light(_Drawable): pass
+
+
+class compound(_Drawable):
+    """Its axis length spans the parts along x, as VPython's compound size does."""
+    def __init__(self, objects, **attributes):
+        super().__init__(**attributes)
+        if "axis" not in attributes:
+            self.axis = vector(2 * max(getattr(part, "radius", 1.0) for part in objects), 0, 0)
+
+
+class _Canvas(_Attributes):
+    """Scene without a display: captions are dropped and bound events never fire."""
+    def __init__(self):
+        super().__init__(camera=_Attributes(pos=vector(0, 0, 1), axis=vector(0, 0, -1)),
+                         mouse=_Attributes(pick=None, pos=vector(0, 0, 0)), lights=[], center=vector(0, 0, 0),
+                         up=vector(0, 1, 0), visible=True)
+
+    def bind(self, events, handler):
+        pass
+
+    def append_to_caption(self, text):
+        pass
+
+
+scene = _Canvas()
+
+
+class _Widget(_Attributes):
+    def __init__(self, **attributes):
+        self.visible = True
+        self.text = ""
+        super().__init__(**attributes)
+
+
+class slider(_Widget): pass
+class button(_Widget): pass
+
+
+def rate(frequency):
+    """No pacing without a display."""
@@ -0,0 +1,110 @@
+import math
+import random
+
+# --- Integrators (shared by BallTest_v1.py and test_integrators.py) ---
+# integrate_motion advances any body with pos / vel by one step under a position-dependent acceleration. Vectors
+# only need x / y / z, +, - and multiplication by a number, so the simulation passes VPython vectors and the
+# energy probes below use PlaneVector, without a VPython scene.
+# Semi-implicit Euler and velocity Verlet are symplectic: with the attraction spring and gravity their energy
+# error stays bounded instead of growing, which is what allows a longer dt. integrator_energy_drift measures
+# that on fixed-seed probes; test_integrators.py asserts it and characterize_integrators prints it.
+INTEGRATOR_NAMES = ("semi_implicit_euler", "velocity_verlet", "explicit_euler")
+CHARACTERIZATION_STEPS = (0.005, 0.01, 0.02) # Step lengths compared by characterize_integrators
+ATTRACTION_DEAD_ZONE = 0.1 # No attraction closer than this to the center (avoids the singular direction)
+
+
+class PlaneVector:
+    """Minimal 3D vector for the energy probes."""
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def __add__(self, other):
+        return PlaneVector(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other):
+        return PlaneVector(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, factor):
+        return PlaneVector(self.x * factor, self.y * factor, self.z * factor)
+
+    @property
+    def mag2(self):
+        return self.x * self.x + self.y * self.y + self.z * self.z
+
+
+class IntegratorProbe:
+    """Point mass used by integrator_energy_drift."""
+    def __init__(self, pos, vel):
+        self.pos = pos
+        self.vel = vel
+
+
+def integrate_motion(body, acceleration, step, integrator):
+    """Advances body.pos / body.vel by one step; acceleration(pos) returns the acceleration at pos."""
+    if integrator == "velocity_verlet":
+        start_acceleration = acceleration(body.pos)
+        body.pos = body.pos + body.vel * step + start_acceleration * (0.5 * step * step)
+        body.vel = body.vel + (start_acceleration + acceleration(body.pos)) * (0.5 * step)
+    elif integrator == "explicit_euler":
+        start_acceleration = acceleration(body.pos)
+        body.pos = body.pos + body.vel * step
+        body.vel = body.vel + start_acceleration * step
+    else: # "semi_implicit_euler"
+        body.vel = body.vel + acceleration(body.pos) * step
+        body.pos = body.pos + body.vel * step
+
+
+def attraction_acceleration(pos, center, strength):
+    """Acceleration (unit mass) of the linear attraction towards center, in the XZ plane; same vector type as pos."""
+    offset_x = center.x - pos.x
+    offset_z = center.z - pos.z
+    if math.hypot(offset_x, offset_z) > ATTRACTION_DEAD_ZONE:
+        return type(pos)(offset_x * strength, 0, offset_z * strength)
+    return type(pos)(0, 0, 0)
+
+
+def probe_energy(probe, strength):
+    """Kinetic + attraction potential energy (unit mass, attraction centered at the origin)."""
+    distance_xz = max(math.hypot(probe.pos.x, probe.pos.z), ATTRACTION_DEAD_ZONE) # Flat potential in the dead zone
+    return 0.5 * probe.vel.mag2 + 0.5 * strength * distance_xz * distance_xz
+
+
+def integrator_energy_drift(integrator, step, strength, duration=20.0, probe_count=8, seed=1):
+    """
+    Energy behaviour of one integrator: fixed-seed balls moving in the XZ plane under the attraction alone, so the
+    energy should stay constant. Gravity is left out: it's constant (velocity Verlet integrates it exactly) and
+    the ground contact model is the same for every integrator.
+    Returns the final and the worst relative energy drift over all balls.
+    """
+    rng = random.Random(seed)
+    initial_states = [((rng.uniform(-4, 4), rng.uniform(-4, 4)), (rng.uniform(-5, 5), rng.uniform(-5, 5)))
+                      for _ in range(probe_count)]
+    origin = PlaneVector()
+    final_drift = 0.0
+    worst_drift = 0.0
+    for (pos_x, pos_z), (vel_x, vel_z) in initial_states:
+        probe = IntegratorProbe(PlaneVector(pos_x, 0, pos_z), PlaneVector(vel_x, 0, vel_z))
+        initial_energy = probe_energy(probe, strength)
+        drift = 0.0
+        for _ in range(int(round(duration / step))):
+            integrate_motion(probe, lambda pos: attraction_acceleration(pos, origin, strength), step, integrator)
+            drift = abs(probe_energy(probe, strength) - initial_energy) / initial_energy
+            worst_drift = max(worst_drift, drift)
+        final_drift = max(final_drift, drift)
+    return final_drift, worst_drift
+
+
+def characterize_integrators(strength, duration=20.0, probe_count=8, seed=1):
+    """Prints integrator_energy_drift for every integrator at each of CHARACTERIZATION_STEPS."""
+    lines = [f"--- Integrator Characterization ({probe_count} balls, {duration:.0f} s, seed {seed}) ---",
+             f"  {'integrator':<20} {'dt':>6} {'steps':>6} {'final drift':>12} {'worst drift':>12}"]
+    for integrator in INTEGRATOR_NAMES:
+        for step in CHARACTERIZATION_STEPS:
+            final_drift, worst_drift = integrator_energy_drift(integrator, step, strength, duration, probe_count, seed)
+            lines.append(f"  {integrator:<20} {step:>6.3f} {int(round(duration / step)):>6} {final_drift:>11.2%} "
+                         f"{worst_drift:>11.2%}")
+    print("\n".join(lines)) # One print, so a report computed in the background isn't interleaved with others
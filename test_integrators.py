@@ -0,0 +1,32 @@
+import unittest
+
+from integrators import CHARACTERIZATION_STEPS, integrator_energy_drift
+
+# Fixed-seed energy regression for the integrators (see integrators.py), with the strong attraction of
+# BallTest_v1.py (LARGE_ATTRACTION_STRENGTH) and its default probe set.
+ATTRACTION_STRENGTH = 8.0
+SYMPLECTIC_DRIFT_BOUND = 0.10 # Worst relative energy drift allowed for the symplectic integrators
+
+
+class IntegratorEnergyDriftTest(unittest.TestCase):
+    def test_verlet_at_double_step_drifts_no_more_than_semi_implicit_euler(self):
+        _, verlet_worst = integrator_energy_drift("velocity_verlet", 0.01, ATTRACTION_STRENGTH)
+        _, euler_worst = integrator_energy_drift("semi_implicit_euler", 0.005, ATTRACTION_STRENGTH)
+        self.assertLessEqual(verlet_worst, euler_worst)
+
+    def test_symplectic_integrators_stay_within_bound(self):
+        for integrator in ("semi_implicit_euler", "velocity_verlet"):
+            for step in CHARACTERIZATION_STEPS:
+                with self.subTest(integrator=integrator, step=step):
+                    _, worst_drift = integrator_energy_drift(integrator, step, ATTRACTION_STRENGTH)
+                    self.assertLess(worst_drift, SYMPLECTIC_DRIFT_BOUND)
+
+    def test_explicit_euler_exceeds_bound(self):
+        for step in CHARACTERIZATION_STEPS:
+            with self.subTest(step=step):
+                final_drift, _ = integrator_energy_drift("explicit_euler", step, ATTRACTION_STRENGTH)
+                self.assertGreater(final_drift, SYMPLECTIC_DRIFT_BOUND)
+
+
+if __name__ == "__main__":
+    unittest.main()